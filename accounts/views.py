@@ -3,15 +3,17 @@ from django.contrib.auth import authenticate, login, logout
 from django.contrib import messages
 from django.contrib.auth.models import User
 
+from hr.roles import ROLE_CLIENT, ROLE_EMPLOYEE, ROLE_HR, has_role
+
 
 def login_view(request):
     # 🔁 Redirect if already logged in
     if request.user.is_authenticated:
-        if request.user.groups.filter(name="HR").exists():
+        if has_role(request.user, ROLE_HR):
             return redirect("hr:dashboard")
-        elif request.user.groups.filter(name="CLIENT").exists():
+        elif has_role(request.user, ROLE_CLIENT):
             return redirect("core:client_dashboard")
-        elif request.user.groups.filter(name="EMPLOYEE").exists():
+        elif has_role(request.user, ROLE_EMPLOYEE):
             return redirect("employee:employee_dashboard")
 
     if request.method == "POST":
@@ -26,7 +28,7 @@ def login_view(request):
             return render(request, "registration/login.html")
 
         # ✅ Check role using GROUPS
-        if not user.groups.filter(name=role).exists():
+        if not has_role(user, role):
             messages.error(request, f"User is not assigned to role: {role}")
             return render(request, "registration/login.html")
 
@@ -55,6 +55,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'hr.querycount.QueryInspectionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -75,6 +76,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'hr.context_processors.navbar_notifications',
             ],
         },
     },
@@ -132,5 +134,53 @@ LOGIN_REDIRECT_URL = '/client/dashboard/'        # default redirect after login
 LOGOUT_REDIRECT_URL = '/accounts/login/'         # redirect after logout
 
 
+# Outgoing mail is queued in the HR outbox and delivered by `manage.py send_outbox`
+EMAIL_BACKEND = "hr.mail.OutboxEmailBackend"
+
 MEDIA_URL = "/media/"
-MEDIA_ROOT = BASE_DIR / "media"
\ No newline at end of file
+MEDIA_ROOT = BASE_DIR / "media"
+
+# HR module
+HR_ROLE_CACHE_TIMEOUT = 300                      # seconds a user's group names stay cached (shared CACHES only; 0 = per request)
+HR_NOTIFICATION_FLUSH_INTERVAL = 2.0             # seconds between background notification flushes (0 = write inline)
+HR_NOTIFICATION_BUFFER_SIZE = 500                # queued notifications that force an immediate flush
+HR_REMINDER_CLAIM_TIMEOUT = 600                  # seconds before an unfinished reminder claim can be retried
+HR_MAIL_DELIVERY_BACKEND = "django.core.mail.backends.smtp.EmailBackend"  # backend the outbox sender delivers through
+HR_MAIL_MAX_ATTEMPTS = 5                         # delivery attempts before an outbox message is marked failed
+HR_MAIL_RETRY_BACKOFF = 60                       # seconds before the first retry; doubles on each attempt
+HR_MAIL_CLAIM_TIMEOUT = 600                      # seconds before a batch claimed by a dead sender is retried
+HR_PAGE_SIZE = 25                                # rows per page on keyset-paginated HR lists
+HR_TIMELINE_COMMENTS_PER_POST = 3                # newest comments loaded per post on the timeline feed
+HR_VIEW_COUNT_FLUSH_INTERVAL = 5.0               # seconds between batched timeline view-count writes (0 = write inline)
+HR_VIEW_COUNT_BUFFER_SIZE = 1000                 # buffered views that force a flush (most a crash can lose)
+HR_CALENDAR_CACHE_TIMEOUT = 3600                 # seconds a month grid stays cached (shared CACHES only; signals drop it sooner)
+HR_ICS_FEED_PAST_DAYS = 90                       # days of past events in a subscribed .ics feed
+HR_ICS_FEED_FUTURE_DAYS = 365                    # days of upcoming events in a subscribed .ics feed
+HR_ATTENDANCE_IMPORT_BATCH_SIZE = 1000           # rows per bulk upsert statement when importing attendance
+HR_EXPORT_CHUNK_SIZE = 2000                      # rows fetched per cursor round trip when streaming CSV exports
+HR_QUERY_INSPECTION = True                       # record per-request SQL and flag repeated statements (N+1)
+HR_QUERY_REPEAT_THRESHOLD = 5                    # same statement shape this many times in one request = N+1 warning
+HR_QUERY_BUDGET_STRICT = False                   # raise instead of log when a view goes over budget (on in tests)
+HR_QUERY_BUDGET_DEFAULT = 30                     # budget for URL names not listed below (None = unchecked)
+# max queries per request, by URL name
+HR_QUERY_BUDGETS = {
+    "hr:dashboard": 16,
+    "hr:employee_list": 6,
+    "hr:team_list": 6,
+    "hr:attendance_list": 10,
+    "hr:leave_dashboard": 10,
+    "hr:announcement_list": 6,
+    "hr:project_list": 6,
+    "hr:task_list": 6,
+    "hr:client_list": 6,
+    "hr:payroll_list": 10,
+    "hr:payroll_run": None,  # one INSERT per batch, so it grows with the headcount
+    "hr:invoice_list": 10,
+    "hr:payment_list": 8,
+    "hr:ticket_list": 10,
+    "hr:notifications": 8,
+    "hr:timeline": 8,
+    "core:client_dashboard": 6,
+    "core:dashboard": 6,
+    "employee:employee_dashboard": 6,
+}
@@ -2,7 +2,9 @@ from django.db import models
 from django.conf import settings
 from django.utils import timezone
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+
+from hr.sequences import next_identifier
 
 
 class ClientProfile(models.Model):
@@ -30,21 +32,10 @@ class ClientProfile(models.Model):
 
     def save(self, *args, **kwargs):
         # Auto-generate client_id only if empty
-        if not self.client_id:
-            last = ClientProfile.objects.exclude(client_id="").order_by("-id").first()
-
-            if last and last.client_id.startswith("CL-"):
-                try:
-                    last_num = int(last.client_id.split("-")[1])
-                except Exception:
-                    last_num = 1022
-                next_num = last_num + 1
-            else:
-                next_num = 1023
-
-            self.client_id = f"CL-{next_num}"
-
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            if not self.client_id:
+                self.client_id = next_identifier("client")
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.user.username} - ClientProfile"
@@ -175,10 +166,10 @@ class SupportTicket(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     def save(self, *args, **kwargs):
-        if not self.ticket_id:
-            import random
-            self.ticket_id = f"SUP-{random.randint(10000, 99999)}"
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            if not self.ticket_id:
+                self.ticket_id = next_identifier("support_ticket")
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.ticket_id} - {self.title}"
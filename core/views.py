@@ -4,6 +4,9 @@ from django.utils import timezone
 from django.http import JsonResponse
 from django.views.decorators.http import require_POST, require_GET
 from django.db.models import Sum
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
 from django.core.files.storage import default_storage
 
 from .models import (
@@ -11,19 +14,20 @@ from .models import (
     PaymentStatus, PaymentMethod
 )
 
-from hr.models import Event
-from django.db.models import Q
+from hr.calendars import events_between
 from django.utils import timezone
 
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta, timezone as dt_timezone
 from calendar import monthrange
 
-from hr.models import Event  
+from hr.dashboard_stats import get_stats
+from hr.models import DashboardScope
+from hr.roles import ROLE_CLIENT, has_role
 
 
 
 def is_client(user):
-    return user.groups.filter(name="CLIENT").exists()
+    return has_role(user, ROLE_CLIENT)
 
 
 def get_client_profile(user):
@@ -125,17 +129,13 @@ def index(request):
         return redirect("login")
 
     client = get_client_profile(request.user)
-
-    projects_count = Project.objects.filter(client=client).count()
-    invoices_pending = Invoice.objects.filter(project__client=client, status="PENDING").count()
-    tickets_open = SupportTicket.objects.filter(client=client, status="OPEN").count()
-    unread_messages = Message.objects.filter(client=client, is_read=False).count()
+    stats = get_stats(DashboardScope.CLIENT, client.pk)
 
     return render(request, "core/index.html", {
-        "projects_count": projects_count,
-        "invoices_pending": invoices_pending,
-        "tickets_open": tickets_open,
-        "unread_messages": unread_messages,
+        "projects_count": stats.projects_count,
+        "invoices_pending": stats.invoices_pending,
+        "tickets_open": stats.tickets_open,
+        "unread_messages": stats.unread_messages,
     })
 
 
@@ -523,48 +523,105 @@ def client_events(request):
     return render(request, "core/events.html")
 
 
+# FullCalendar asks for the visible range (end exclusive); without one the
+# current month's grid is served. Longer or malformed ranges are a 400.
+EVENTS_DEFAULT_DAYS = 42
+EVENTS_MAX_DAYS = 366
+
+
+def _range_param(value):
+    try:
+        return date.fromisoformat((value or "")[:10])
+    except ValueError:
+        return None
+
+
+def _since_param(value):
+    if not value:
+        return None
+    try:
+        since = parse_datetime(value)
+    except ValueError:
+        since = None
+    if since is None:
+        seconds = parse_http_date_safe(value)
+        since = datetime.fromtimestamp(seconds, tz=dt_timezone.utc) if seconds is not None else None
+    if since is not None and timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
+
+
+def _event_item(ev, tz):
+    start_dt = datetime.combine(ev.event_date, ev.start_time, tzinfo=tz)
+    end_dt = datetime.combine(ev.event_date, ev.end_time, tzinfo=tz) if ev.end_time else None
+    return {
+        "id": ev.id,
+        "title": ev.title,
+        "start": start_dt.isoformat(),
+        "end": end_dt.isoformat() if end_dt else None,
+        "extendedProps": {
+            "description": ev.description or "",
+            "share_with": ev.share_with,
+            "event_type": ev.event_type,
+            "date": ev.event_date.strftime("%d %b %Y"),
+            "start_time": ev.start_time.strftime("%H:%M"),
+            "end_time": ev.end_time.strftime("%H:%M") if ev.end_time else "",
+        },
+    }
+
+
 @login_required
 @require_GET
 def client_events_api(request):
+    """
+    Client/All events for ?start=&end= (FullCalendar's range). The ETag covers
+    the count and newest updated_at in range, so an unchanged range is a 304;
+    ?since=<timestamp> returns {"events": changed since then, "ids": every
+    event still in range (to drop deleted ones), "updated_at": ...}.
+    """
     # Only clients can load events
     if not is_client(request.user):
         return JsonResponse({"error": "Not allowed"}, status=403)
 
-    # Client sees only Client / All events
-    qs = Event.objects.filter(
-        Q(share_with__icontains="Client") | Q(share_with__icontains="All")
-    ).order_by("event_date", "start_time")
-
-    events = []
-    for ev in qs:
-        # FullCalendar expects ISO date-time strings
-        start_dt = timezone.make_aware(
-            timezone.datetime.combine(ev.event_date, ev.start_time)
-        )
-
-        if ev.end_time:
-            end_dt = timezone.make_aware(
-                timezone.datetime.combine(ev.event_date, ev.end_time)
-            )
+    params = request.GET
+    start = _range_param(params["start"]) if params.get("start") else timezone.localdate().replace(day=1)
+    end = _range_param(params["end"]) if params.get("end") else None
+    since = _since_param(params.get("since"))
+    if start is None or (params.get("end") and end is None) or (params.get("since") and since is None):
+        return JsonResponse({"error": "Invalid start, end or since"}, status=400)
+    end = end or start + timedelta(days=EVENTS_DEFAULT_DAYS)
+    if end < start or end - start > timedelta(days=EVENTS_MAX_DAYS):
+        return JsonResponse({"error": f"The range must run forwards, at most {EVENTS_MAX_DAYS} days"}, status=400)
+
+    # Client sees only Client / All events, read from the cached month grids
+    events = events_between("client", start, end)
+
+    last_modified = max((ev.updated_at for ev in events), default=None)
+    etag = quote_etag(
+        f"{start:%Y%m%d}-{end:%Y%m%d}-{len(events)}-{last_modified.timestamp() if last_modified else 0}"
+        f"-{since.timestamp() if since else ''}"
+    )
+    response = get_conditional_response(
+        request, etag=etag, last_modified=int(last_modified.timestamp()) if last_modified else None
+    )
+    if response is None:
+        tz = timezone.get_current_timezone()
+        changed = [ev for ev in events if ev.updated_at > since] if since else events
+        items = [_event_item(ev, tz) for ev in changed]
+        if since:
+            response = JsonResponse({
+                "events": items,
+                "ids": [ev.id for ev in events],
+                "updated_at": last_modified.isoformat() if last_modified else None,
+            })
         else:
-            end_dt = None
-
-        events.append({
-            "id": ev.id,
-            "title": ev.title,
-            "start": start_dt.isoformat(),
-            "end": end_dt.isoformat() if end_dt else None,
-            "extendedProps": {
-                "description": ev.description or "",
-                "share_with": ev.share_with,
-                "event_type": ev.event_type,
-                "date": ev.event_date.strftime("%d %b %Y"),
-                "start_time": ev.start_time.strftime("%H:%M"),
-                "end_time": ev.end_time.strftime("%H:%M") if ev.end_time else "",
-            }
-        })
-
-    return JsonResponse(events, safe=False)
+            response = JsonResponse(items, safe=False)
+
+    response["ETag"] = etag
+    if last_modified:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
 
 
 @login_required
@@ -1,9 +1,8 @@
 from django.contrib import admin
-from .models import Event,EmployeeProfile, Leave, Task, Attendance, Announcement
+from .models import Event,EmployeeProfile, Leave, Task, Announcement
 
 admin.site.register(EmployeeProfile)
 admin.site.register(Leave)
 admin.site.register(Task)
-admin.site.register(Attendance)
 admin.site.register(Announcement)
 
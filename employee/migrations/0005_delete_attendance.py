@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:19
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0004_event'),
+        # the punches are copied into hr.Attendance first
+        ('hr', '0013_merge_employee_attendance'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='Attendance',
+        ),
+    ]
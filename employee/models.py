@@ -1,6 +1,5 @@
 from django.db import models
 from django.contrib.auth.models import User
-from django.utils import timezone
 
 
 class Event(models.Model):
@@ -70,18 +69,6 @@ class Task(models.Model):
         return self.title
 
 
-# Attendance (Read-only for Employee)
-
-class Attendance(models.Model):
-    employee = models.ForeignKey(User, on_delete=models.CASCADE)
-    date = models.DateField(default=timezone.now)
-    clock_in = models.DateTimeField(null=True, blank=True)
-    clock_out = models.DateTimeField(null=True, blank=True)
-
-    def __str__(self):
-        return f"{self.employee.username} - {self.date}"
-    
-    
 # Announcements (Created by HR, Viewed by Employee)
 class Announcement(models.Model):
     title = models.CharField(max_length=200)
@@ -7,8 +7,11 @@ from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, redirect
 from django.utils import timezone
 
-from hr.models import Event
-from .models import EmployeeProfile, Leave, Task, Attendance, Announcement
+from hr import timeclock
+from hr.calendars import month_grid
+from hr.dashboard_stats import get_stats
+from hr.models import Attendance, DashboardScope
+from .models import EmployeeProfile, Leave, Task, Announcement
 
 
 def employee_login(request):
@@ -40,10 +43,10 @@ def employee_logout(request):
 
 @login_required
 def employee_dashboard(request):
-    leaves = Leave.objects.filter(employee=request.user)
+    stats = get_stats(DashboardScope.USER, request.user.pk)
 
     context = {
-        "pending_leaves": leaves.filter(status="Pending").count(),
+        "pending_leaves": stats.pending_leaves,
     }
     return render(request, "employee/dashboard.html", context)
 
@@ -114,18 +117,11 @@ def employee_announcements(request):
 
 @login_required
 def clock_in(request):
-    today = timezone.now().date()
+    result = timeclock.clock_in(request.user)
 
-    existing = Attendance.objects.filter(employee=request.user, date=today).first()
-
-    if existing:
+    if result == timeclock.ALREADY_CLOCKED_IN:
         messages.error(request, "Today's attendance already marked.")
     else:
-        Attendance.objects.create(
-            employee=request.user,
-            date=today,
-            clock_in=timezone.now()
-        )
         messages.success(request, "Clock In marked successfully.")
 
     return redirect("employee:employee_dashboard")
@@ -133,17 +129,13 @@ def clock_in(request):
 
 @login_required
 def clock_out(request):
-    today = timezone.now().date()
+    result = timeclock.clock_out(request.user)
 
-    attendance = Attendance.objects.filter(employee=request.user, date=today).first()
-
-    if not attendance:
+    if result == timeclock.NOT_CLOCKED_IN:
         messages.error(request, "You must Clock In first.")
-    elif attendance.clock_out:
+    elif result == timeclock.ALREADY_CLOCKED_OUT:
         messages.error(request, "You have already Clocked Out today.")
     else:
-        attendance.clock_out = timezone.now()
-        attendance.save()
         messages.success(request, "Clock Out saved successfully.")
 
     return redirect("employee:employee_dashboard")
@@ -151,7 +143,7 @@ def clock_out(request):
 
 @login_required
 def attendance_history(request):
-    attendances = Attendance.objects.filter(employee=request.user).order_by("-date")
+    attendances = Attendance.objects.filter(user=request.user).order_by("-date")
     return render(request, "employee/attendance.html", {"attendances": attendances})
 
 
@@ -178,20 +170,13 @@ def employee_events(request):
         month = 1
         year += 1
 
-    cal = calendar.monthcalendar(year, month)
-
-    events = Event.objects.filter(event_date__year=year, event_date__month=month)
-
-    event_dict = {}
-    for event in events:
-        event_dict.setdefault(event.event_date.day, []).append(event)
+    grid = month_grid("employee", date(year, month, 1))
 
     context = {
-        "calendar": cal,
+        "weeks": grid["weeks"],
         "month": month,
         "year": year,
         "month_name": calendar.month_name[month],
-        "event_dict": event_dict,
         "months": range(1, 13),
         "years": range(today.year - 5, today.year + 6),
     }
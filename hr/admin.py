@@ -8,6 +8,7 @@ from .models import (
     Task,
     Client,
     Team,
+    Compensation,
     Payroll,
     Invoice,
     Payment,
@@ -18,6 +19,7 @@ from .models import (
     TimelinePost,
     TimelineComment,
     PersonalTask,
+    OutboundEmail,
 )
 
 
@@ -96,6 +98,27 @@ class ClientAdmin(admin.ModelAdmin):
     ordering = ("-created_at",)
 
 
+# -------------------------
+# COMPENSATION ADMIN
+# -------------------------
+@admin.register(Compensation)
+class CompensationAdmin(admin.ModelAdmin):
+    list_display = ("user", "basic_salary", "allowances", "deductions", "updated_at")
+    search_fields = ("user__username", "user__email", "user__first_name", "user__last_name")
+    ordering = ("user",)
+
+
+# -------------------------
+# OUTBOX ADMIN
+# -------------------------
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ("subject", "to", "status", "attempts", "next_attempt_at", "sent_at", "created_at")
+    list_filter = ("status",)
+    search_fields = ("subject", "to")
+    ordering = ("-created_at",)
+
+
 # NOTE: Keeping these "simple" avoids admin crash if field names differ.
 admin.site.register(Team)
 admin.site.register(Payroll)
@@ -5,3 +5,6 @@ class HrConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'hr'
     verbose_name = 'HR Module'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,155 @@
+import csv
+import io
+import json
+from datetime import date, time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from employee.models import EmployeeProfile
+
+from . import attendance_rollup
+from .models import Attendance, AttendanceStatus, NotificationType
+from .notifications import create_notification
+
+
+# ============================================================
+# BULK ATTENDANCE IMPORT
+# ============================================================
+#
+# Loads employee-days from CSV (header row) or JSON (a list of objects, or
+# {"records": [...]}) with the columns
+#
+#   username | emp_id | user_id, date, check_in, check_out, status
+#
+# Employees are resolved with one query per identifier kind, total_hours
+# is computed here (Attendance.hours_between, as save() would), and rows
+# are upserted on (user, date) with bulk_create(update_conflicts=True) in
+# chunks of HR_ATTENDANCE_IMPORT_BATCH_SIZE, all in one transaction. Bad
+# rows are reported by line and skipped; the import ends with a single
+# summary notification instead of one per row.
+
+USER_COLUMNS = ("username", "emp_id", "user_id")
+UPDATE_FIELDS = ["check_in", "check_out", "total_hours", "status"]
+
+
+class ImportResult:
+    def __init__(self):
+        self.written = 0
+        self.errors = []  # (line, message)
+
+    def error(self, line, message):
+        self.errors.append((line, message))
+
+    def __str__(self):
+        text = f"{self.written} attendance record(s) imported"
+        if self.errors:
+            text += f", {len(self.errors)} row(s) skipped"
+        return text
+
+
+def _batch_size() -> int:
+    return getattr(settings, "HR_ATTENDANCE_IMPORT_BATCH_SIZE", 1000)
+
+
+def read_rows(content, fmt: str = None):
+    """[(line, {column: value}), ...] from CSV or JSON text or bytes; `fmt` is "csv", "json" or None to sniff."""
+    if isinstance(content, bytes):
+        content = content.decode("utf-8-sig")
+    fmt = fmt or ("json" if content.lstrip()[:1] in ("[", "{") else "csv")
+    if fmt == "json":
+        data = json.loads(content)
+        records = data.get("records", []) if isinstance(data, dict) else data
+        if not isinstance(records, list):
+            raise ValueError('JSON must be a list of records or {"records": [...]}')
+        return [(i, record if isinstance(record, dict) else {}) for i, record in enumerate(records, start=1)]
+    reader = csv.DictReader(io.StringIO(content))
+    return [(reader.line_num, row) for row in reader]
+
+
+def _clean(value) -> str:
+    return str(value).strip() if value is not None else ""
+
+
+def _resolve_users(rows) -> dict:
+    """{(column, value): user_id} for every employee identifier in `rows`."""
+    wanted = {column: set() for column in USER_COLUMNS}
+    for _, row in rows:
+        for column in USER_COLUMNS:
+            value = _clean(row.get(column))
+            if value:
+                wanted[column].add(value)
+                break
+
+    users = get_user_model().objects.filter(is_active=True)
+    resolved = {}
+    if wanted["username"]:
+        for username, pk in users.filter(username__in=wanted["username"]).values_list("username", "pk"):
+            resolved[("username", username)] = pk
+    if wanted["emp_id"]:
+        profiles = EmployeeProfile.objects.filter(emp_id__in=wanted["emp_id"], user__is_active=True)
+        for emp_id, user_id in profiles.values_list("emp_id", "user_id"):
+            resolved[("emp_id", emp_id)] = user_id
+    ids = {value for value in wanted["user_id"] if value.isdigit()}
+    if ids:
+        for pk in users.filter(pk__in=ids).values_list("pk", flat=True):
+            resolved[("user_id", str(pk))] = pk
+    return resolved
+
+
+def build_records(rows, result: ImportResult) -> list:
+    """Unsaved Attendance objects, one per (user, date); a later row for the same day wins."""
+    users = _resolve_users(rows)
+    statuses = dict(AttendanceStatus.choices)
+    records = {}
+    for line, row in rows:
+        key = next(((column, _clean(row.get(column))) for column in USER_COLUMNS if _clean(row.get(column))), None)
+        if key is None:
+            result.error(line, "no username, emp_id or user_id")
+            continue
+        user_id = users.get(key)
+        if user_id is None:
+            result.error(line, f"unknown or inactive employee {key[1]!r}")
+            continue
+        try:
+            day = date.fromisoformat(_clean(row.get("date")))
+            check_in = time.fromisoformat(_clean(row.get("check_in"))) if _clean(row.get("check_in")) else None
+            check_out = time.fromisoformat(_clean(row.get("check_out"))) if _clean(row.get("check_out")) else None
+        except ValueError as exc:
+            result.error(line, str(exc))
+            continue
+        status = _clean(row.get("status")).upper() or AttendanceStatus.PRESENT
+        if status not in statuses:
+            result.error(line, f"unknown status {status!r}")
+            continue
+
+        records[(user_id, day)] = Attendance(
+            user_id=user_id,
+            date=day,
+            check_in=check_in,
+            check_out=check_out,
+            status=status,
+            total_hours=Attendance.hours_between(day, check_in, check_out),
+        )
+    return list(records.values())
+
+
+def import_attendance(content, fmt: str = None, notify: bool = True) -> ImportResult:
+    result = ImportResult()
+    records = build_records(read_rows(content, fmt), result)
+    batch_size = _batch_size()
+    with transaction.atomic():
+        for start in range(0, len(records), batch_size):
+            Attendance.objects.bulk_create(
+                records[start:start + batch_size],
+                update_conflicts=True,
+                unique_fields=["user", "date"],
+                update_fields=UPDATE_FIELDS,
+            )
+        # bulk_create skips the signals that keep the monthly rollup current
+        attendance_rollup.refresh((record.user_id, record.date) for record in records)
+        result.written = len(records)
+    if notify and result.written:
+        create_notification("Attendance imported", f"{result}.", NotificationType.ATTENDANCE)
+    return result
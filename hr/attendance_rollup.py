@@ -0,0 +1,93 @@
+from collections import defaultdict
+from datetime import date
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncMonth
+
+from .models import Attendance, AttendanceMonthly, AttendanceStatus
+
+
+# ============================================================
+# MONTHLY ATTENDANCE ROLLUP
+# ============================================================
+#
+# AttendanceMonthly holds one row per user and month (present/absent/late
+# day counts and summed hours) so month-level reports read N rows rather
+# than N x 30 daily ones. Whenever daily rows change, the affected
+# (user, month) pairs are recomputed from their daily rows with one grouped
+# query per month and upserted: hr.signals does this for Attendance
+# saves/deletes, and the bulk paths that skip signals (attendance import,
+# self-service clock in/out) call refresh() themselves.
+# `manage.py rebuild_attendance_rollup` recomputes everything.
+
+TOTALS = {
+    "present_days": Count("pk", filter=Q(status=AttendanceStatus.PRESENT)),
+    "absent_days": Count("pk", filter=Q(status=AttendanceStatus.ABSENT)),
+    "late_days": Count("pk", filter=Q(status=AttendanceStatus.LATE)),
+    "total_hours": Sum("total_hours"),
+}
+FIELDS = list(TOTALS)
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def next_month(month: date) -> date:
+    return month.replace(year=month.year + month.month // 12, month=month.month % 12 + 1, day=1)
+
+
+def _upsert(rows):
+    AttendanceMonthly.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["user", "month"],
+        update_fields=[*FIELDS, "updated_at"],
+        batch_size=1000,
+    )
+
+
+def refresh(pairs) -> None:
+    """Recompute the rollup rows of the given (user_id, any date in the month) pairs."""
+    users_by_month = defaultdict(set)
+    for user_id, day in pairs:
+        if user_id is not None and day is not None:
+            users_by_month[month_start(day)].add(user_id)
+
+    with transaction.atomic():
+        for month, user_ids in users_by_month.items():
+            grouped = (
+                Attendance.objects.filter(user_id__in=user_ids, date__gte=month, date__lt=next_month(month))
+                .order_by()
+                .values("user_id")
+                .annotate(**TOTALS)
+            )
+            rows = [
+                AttendanceMonthly(user_id=row.pop("user_id"), month=month, **{k: v or 0 for k, v in row.items()})
+                for row in grouped
+            ]
+            _upsert(rows)
+            emptied = user_ids - {row.user_id for row in rows}
+            if emptied:
+                AttendanceMonthly.objects.filter(month=month, user_id__in=emptied).delete()
+
+
+def rebuild_all() -> int:
+    """Recompute every (user, month) with one grouped query; returns the row count."""
+    grouped = (
+        Attendance.objects.order_by()
+        .annotate(month=TruncMonth("date"))
+        .values("user_id", "month")
+        .annotate(**TOTALS)
+    )
+    rows = [
+        AttendanceMonthly(
+            user_id=row.pop("user_id"), month=row.pop("month"), **{k: v or 0 for k, v in row.items()}
+        )
+        for row in grouped.iterator(chunk_size=2000)
+    ]
+    with transaction.atomic():
+        AttendanceMonthly.objects.all().delete()
+        AttendanceMonthly.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
@@ -0,0 +1,100 @@
+import atexit
+import logging
+import threading
+from abc import ABC, abstractmethod
+
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================
+# BUFFERED WRITER
+# ============================================================
+#
+# Items are collected in memory and written in batches by a daemon thread
+# every `flush_interval` seconds. The buffer is bounded: once `max_size`
+# items are pending, the producer writes the batch itself instead of
+# growing the buffer. Pending items are drained at interpreter shutdown.
+# A `flush_interval` of 0 disables the thread and writes on every put.
+# A batch whose write fails (e.g. the database is briefly unavailable) goes
+# back to the front of the buffer for the next flush; only what exceeds
+# `max_backlog` pending items is dropped, oldest first, and logged.
+
+class BufferedWriter(ABC):
+    def __init__(self, name: str, flush_interval: float, max_size: int, max_backlog: int = None):
+        self.name = name
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+        self.max_backlog = max_backlog or max_size * 10
+        self._items = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._stopping = False
+        atexit.register(self.drain)
+
+    @abstractmethod
+    def write(self, items) -> None:
+        """Persist a batch; raising keeps the batch buffered for the next flush."""
+
+    def put(self, item) -> None:
+        with self._lock:
+            self._items.append(item)
+            full = len(self._items) >= self.max_size
+
+        if not self.flush_interval or full:
+            self.flush()
+        else:
+            self._ensure_thread()
+
+    def depth(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+    def flush(self) -> int:
+        with self._lock:
+            items, self._items = self._items, []
+        if not items:
+            return 0
+        try:
+            self.write(items)
+        except Exception:
+            logger.exception("%s: failed to write %d buffered item(s); keeping them for retry", self.name, len(items))
+            self._requeue(items)
+            return 0
+        return len(items)
+
+    def _requeue(self, items) -> None:
+        with self._lock:
+            self._items = items + self._items
+            overflow = len(self._items) - self.max_backlog
+            if overflow > 0:
+                del self._items[:overflow]
+        if overflow > 0:
+            logger.error("%s: backlog full, dropped %d oldest item(s)", self.name, overflow)
+
+    def drain(self) -> int:
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=max(self.flush_interval, 1) * 2)
+        return self.flush()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name=f"{self.name}-flusher", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopping:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+            # the thread owns its own DB connection; don't keep it open forever
+            close_old_connections()
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS
+
+
+# ============================================================
+# SHARED CACHE DETECTION
+# ============================================================
+#
+# Entries that signals invalidate (role names, calendar month grids) are
+# only safe to keep across requests when every worker process reads the
+# same cache: with a process-local backend the invalidation clears only
+# the process that saw the change, and the others keep serving the stale
+# value until it expires. Callers fall back to per-request work unless
+# CACHES points at a shared backend (Redis, Memcached, database, ...).
+
+PROCESS_LOCAL_BACKENDS = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+
+
+def is_shared(alias: str = DEFAULT_CACHE_ALIAS) -> bool:
+    backend = settings.CACHES.get(alias, {}).get("BACKEND", "")
+    return bool(backend) and backend not in PROCESS_LOCAL_BACKENDS
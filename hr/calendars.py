@@ -0,0 +1,157 @@
+from calendar import monthrange
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .caching import is_shared
+from .models import Event, EventAudience
+from .roles import ROLE_CLIENT, ROLE_EMPLOYEE, has_role
+
+
+# ============================================================
+# MONTH CALENDARS
+# ============================================================
+#
+# One engine for the HR, employee and client calendars. A month is a fixed
+# 6x7 grid starting on the Sunday on or before the 1st (the same window
+# FullCalendar's month view asks for), with the events of every cell
+# already bucketed and classified. When CACHES is shared between workers
+# (hr.caching.is_shared) grids are cached per (audience, month) for
+# HR_CALENDAR_CACHE_TIMEOUT seconds; hr.signals and the reminder run delete
+# the cached months around an event's old and new date whenever it
+# changes, so a calendar page is normally one cache round trip. With a
+# process-local cache that deletion would reach only one worker, so grids
+# are then built on every request.
+
+GRID_DAYS = 42
+
+# audience name -> EventAudience bits that make an event visible (None: all events)
+AUDIENCES = {
+    "hr": None,
+    "employee": EventAudience.EMPLOYEE | EventAudience.TEAM | EventAudience.ALL,
+    "client": EventAudience.CLIENT | EventAudience.ALL,
+}
+
+# event_type -> (dot class, badge class)
+EVENT_CLASSES = {
+    "MEETING": ("bg-primary", "badge bg-primary-subtle text-primary"),
+    "HOLIDAY": ("bg-success", "badge bg-success-subtle text-success"),
+    "BIRTHDAY": ("bg-warning", "badge bg-warning-subtle text-warning"),
+}
+DEFAULT_CLASSES = ("bg-secondary", "badge bg-secondary-subtle text-secondary")
+
+
+def _cache_timeout() -> int:
+    if not is_shared():
+        return 0
+    return getattr(settings, "HR_CALENDAR_CACHE_TIMEOUT", 3600)
+
+
+def _cache_key(audience: str, month) -> str:
+    return f"hr:calendar:{audience}:{month:%Y-%m}"
+
+
+def audience_for(user) -> str:
+    if has_role(user, ROLE_EMPLOYEE):
+        return "employee"
+    if has_role(user, ROLE_CLIENT):
+        return "client"
+    return "hr"
+
+
+def _shift_month(month, months: int):
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1, day=1)
+
+
+def grid_start(month):
+    first_weekday_mon0, _ = monthrange(month.year, month.month)
+    return month - timedelta(days=(first_weekday_mon0 + 1) % 7)
+
+
+def build_month(audience: str, month) -> dict:
+    start = grid_start(month)
+    end = start + timedelta(days=GRID_DAYS - 1)
+
+    events = Event.objects.filter(event_date__gte=start, event_date__lte=end).order_by("event_date", "start_time")
+    if AUDIENCES[audience] is not None:
+        events = events.filter(EventAudience.q(AUDIENCES[audience]))
+    events = list(events)
+
+    by_date = {}
+    for ev in events:
+        by_date.setdefault(ev.event_date, []).append(ev)
+
+    days = []
+    for i in range(GRID_DAYS):
+        d = start + timedelta(days=i)
+        day_events = by_date.get(d, [])
+        days.append({
+            "date": d,
+            "day": d.day,
+            "is_muted": d.month != month.month,
+            "events": [
+                {"pk": ev.pk, "title": ev.title, "badge_class": EVENT_CLASSES.get(ev.event_type, DEFAULT_CLASSES)[1]}
+                for ev in day_events
+            ],
+            "first_event_dot_class": (
+                EVENT_CLASSES.get(day_events[0].event_type, DEFAULT_CLASSES)[0] if day_events else None
+            ),
+        })
+
+    return {
+        "month": month,
+        "label": month.strftime("%B %Y"),
+        "grid_start": start,
+        "grid_end": end,
+        "days": days,
+        "weeks": [days[i:i + 7] for i in range(0, GRID_DAYS, 7)],
+        "events": events,
+    }
+
+
+def month_grids(audience: str, months) -> dict:
+    """{month: grid} for the first-of-month dates in `months`, read from the cache in one call."""
+    keys = {_cache_key(audience, month): month for month in months}
+    timeout = _cache_timeout()
+    if not timeout:
+        return {month: build_month(audience, month) for month in keys.values()}
+    cached = cache.get_many(keys)
+    grids = {keys[key]: grid for key, grid in cached.items()}
+    missing = {key: build_month(audience, month) for key, month in keys.items() if key not in cached}
+    if missing:
+        cache.set_many(missing, timeout)
+        grids.update((keys[key], grid) for key, grid in missing.items())
+    return grids
+
+
+def month_grid(audience: str, month) -> dict:
+    return month_grids(audience, [month])[month]
+
+
+def events_between(audience: str, start, end) -> list:
+    """Visible events with start <= event_date < end, from the cached grids of the months involved."""
+    months = [start.replace(day=1)]
+    while _shift_month(months[-1], 1) < end:
+        months.append(_shift_month(months[-1], 1))
+    grids = month_grids(audience, months)
+    return [
+        ev
+        for month in months
+        for ev in grids[month]["events"]
+        if ev.event_date.month == month.month and start <= ev.event_date < end
+    ]
+
+
+def invalidate_dates(dates) -> None:
+    """Drop every cached grid that shows any of `dates` (its own month and the two around it)."""
+    keys = set()
+    for d in dates:
+        if d is None:
+            continue
+        for months in (-1, 0, 1):
+            month = _shift_month(d.replace(day=1), months)
+            keys.update(_cache_key(audience, month) for audience in AUDIENCES)
+    if keys:
+        cache.delete_many(list(keys))
@@ -1,10 +1,9 @@
-from .models import Notification
+from .notifications import unread_count
 
 
 def navbar_notifications(request):
     try:
-        unread_count = Notification.objects.filter(is_read=False).count()
+        count = unread_count(request.user)
     except Exception:
-        unread_count = 0
-    return {"navbar_unread_notifications": unread_count}
-
+        count = 0
+    return {"navbar_unread_notifications": count}
@@ -0,0 +1,225 @@
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from core.models import Invoice, Message, Project, SupportTicket
+from employee.models import Leave
+
+from .models import DashboardScope, DashboardStats, LeaveRequest
+
+
+# ============================================================
+# DASHBOARD STATS
+# ============================================================
+#
+# The HR, client and employee dashboards read one DashboardStats row per
+# scope (GLOBAL, CLIENT <ClientProfile pk>, USER <User pk>) instead of
+# counting rows on every hit. The post_init/post_save/post_delete receivers
+# in hr/signals.py turn each save or delete of a tracked model into F()
+# deltas on the affected rows. Users and client profiles get a zero row
+# when they are created; any other missing row is rebuilt from scratch the
+# first time it is needed. Queryset .update()/bulk writes bypass signals, so
+# `manage.py rebuild_dashboard_stats` reconciles every row periodically.
+
+COUNTERS = (
+    "projects_count",
+    "invoices_pending",
+    "tickets_open",
+    "unread_messages",
+    "pending_leaves",
+    "pending_leave_requests",
+)
+
+# counter: (model, filter, {scope: lookup giving the scope id})
+SOURCES = {
+    "projects_count": (Project, {}, {DashboardScope.CLIENT: "client_id"}),
+    "invoices_pending": (Invoice, {"status": "PENDING"}, {DashboardScope.CLIENT: "project__client_id"}),
+    "tickets_open": (SupportTicket, {"status": "OPEN"}, {DashboardScope.CLIENT: "client_id"}),
+    "unread_messages": (Message, {"is_read": False}, {DashboardScope.CLIENT: "client_id"}),
+    "pending_leaves": (Leave, {"status": "Pending"}, {DashboardScope.USER: "employee_id"}),
+    "pending_leave_requests": (LeaveRequest, {"status": "Pending"}, {DashboardScope.USER: "user_id"}),
+}
+
+
+# -------------------------
+# Tracked models: which counters a row contributes to
+# -------------------------
+
+def _client_of_project(project_id):
+    return Project.objects.filter(pk=project_id).values_list("client_id", flat=True).first()
+
+
+def _project_keys(v):
+    return [(DashboardScope.CLIENT, v["client_id"], "projects_count")]
+
+
+def _invoice_keys(v):
+    if v["status"] != "PENDING":
+        return []
+    return [(DashboardScope.CLIENT, _client_of_project(v["project_id"]), "invoices_pending")]
+
+
+def _ticket_keys(v):
+    return [(DashboardScope.CLIENT, v["client_id"], "tickets_open")] if v["status"] == "OPEN" else []
+
+
+def _message_keys(v):
+    return [(DashboardScope.CLIENT, v["client_id"], "unread_messages")] if not v["is_read"] else []
+
+
+def _leave_keys(v):
+    return [(DashboardScope.USER, v["employee_id"], "pending_leaves")] if v["status"] == "Pending" else []
+
+
+def _leave_request_keys(v):
+    return [(DashboardScope.USER, v["user_id"], "pending_leave_requests")] if v["status"] == "Pending" else []
+
+
+# model: (fields snapshotted on load, keys function)
+TRACKED = {
+    Project: (("client_id",), _project_keys),
+    Invoice: (("project_id", "status"), _invoice_keys),
+    SupportTicket: (("client_id", "status"), _ticket_keys),
+    Message: (("client_id", "is_read"), _message_keys),
+    Leave: (("employee_id", "status"), _leave_keys),
+    LeaveRequest: (("user_id", "status"), _leave_request_keys),
+}
+
+
+def snapshot(instance):
+    """Tracked field values, or None if the instance is unsaved or has deferred fields."""
+    fields, _ = TRACKED[type(instance)]
+    if instance.pk is None or any(f not in instance.__dict__ for f in fields):
+        return None
+    return {f: instance.__dict__[f] for f in fields}
+
+
+def _contributions(model, values) -> Counter:
+    _, keys = TRACKED[model]
+    contributions = Counter()
+    for scope, scope_id, counter in keys(values):
+        contributions[(DashboardScope.GLOBAL, 0, counter)] += 1
+        if scope_id is not None:
+            contributions[(scope, scope_id, counter)] += 1
+    return contributions
+
+
+def record_save(instance, created: bool) -> None:
+    model = type(instance)
+    new = snapshot(instance)
+    old = None if created else getattr(instance, "_dashboard_snapshot", None)
+    instance._dashboard_snapshot = new
+
+    if new is None:
+        return
+    if not created and old is None:
+        # loaded with deferred fields: the previous values are unknown
+        for scope, scope_id, _ in _contributions(model, new):
+            rebuild_scope(scope, scope_id)
+        return
+    if old == new:
+        return
+
+    delta = _contributions(model, new)
+    if old:
+        delta.subtract(_contributions(model, old))
+        if model is Project and old["client_id"] != new["client_id"]:
+            # the project's pending invoices count towards its client, so they move with it
+            pending = Invoice.objects.filter(project_id=instance.pk, status="PENDING").count()
+            delta[(DashboardScope.CLIENT, old["client_id"], "invoices_pending")] -= pending
+            delta[(DashboardScope.CLIENT, new["client_id"], "invoices_pending")] += pending
+    apply_delta(delta)
+
+
+def record_delete(instance) -> None:
+    old = getattr(instance, "_dashboard_snapshot", None) or snapshot(instance)
+    if old is not None:
+        delta = Counter()
+        delta.subtract(_contributions(type(instance), old))
+        apply_delta(delta)
+
+
+def apply_delta(delta) -> None:
+    changes_by_scope = defaultdict(dict)
+    for (scope, scope_id, counter), n in delta.items():
+        if n:
+            changes_by_scope[(scope, scope_id)][counter] = n
+
+    for (scope, scope_id), changes in changes_by_scope.items():
+        updated = DashboardStats.objects.filter(scope=scope, scope_id=scope_id).update(
+            updated_at=timezone.now(),
+            **{counter: F(counter) + n for counter, n in changes.items()},
+        )
+        if not updated:
+            rebuild_scope(scope, scope_id)
+
+
+def create_scope(scope, scope_id) -> None:
+    """Zero row for a user or client profile that has just been created (nothing refers to it yet)."""
+    DashboardStats.objects.bulk_create([DashboardStats(scope=scope, scope_id=scope_id)], ignore_conflicts=True)
+
+
+def discard_scope(scope, scope_id) -> None:
+    DashboardStats.objects.filter(scope=scope, scope_id=scope_id).delete()
+
+
+# -------------------------
+# Reading and rebuilding
+# -------------------------
+
+def _upsert(rows) -> None:
+    DashboardStats.objects.bulk_create(
+        rows,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=["scope", "scope_id"],
+        update_fields=[*COUNTERS, "updated_at"],
+    )
+
+
+def rebuild_scope(scope, scope_id=0) -> DashboardStats:
+    counts = dict.fromkeys(COUNTERS, 0)
+    for counter, (model, where, lookups) in SOURCES.items():
+        queryset = model.objects.filter(**where)
+        if scope != DashboardScope.GLOBAL:
+            if scope not in lookups:
+                continue
+            queryset = queryset.filter(**{lookups[scope]: scope_id})
+        counts[counter] = queryset.count()
+
+    stats = DashboardStats(scope=scope, scope_id=scope_id, **counts)
+    _upsert([stats])
+    return stats
+
+
+def get_stats(scope, scope_id=0) -> DashboardStats:
+    try:
+        return DashboardStats.objects.get(scope=scope, scope_id=scope_id)
+    except DashboardStats.DoesNotExist:
+        return rebuild_scope(scope, scope_id)
+
+
+def rebuild_all() -> int:
+    """Recompute every scope with one grouped query per counter; returns the row count."""
+    with transaction.atomic():
+        rows = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+        rows[(DashboardScope.GLOBAL, 0)]
+        # keep rows for scopes that dropped to zero
+        for key in DashboardStats.objects.values_list("scope", "scope_id"):
+            rows[key]
+
+        for counter, (model, where, lookups) in SOURCES.items():
+            queryset = model.objects.filter(**where).order_by()
+            rows[(DashboardScope.GLOBAL, 0)][counter] = queryset.count()
+            for scope, lookup in lookups.items():
+                grouped = queryset.exclude(**{f"{lookup}__isnull": True}).values(lookup).annotate(n=Count("pk"))
+                for scope_id, n in grouped.values_list(lookup, "n"):
+                    rows[(scope, scope_id)][counter] = n
+
+        _upsert([
+            DashboardStats(scope=scope, scope_id=scope_id, **counts)
+            for (scope, scope_id), counts in rows.items()
+        ])
+    return len(rows)
@@ -0,0 +1,172 @@
+import csv
+from datetime import datetime
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from . import projections
+
+
+# ============================================================
+# STREAMING CSV EXPORTS
+# ============================================================
+#
+# Export links on the HR list pages download the rows the page shows, with
+# the same filters applied. Rows come from a values_list() projection read
+# through a server-side cursor (.iterator(), HR_EXPORT_CHUNK_SIZE rows per
+# fetch) and are handed to the client one CSV line at a time, so memory
+# stays flat however many rows there are and the header is sent before the
+# query has finished. Choice fields are written as their labels, and text
+# that a spreadsheet would run as a formula (=, +, -, @, tab, CR) is
+# prefixed with a quote.
+#
+# There is no XLSX variant: an .xlsx file is a zip archive whose directory
+# is written last, so it cannot be produced line by line like CSV (and it
+# would need openpyxl, which is not a dependency). Spreadsheet apps open
+# the CSV directly.
+#
+# Invoices, payments and tickets export from hr.projections: the querysets
+# are its *_list() ones and the columns follow its field tuples, so the
+# export and the list page cannot drift apart.
+
+
+def projected_columns(fields, headings):
+    """[(heading, lookup), ...] for the projection `fields` that have a heading, in projection order."""
+    unknown = set(headings) - set(fields)
+    if unknown:
+        raise ValueError(f"Export headings for fields outside the projection: {sorted(unknown)}")
+    return [(headings[lookup], lookup) for lookup in fields if lookup in headings]
+
+
+PAYROLL_COLUMNS = [
+    ("Employee", "employee_name"),
+    ("Month", "month"),
+    ("Basic salary", "basic_salary"),
+    ("Allowances", "allowances"),
+    ("Deductions", "deductions"),
+    ("Gross salary", "gross_salary"),
+    ("Net salary", "net_salary"),
+    ("Status", "status"),
+    ("Created", "created_at"),
+]
+INVOICE_COLUMNS = projected_columns(projections.INVOICE_LIST_FIELDS, {
+    "invoice_number": "Invoice",
+    "client__company_name": "Client",
+    "project__name": "Project",
+    "amount": "Amount",
+    "tax_percentage": "Tax %",
+    "tax_amount": "Tax",
+    "total_amount": "Total",
+    "due_date": "Due date",
+    "status": "Status",
+    "created_at": "Created",
+})
+PAYMENT_COLUMNS = projected_columns(projections.PAYMENT_LIST_FIELDS, {
+    "invoice__invoice_number": "Invoice",
+    "invoice__client__company_name": "Client",
+    "amount_paid": "Amount paid",
+    "payment_date": "Payment date",
+    "payment_method": "Method",
+    "reference_number": "Reference",
+    "created_at": "Created",
+})
+TICKET_COLUMNS = projected_columns(projections.TICKET_LIST_FIELDS, {
+    "ticket_id": "Ticket",
+    "subject": "Subject",
+    "client__company_name": "Client",
+    "project__name": "Project",
+    "priority": "Priority",
+    "status": "Status",
+    "assigned_to__username": "Assigned to",
+    "created_at": "Created",
+})
+ATTENDANCE_COLUMNS = [
+    ("Username", "user__username"),
+    ("First name", "user__first_name"),
+    ("Last name", "user__last_name"),
+    ("Date", "date"),
+    ("Check in", "check_in"),
+    ("Check out", "check_out"),
+    ("Hours", "total_hours"),
+    ("Status", "status"),
+]
+LEAVE_COLUMNS = [
+    ("Username", "user__username"),
+    ("Category", "category__name"),
+    ("Start date", "start_date"),
+    ("End date", "end_date"),
+    ("Days", "total_days"),
+    ("Status", "status"),
+    ("Reason", "reason"),
+    ("Approved by", "approved_by__username"),
+    ("Requested", "created_at"),
+]
+TIMESHEET_COLUMNS = [
+    ("Username", "user__username"),
+    ("First name", "user__first_name"),
+    ("Last name", "user__last_name"),
+    ("Present days", "present_days"),
+    ("Absent days", "absent_days"),
+    ("Late days", "late_days"),
+    ("Hours", "total_hours"),
+]
+
+
+# leading characters that make Excel/LibreOffice/Sheets treat a cell as a formula
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+class _Echo:
+    """File-like object whose write() hands the line back, so csv.writer can feed a generator."""
+
+    def write(self, value):
+        return value
+
+
+def _chunk_size() -> int:
+    return getattr(settings, "HR_EXPORT_CHUNK_SIZE", 2000)
+
+
+def _labels(model, lookup):
+    """{stored value: label} for a choice field named directly on `model`, else None."""
+    try:
+        field = model._meta.get_field(lookup)
+    except FieldDoesNotExist:
+        return None
+    return dict(field.flatchoices) if field.choices else None
+
+
+def _cell(value):
+    if isinstance(value, datetime):
+        return timezone.localtime(value).replace(tzinfo=None).isoformat(sep=" ", timespec="seconds")
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return "" if value is None else value
+
+
+def csv_lines(header, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def export_csv(queryset, columns, filename: str) -> StreamingHttpResponse:
+    """Stream `queryset` as CSV; `columns` is [(heading, field lookup), ...]."""
+    lookups = [lookup for _, lookup in columns]
+    labels = [_labels(queryset.model, lookup) for lookup in lookups]
+
+    def rows():
+        for values in queryset.values_list(*lookups).iterator(chunk_size=_chunk_size()):
+            yield [
+                _cell(choices.get(value, value) if choices else value)
+                for value, choices in zip(values, labels)
+            ]
+
+    resp = StreamingHttpResponse(
+        csv_lines([heading for heading, _ in columns], rows()), content_type="text/csv; charset=utf-8"
+    )
+    resp["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return resp
@@ -3,6 +3,7 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 
 from .models import Attendance
+from .payroll_run import display_name
 from .models import (
     LeaveCategory,
     Announcement,
@@ -351,6 +352,8 @@ class ClientForm(forms.ModelForm):
 # Payroll
 # ─────────────────────────────────────────────────────────────
 class PayrollForm(forms.ModelForm):
+    # choices are user ids, so the record is linked to the employee; rows
+    # entered before that keep their name as an extra choice
     employee_name = forms.ChoiceField(
         choices=[],
         widget=forms.Select(attrs={"class": "form-select form-select-sm"}),
@@ -359,17 +362,31 @@ class PayrollForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         employees = User.objects.filter(is_superuser=False).order_by("first_name", "last_name", "username")
+        self.employees = {str(employee.pk): employee for employee in employees}
         choices = [("", "Select Employee")]
-        for employee in employees:
-            value = employee.get_full_name().strip() or employee.username
-            choices.append((value, value))
+        choices += [(pk, display_name(employee)) for pk, employee in self.employees.items()]
 
+        if str(self.instance.employee_id) in self.employees:
+            self.initial["employee_name"] = str(self.instance.employee_id)
         current_value = self.initial.get("employee_name") or getattr(self.instance, "employee_name", "")
         if current_value and current_value not in dict(choices):
             choices.append((current_value, current_value))
 
         self.fields["employee_name"].choices = choices
 
+    def clean(self):
+        cleaned_data = super().clean()
+        employee = self.employees.get(cleaned_data.get("employee_name"))
+        if employee is not None:
+            cleaned_data["employee_name"] = display_name(employee)
+            month = cleaned_data.get("month")
+            duplicate = Payroll.objects.filter(employee=employee, month=month).exclude(pk=self.instance.pk)
+            if month and duplicate.exists():
+                self.add_error("month", f"{display_name(employee)} already has a payroll record for {month}.")
+        if employee is not None or cleaned_data.get("employee_name") != self.instance.employee_name:
+            self.instance.employee = employee
+        return cleaned_data
+
     class Meta:
         model = Payroll
         fields = ["employee_name", "month", "basic_salary", "allowances", "deductions", "status"]
@@ -0,0 +1,167 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core import signing
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from .calendars import AUDIENCES
+from .models import Event, EventAudience
+from .roles import ROLE_CLIENT, ROLE_EMPLOYEE, ROLE_HR, has_role
+
+
+# ============================================================
+# ICALENDAR (RFC 5545)
+# ============================================================
+#
+# Single-event downloads and subscribable per-audience feeds share the
+# VEVENT writer below. Feeds are fetched by calendar apps that have no
+# session, so the URL carries a signed token naming the user and the
+# audience; the user's roles are re-checked on every fetch. A feed covers
+# HR_ICS_FEED_PAST_DAYS back to HR_ICS_FEED_FUTURE_DAYS ahead, is written
+# line by line from a server-side cursor, and its ETag (count + newest
+# updated_at in range) turns the usual every-few-minutes poll into a 304.
+
+PRODID = "-//HR Portal//Events//EN"
+_TOKEN_SALT = "hr.ics"
+
+# feed audience -> EventAudience bits that make an event part of it (None: all events);
+# the role feeds show what the matching calendar page shows
+FEED_AUDIENCES = {
+    **AUDIENCES,
+    # events carry no team, only the "Team" audience: every team gets the same feed
+    "team": EventAudience.TEAM | EventAudience.ALL,
+}
+
+
+def escape_text(value: str) -> str:
+    return (
+        (value or "")
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold(line: str) -> str:
+    """The content line as CRLF-terminated chunks of at most 75 octets, never splitting a character."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + "\r\n"
+    chunks, start, limit = [], 0, 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1  # back off to the start of a multi-byte character
+        chunks.append(encoded[start:end].decode("utf-8"))
+        start, limit = end, 74  # continuation lines spend one octet on the leading space
+    return "\r\n ".join(chunks) + "\r\n"
+
+
+def _utc(value: datetime) -> str:
+    return value.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def event_lines(ev, tz):
+    """Folded VEVENT lines for an Event (or a values() row with the same keys)."""
+    get = ev.get if isinstance(ev, dict) else (lambda name: getattr(ev, name, None))
+    event_date, start_time, end_time = get("event_date"), get("start_time"), get("end_time")
+    stamp = get("updated_at") or get("created_at") or timezone.now()
+    yield "BEGIN:VEVENT\r\n"
+    yield fold(f"UID:hr-event-{get('id')}@hr-portal")
+    yield fold(f"DTSTAMP:{_utc(stamp)}")
+    yield fold(f"LAST-MODIFIED:{_utc(stamp)}")
+    yield fold(f"DTSTART:{_utc(datetime.combine(event_date, start_time, tzinfo=tz))}")
+    yield fold(f"DTEND:{_utc(datetime.combine(event_date, end_time or start_time, tzinfo=tz))}")
+    yield fold(f"SUMMARY:{escape_text(get('title'))}")
+    if get("description"):
+        yield fold(f"DESCRIPTION:{escape_text(get('description'))}")
+    yield fold(f"CATEGORIES:{escape_text(get('event_type'))}")
+    yield "END:VEVENT\r\n"
+
+
+def calendar_lines(events, name: str = ""):
+    tz = timezone.get_current_timezone()
+    yield "BEGIN:VCALENDAR\r\n"
+    yield "VERSION:2.0\r\n"
+    yield fold(f"PRODID:{PRODID}")
+    yield "CALSCALE:GREGORIAN\r\n"
+    if name:
+        yield fold(f"X-WR-CALNAME:{escape_text(name)}")
+    for ev in events:
+        yield from event_lines(ev, tz)
+    yield "END:VCALENDAR\r\n"
+
+
+def build_event_ics(ev: Event) -> str:
+    return "".join(calendar_lines([ev]))
+
+
+# -------------------------
+# Feeds
+# -------------------------
+
+def feed_token(user, audience: str) -> str:
+    return signing.dumps([user.pk, audience], salt=_TOKEN_SALT)
+
+
+def feed_user(token: str, audience: str):
+    """The active user the token was issued to, if it is for `audience` and they may still read it."""
+    from django.contrib.auth import get_user_model
+
+    try:
+        user_id, token_audience = signing.loads(token, salt=_TOKEN_SALT)
+    except (signing.BadSignature, ValueError, TypeError):
+        return None
+    if token_audience != audience:
+        return None
+    user = get_user_model().objects.filter(pk=user_id, is_active=True).first()
+    return user if user and can_read_feed(user, audience) else None
+
+
+def can_read_feed(user, audience: str) -> bool:
+    if has_role(user, ROLE_HR):
+        return audience in FEED_AUDIENCES
+    if audience == "employee":
+        return has_role(user, ROLE_EMPLOYEE)
+    if audience == "team":
+        return user.teams.exists() or user.led_teams.exists()
+    if audience == "client":
+        return has_role(user, ROLE_CLIENT)
+    return False
+
+
+def feed_audiences(user):
+    return [audience for audience in FEED_AUDIENCES if can_read_feed(user, audience)]
+
+
+def feed_events(audience: str, today=None):
+    today = today or timezone.localdate()
+    past = getattr(settings, "HR_ICS_FEED_PAST_DAYS", 90)
+    future = getattr(settings, "HR_ICS_FEED_FUTURE_DAYS", 365)
+    events = Event.objects.filter(
+        event_date__gte=today - timedelta(days=past),
+        event_date__lte=today + timedelta(days=future),
+    )
+    if FEED_AUDIENCES[audience] is not None:
+        events = events.filter(EventAudience.q(FEED_AUDIENCES[audience]))
+    return events
+
+
+def feed_state(audience: str, events, today=None):
+    """(etag value, last modified) for a feed queryset, from one aggregate query."""
+    today = today or timezone.localdate()
+    state = events.aggregate(count=Count("id"), last_modified=Max("updated_at"))
+    last_modified = state["last_modified"]
+    stamp = last_modified.timestamp() if last_modified else 0
+    # the window moves with the date, so the day is part of the tag
+    return f"{audience}-{today:%Y%m%d}-{state['count']}-{stamp}", last_modified
+
+
+def feed_lines(events, name: str):
+    rows = events.order_by("event_date", "start_time").values(
+        "id", "title", "description", "event_type", "event_date", "start_time", "end_time", "updated_at"
+    )
+    return calendar_lines(rows.iterator(chunk_size=500), name)
@@ -0,0 +1,196 @@
+import logging
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import OutboundEmail, OutboundEmailStatus
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================
+# MAIL OUTBOX
+# ============================================================
+#
+# Web requests never talk to SMTP. Mail is written to the OutboundEmail
+# table (directly via queue_mail/queue_messages, or through
+# OutboxEmailBackend for code that calls send_mail / EmailMessage.send),
+# and `manage.py send_outbox` delivers it in batches over one connection
+# using HR_MAIL_DELIVERY_BACKEND, retrying failures with exponential backoff.
+# Each batch is claimed (PENDING -> SENDING plus a token) with one
+# conditional UPDATE before anything is sent, so overlapping senders never
+# deliver the same message twice; a claim older than HR_MAIL_CLAIM_TIMEOUT
+# seconds (a sender that died mid-batch) is picked up again.
+#
+# A row keeps the text and HTML bodies, to/cc/bcc, reply_to and extra
+# headers. Attachments and other alternatives have no column, so a message
+# carrying them is refused (ValueError) rather than queued without them.
+
+def _default_from_email() -> str:
+    return getattr(settings, "DEFAULT_FROM_EMAIL", "noreply@example.com")
+
+
+def _outbox_row(message) -> OutboundEmail:
+    html_body = ""
+    for content, mimetype in getattr(message, "alternatives", []) or []:
+        if mimetype != "text/html" or html_body:
+            raise ValueError(f"The mail outbox keeps one text/html alternative; got {mimetype} on {message.subject!r}")
+        html_body = content
+    if message.attachments:
+        raise ValueError(f"The mail outbox cannot keep attachments ({message.subject!r})")
+    return OutboundEmail(
+        subject=message.subject[:255],
+        body=message.body,
+        html_body=html_body,
+        from_email=message.from_email or _default_from_email(),
+        # kept apart so bcc addresses are never shown to the other recipients
+        to=",".join(message.to),
+        cc=",".join(message.cc),
+        bcc=",".join(message.bcc),
+        reply_to=",".join(message.reply_to),
+        headers=dict(message.extra_headers),
+    )
+
+
+def queue_messages(email_messages) -> int:
+    rows = [_outbox_row(message) for message in email_messages if message.recipients()]
+    OutboundEmail.objects.bulk_create(rows)
+    return len(rows)
+
+
+def queue_mail(subject: str, body: str, recipients, from_email: str = None) -> int:
+    return queue_messages([EmailMultiAlternatives(subject, body, from_email, list(recipients))])
+
+
+class OutboxEmailBackend(BaseEmailBackend):
+    """EMAIL_BACKEND that stores messages in the outbox instead of sending them."""
+
+    def send_messages(self, email_messages):
+        if not email_messages:
+            return 0
+        try:
+            return queue_messages(email_messages)
+        except Exception:
+            if not self.fail_silently:
+                raise
+            return 0
+
+
+# ============================================================
+# OUTBOX SENDER
+# ============================================================
+
+def _delivery_connection():
+    backend = getattr(settings, "HR_MAIL_DELIVERY_BACKEND", "django.core.mail.backends.smtp.EmailBackend")
+    return get_connection(backend=backend, fail_silently=False)
+
+
+def _addresses(value: str):
+    return [addr for addr in value.split(",") if addr]
+
+
+def _as_message(row: OutboundEmail, connection) -> EmailMultiAlternatives:
+    message = EmailMultiAlternatives(
+        row.subject,
+        row.body,
+        row.from_email,
+        _addresses(row.to),
+        bcc=_addresses(row.bcc),
+        connection=connection,
+        headers=row.headers or None,
+        cc=_addresses(row.cc),
+        reply_to=_addresses(row.reply_to),
+    )
+    if row.html_body:
+        message.attach_alternative(row.html_body, "text/html")
+    return message
+
+
+def _schedule_retries(failed) -> None:
+    now = timezone.now()
+    max_attempts = getattr(settings, "HR_MAIL_MAX_ATTEMPTS", 5)
+    backoff = getattr(settings, "HR_MAIL_RETRY_BACKOFF", 60)
+    rows = []
+    for row, error in failed:
+        rows.append(row)
+        row.attempts += 1
+        row.last_error = error[:2000]
+        row.claim, row.claimed_at = "", None
+        if row.attempts >= max_attempts:
+            row.status = OutboundEmailStatus.FAILED
+        else:
+            row.status = OutboundEmailStatus.PENDING
+            row.next_attempt_at = now + timedelta(seconds=backoff * 2 ** (row.attempts - 1))
+    OutboundEmail.objects.bulk_update(
+        rows, ["attempts", "last_error", "status", "next_attempt_at", "claim", "claimed_at"]
+    )
+
+
+def _claim_timeout() -> int:
+    return getattr(settings, "HR_MAIL_CLAIM_TIMEOUT", 600)
+
+
+def claim_batch(batch_size: int = 100) -> list:
+    """Claim up to `batch_size` due messages for this sender and return them."""
+    now = timezone.now()
+    claimable = Q(status=OutboundEmailStatus.PENDING, next_attempt_at__lte=now) | Q(
+        status=OutboundEmailStatus.SENDING, claimed_at__lt=now - timedelta(seconds=_claim_timeout())
+    )
+    candidates = list(
+        OutboundEmail.objects.filter(claimable).order_by("next_attempt_at", "pk").values_list("pk", flat=True)[:batch_size]
+    )
+    if not candidates:
+        return []
+    token = uuid.uuid4().hex
+    # re-checked in the UPDATE: rows another sender claimed meanwhile are skipped
+    OutboundEmail.objects.filter(claimable, pk__in=candidates).update(
+        status=OutboundEmailStatus.SENDING, claim=token, claimed_at=now
+    )
+    return list(OutboundEmail.objects.filter(pk__in=candidates, claim=token).order_by("next_attempt_at", "pk"))
+
+
+def send_pending(batch_size: int = 100) -> dict:
+    """Deliver one batch of due outbox messages over a single connection."""
+    started = time.monotonic()
+    rows = claim_batch(batch_size)
+    stats = {"sent": 0, "retried": 0, "failed": 0, "seconds": 0.0, "per_second": 0.0}
+    if not rows:
+        return stats
+
+    sent_ids, failed = [], []
+    try:
+        with _delivery_connection() as connection:
+            for row in rows:
+                try:
+                    connection.send_messages([_as_message(row, connection)])
+                    sent_ids.append(row.pk)
+                except Exception as exc:
+                    failed.append((row, f"{exc.__class__.__name__}: {exc}"))
+    except Exception as exc:
+        # could not open (or close) the connection: retry everything not yet sent
+        logger.warning("Mail outbox: connection error: %s", exc)
+        failed = [(row, f"{exc.__class__.__name__}: {exc}") for row in rows if row.pk not in sent_ids]
+
+    if sent_ids:
+        OutboundEmail.objects.filter(pk__in=sent_ids).update(
+            status=OutboundEmailStatus.SENT, sent_at=timezone.now(), last_error="", claim="", claimed_at=None
+        )
+    if failed:
+        _schedule_retries(failed)
+
+    stats["sent"] = len(sent_ids)
+    stats["failed"] = sum(1 for row, _ in failed if row.status == OutboundEmailStatus.FAILED)
+    stats["retried"] = len(failed) - stats["failed"]
+    stats["seconds"] = round(time.monotonic() - started, 3)
+    stats["per_second"] = round(stats["sent"] / stats["seconds"], 1) if stats["seconds"] else float(stats["sent"])
+    logger.info(
+        "Mail outbox: sent=%(sent)d retried=%(retried)d failed=%(failed)d in %(seconds)ss (%(per_second)s msg/s)",
+        stats,
+    )
+    return stats
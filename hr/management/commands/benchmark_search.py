@@ -0,0 +1,75 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from hr.models import Note
+from hr.search import backend_name, rebuild_index, search_ids
+
+WORDS = (
+    "payroll leave policy onboarding laptop review budget invoice client project deadline meeting "
+    "training benefits holiday travel expense contract hiring interview feedback quarterly report "
+    "security access badge office remote schedule overtime bonus appraisal compliance audit"
+).split()
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare search_ids() with the old title/description icontains filter on synthetic notes. "
+        "Everything runs inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100_000)
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per query; the best time is reported.")
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        # the real words are diluted with made-up ones so each appears in a
+        # realistic share of the notes rather than in most of them
+        vocabulary = WORDS + ["".join(rng.choices("abcdefghijklmnoprstuvw", k=rng.randint(4, 9))) for _ in range(3000)]
+        queries = ["payroll", "leave policy", "quarterly audit", "onboard", "zebra"]
+
+        with transaction.atomic():
+            started = time.monotonic()
+            Note.objects.bulk_create(
+                (
+                    Note(
+                        title=" ".join(rng.choices(vocabulary, k=4)),
+                        description=" ".join(rng.choices(vocabulary, k=40)),
+                        tags=",".join(rng.choices(WORDS, k=2)),
+                    )
+                    for _ in range(options["rows"])
+                ),
+                batch_size=5000,
+            )
+            rebuild_index(["note"])
+            self.stdout.write(f"Loaded and indexed {options['rows']} notes in {time.monotonic() - started:.1f}s "
+                              f"(backend: {backend_name()}).")
+
+            self.stdout.write(f"{'query':<18}{'matches':>9}{'icontains ms':>15}{'search ms':>12}")
+            for query in queries:
+                old_ms, old_count = self._time(options["repeat"], lambda: self._icontains(query))
+                new_ms, _ = self._time(options["repeat"], lambda: search_ids("note", query, limit=50))
+                self.stdout.write(f"{query:<18}{old_count:>9}{old_ms:>15.1f}{new_ms:>12.1f}")
+
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def _icontains(query):
+        # the pre-index notes_list_view filter, first page of 50 like search_ids(limit=50)
+        notes = Note.objects.filter(Q(title__icontains=query) | Q(description__icontains=query))
+        return notes.count(), list(notes.order_by("-created_at").values_list("pk", flat=True)[:50])
+
+    @staticmethod
+    def _time(repeat, run):
+        best, result = None, None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = run()
+            elapsed = (time.perf_counter() - started) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result[0] if isinstance(result, tuple) else result
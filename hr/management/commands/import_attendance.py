@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from hr.attendance_import import import_attendance
+
+
+class Command(BaseCommand):
+    help = "Upsert attendance records from a CSV or JSON file (see hr/attendance_import.py for the columns)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=["csv", "json"], help="Defaults to sniffing the content.")
+        parser.add_argument("--no-notify", action="store_true", help="Skip the summary notification.")
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["path"], "rb") as handle:
+                result = import_attendance(handle.read(), options["format"], notify=not options["no_notify"])
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        for line, error in result.errors:
+            self.stderr.write(f"line {line}: {error}")
+        self.stdout.write(self.style.SUCCESS(f"{result}."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from hr.attendance_rollup import rebuild_all
+
+
+class Command(BaseCommand):
+    help = "Recompute the monthly attendance rollup from the daily attendance records."
+
+    def handle(self, *args, **options):
+        rows = rebuild_all()
+        self.stdout.write(self.style.SUCCESS(f"Attendance rollup rebuilt ({rows} user-month row(s))."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from hr.dashboard_stats import rebuild_all
+
+
+class Command(BaseCommand):
+    help = "Recompute the materialized dashboard counters (run periodically to reconcile drift)."
+
+    def handle(self, *args, **options):
+        rows = rebuild_all()
+        self.stdout.write(self.style.SUCCESS(f"Dashboard stats rebuilt ({rows} scope row(s))."))
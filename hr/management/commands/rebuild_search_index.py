@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from hr.search import SOURCES, backend_name, rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search documents (all kinds, or the ones given)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("kinds", nargs="*", help=f"Document kinds to rebuild: {', '.join(SOURCES)}.")
+
+    def handle(self, *args, **options):
+        unknown = set(options["kinds"]) - set(SOURCES)
+        if unknown:
+            raise CommandError(f"Unknown document kinds: {', '.join(sorted(unknown))}")
+        counts = rebuild_index(options["kinds"] or None)
+        summary = ", ".join(f"{kind}={count}" for kind, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Search index rebuilt with the {backend_name()} backend: {summary}."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from hr.timeline_counts import rebuild_all
+
+
+class Command(BaseCommand):
+    help = "Recount the like and comment totals stored on timeline posts (run periodically to reconcile drift)."
+
+    def handle(self, *args, **options):
+        posts = rebuild_all()
+        self.stdout.write(self.style.SUCCESS(f"Timeline counts rebuilt ({posts} post(s))."))
@@ -0,0 +1,23 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hr.payroll_run import run_payroll
+
+
+class Command(BaseCommand):
+    help = "Generate (or refresh) the month's payroll records for every active employee from their compensation."
+
+    def add_arguments(self, parser):
+        parser.add_argument("month", help="YYYY-MM")
+
+    def handle(self, *args, **options):
+        try:
+            month = date.fromisoformat(options["month"] + "-01")
+        except ValueError:
+            raise CommandError(f"Invalid month {options['month']!r}; expected YYYY-MM.")
+
+        result = run_payroll(month)
+        for name in result.missing:
+            self.stderr.write(f"no compensation: {name}")
+        self.stdout.write(self.style.SUCCESS(f"{result}."))
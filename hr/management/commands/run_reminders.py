@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from hr.reminders import send_due_reminders
+
+
+class Command(BaseCommand):
+    help = "Queue due event reminders in the mail outbox, either once or in a loop."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Run a single pass and exit.")
+        parser.add_argument("--interval", type=int, default=300, help="Seconds between passes (default: 300).")
+
+    def handle(self, *args, **options):
+        while True:
+            sent = send_due_reminders()
+            if sent or options["verbosity"] > 1:
+                self.stdout.write(f"Queued {sent} event reminder(s).")
+            if options["once"]:
+                break
+            close_old_connections()
+            time.sleep(options["interval"])
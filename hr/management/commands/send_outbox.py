@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from hr.mail import send_pending
+
+
+class Command(BaseCommand):
+    help = "Deliver queued outbox mail in batches, either once or in a loop."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Drain the due messages once and exit.")
+        parser.add_argument("--interval", type=int, default=10, help="Seconds to wait when the outbox is empty (default: 10).")
+        parser.add_argument("--batch-size", type=int, default=100, help="Messages sent per connection (default: 100).")
+
+    def handle(self, *args, **options):
+        while True:
+            stats = send_pending(batch_size=options["batch_size"])
+            if stats["sent"] or stats["retried"] or stats["failed"]:
+                self.stdout.write(
+                    f"Sent {stats['sent']}, retrying {stats['retried']}, failed {stats['failed']} "
+                    f"({stats['per_second']} msg/s)."
+                )
+                # keep draining while there is a backlog
+                if stats["sent"] + stats["retried"] + stats["failed"] >= options["batch_size"]:
+                    continue
+            if options["once"]:
+                break
+            close_old_connections()
+            time.sleep(options["interval"])
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from hr.notifications import sync_unread_counters
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-user unread-notification counters used by the navbar badge."
+
+    def handle(self, *args, **options):
+        users_with_unread = sync_unread_counters()
+        self.stdout.write(self.style.SUCCESS(
+            f"Notification counters synced ({users_with_unread} user(s) with unread notifications)."
+        ))
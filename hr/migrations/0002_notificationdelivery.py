@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:52
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Q
+
+
+def fan_out_existing(apps, schema_editor):
+    Notification = apps.get_model("hr", "Notification")
+    NotificationDelivery = apps.get_model("hr", "NotificationDelivery")
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+
+    recipient_ids = list(
+        User.objects.filter(is_active=True)
+        .filter(Q(is_staff=True) | Q(groups__name="HR"))
+        .distinct()
+        .values_list("pk", flat=True)
+    )
+    if not recipient_ids:
+        return
+
+    deliveries = [
+        NotificationDelivery(
+            notification_id=notification_id,
+            user_id=user_id,
+            is_read=is_read,
+            created_at=created_at,
+        )
+        for notification_id, is_read, created_at in Notification.objects.values_list("pk", "is_read", "created_at").iterator()
+        for user_id in recipient_ids
+    ]
+    NotificationDelivery.objects.bulk_create(deliveries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0001_initial'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationDelivery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_read', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('notification', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deliveries', to='hr.notification')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notification_deliveries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', 'is_read', 'created_at'], name='hr_notif_user_read_idx')],
+                'unique_together': {('notification', 'user')},
+            },
+        ),
+        migrations.RunPython(fan_out_existing, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='notification',
+            name='is_read',
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:56
+
+from django.db import migrations, models
+
+
+# sequence name -> (app, model, field, prefix, first value)
+EXISTING_IDENTIFIERS = {
+    "invoice": ("hr", "Invoice", "invoice_number", "INV", 1),
+    "ticket": ("hr", "Ticket", "ticket_id", "TKT", 1),
+    "client": ("core", "ClientProfile", "client_id", "CL-", 1023),
+    "support_ticket": ("core", "SupportTicket", "ticket_id", "SUP-", 10000),
+}
+
+
+def seed_sequences(apps, schema_editor):
+    Sequence = apps.get_model("hr", "Sequence")
+    for name, (app_label, model_name, field, prefix, start) in EXISTING_IDENTIFIERS.items():
+        model = apps.get_model(app_label, model_name)
+        last = start - 1
+        for value in model.objects.filter(**{f"{field}__startswith": prefix}).values_list(field, flat=True).iterator():
+            number = value[len(prefix):]
+            if number.isdigit():
+                last = max(last, int(number))
+        Sequence.objects.update_or_create(name=name, defaults={"value": last})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0004_outboundemail'),
+        ('core', '0008_delete_event'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Sequence',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(seed_sequences, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0005_sequence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('GLOBAL', 'Global'), ('CLIENT', 'Client'), ('USER', 'User')], max_length=10)),
+                ('scope_id', models.PositiveIntegerField(default=0)),
+                ('projects_count', models.IntegerField(default=0)),
+                ('invoices_pending', models.IntegerField(default=0)),
+                ('tickets_open', models.IntegerField(default=0)),
+                ('unread_messages', models.IntegerField(default=0)),
+                ('pending_leaves', models.IntegerField(default=0)),
+                ('pending_leave_requests', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Dashboard stats',
+                'unique_together': {('scope', 'scope_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:05
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    TimelinePost = apps.get_model("hr", "TimelinePost")
+    TimelineLike = apps.get_model("hr", "TimelineLike")
+    TimelineComment = apps.get_model("hr", "TimelineComment")
+
+    def count_of(model):
+        rows = model.objects.filter(post=OuterRef("pk")).order_by().values("post").annotate(n=Count("pk")).values("n")
+        return Coalesce(Subquery(rows), 0)
+
+    TimelinePost.objects.update(like_count=count_of(TimelineLike), comment_count=count_of(TimelineComment))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0007_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='timelinepost',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='timelinepost',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='timelinecomment',
+            index=models.Index(fields=['post', '-created_at', '-id'], name='hr_timeline_comment_idx'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
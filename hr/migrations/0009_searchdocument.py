@@ -0,0 +1,124 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:08
+
+from django.db import migrations, models
+
+
+FTS5_SQL = [
+    "CREATE VIRTUAL TABLE hr_search_fts USING fts5("
+    "title, body, content='hr_searchdocument', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER hr_search_fts_ai AFTER INSERT ON hr_searchdocument BEGIN "
+    "INSERT INTO hr_search_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    "CREATE TRIGGER hr_search_fts_ad AFTER DELETE ON hr_searchdocument BEGIN "
+    "INSERT INTO hr_search_fts(hr_search_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); END",
+    "CREATE TRIGGER hr_search_fts_au AFTER UPDATE ON hr_searchdocument BEGIN "
+    "INSERT INTO hr_search_fts(hr_search_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); "
+    "INSERT INTO hr_search_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+]
+
+FTS5_DROP_SQL = [
+    "DROP TRIGGER IF EXISTS hr_search_fts_au",
+    "DROP TRIGGER IF EXISTS hr_search_fts_ad",
+    "DROP TRIGGER IF EXISTS hr_search_fts_ai",
+    "DROP TABLE IF EXISTS hr_search_fts",
+]
+
+
+# The document sources as of this migration (a frozen copy of hr.search.SOURCES,
+# which may change after this migration has been written):
+# kind -> (app label, model, values() lookups, title fields, body fields).
+SOURCES = {
+    "note": ("hr", "Note", ("title", "description", "tags"), ("title",), ("description", "tags")),
+    "help": ("hr", "HelpArticle", ("title", "content"), ("title",), ("content",)),
+    "user": (
+        "auth", "User",
+        (
+            "username", "first_name", "last_name", "email",
+            "employeeprofile__emp_id", "employeeprofile__department", "employeeprofile__designation",
+        ),
+        ("first_name", "last_name"),
+        (
+            "username", "email",
+            "employeeprofile__emp_id", "employeeprofile__department", "employeeprofile__designation",
+        ),
+    ),
+    "ticket": ("hr", "Ticket", ("ticket_id", "subject", "description"), ("ticket_id", "subject"), ("description",)),
+    "support_ticket": (
+        "core", "SupportTicket", ("ticket_id", "title", "description"), ("ticket_id", "title"), ("description",),
+    ),
+}
+
+
+def _join(row, fields):
+    return " ".join(str(row[field]) for field in fields if row[field])
+
+
+def _gin_index():
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    vector = SearchVector("title", weight="A", config="simple") + SearchVector("body", weight="B", config="simple")
+    return GinIndex(vector, name="hr_search_vector_idx")
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute("PRAGMA compile_options")
+            if "ENABLE_FTS5" not in {row[0] for row in cursor.fetchall()}:
+                return  # no FTS5 in this SQLite build: hr.search uses the basic backend
+        for sql in FTS5_SQL:
+            schema_editor.execute(sql)
+    elif vendor == "postgresql":
+        schema_editor.add_index(apps.get_model("hr", "SearchDocument"), _gin_index())
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        for sql in FTS5_DROP_SQL:
+            schema_editor.execute(sql)
+    elif vendor == "postgresql":
+        schema_editor.remove_index(apps.get_model("hr", "SearchDocument"), _gin_index())
+
+
+def build_documents(apps, schema_editor):
+    SearchDocument = apps.get_model("hr", "SearchDocument")
+    for kind, (app_label, model_name, fields, title_fields, body_fields) in SOURCES.items():
+        batch = []
+        for row in apps.get_model(app_label, model_name).objects.values("pk", *fields).iterator(chunk_size=2000):
+            # users without a name are titled by their username
+            title = _join(row, title_fields) or row.get("username", "")
+            batch.append(SearchDocument(kind=kind, object_id=row["pk"], title=title[:255], body=_join(row, body_fields)))
+            if len(batch) >= 2000:
+                SearchDocument.objects.bulk_create(batch)
+                batch = []
+        SearchDocument.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0008_timelinepost_counters'),
+        ('core', '0008_delete_event'),
+        ('employee', '0004_event'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=30)),
+                ('object_id', models.PositiveIntegerField()),
+                ('title', models.CharField(blank=True, max_length=255)),
+                ('body', models.TextField(blank=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.RunPython(build_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def parse_tags(value):
+    """Normalized, de-duplicated tag names from a "tag1, tag2" string (hr.models.parse_tags as of this migration)."""
+    names = []
+    for part in (value or "").split(","):
+        name = " ".join(part.split()).lower()[:50]
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def backfill_tags(apps, schema_editor):
+    Note = apps.get_model("hr", "Note")
+    Tag = apps.get_model("hr", "Tag")
+    NoteTag = apps.get_model("hr", "NoteTag")
+
+    note_names = {pk: parse_tags(tags) for pk, tags in Note.objects.exclude(tags="").values_list("pk", "tags")}
+    all_names = {name for names in note_names.values() for name in names}
+    Tag.objects.bulk_create([Tag(name=name) for name in sorted(all_names)], ignore_conflicts=True)
+    tag_ids = dict(Tag.objects.values_list("name", "pk"))
+    NoteTag.objects.bulk_create(
+        [NoteTag(note_id=pk, tag_id=tag_ids[name]) for pk, names in note_names.items() for name in names],
+        batch_size=2000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0009_searchdocument'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='NoteTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('note', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='hr.note')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='hr.tag')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='note',
+            name='tag_index',
+            field=models.ManyToManyField(blank=True, related_name='notes', through='hr.NoteTag', to='hr.tag'),
+        ),
+        migrations.AddIndex(
+            model_name='notetag',
+            index=models.Index(fields=['tag', 'note'], name='hr_notetag_tag_note_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='notetag',
+            unique_together={('note', 'tag')},
+        ),
+        migrations.RunPython(backfill_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:13
+
+import re
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+# hr.models.EventAudience bits and parsing as of this migration
+AUDIENCE_BITS = {"hr": 1, "employee": 2, "client": 4, "team": 8, "all": 16}
+
+
+def parse_audience(share_with):
+    audience = 0
+    for word in re.findall(r"[a-z]+", (share_with or "").lower()):
+        if word in ("hr", "all"):
+            audience |= AUDIENCE_BITS[word]
+        else:
+            # "Employees", "Clients", "Teams" count as well
+            for name in ("employee", "client", "team"):
+                if word.startswith(name):
+                    audience |= AUDIENCE_BITS[name]
+    return audience
+
+
+def backfill_audience(apps, schema_editor):
+    Event = apps.get_model("hr", "Event")
+    # one UPDATE per distinct share_with text rather than per event
+    for share_with in Event.objects.values_list("share_with", flat=True).distinct().order_by():
+        Event.objects.filter(share_with=share_with).update(audience=parse_audience(share_with))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0010_note_tags'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='audience',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['audience', 'event_date'], name='hr_event_audience_idx'),
+        ),
+        migrations.RunPython(backfill_audience, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:30
+
+from datetime import datetime
+from decimal import Decimal
+
+from django.db import migrations
+from django.utils import timezone
+
+
+def hours_between(day, check_in, check_out):
+    """hr.models.Attendance.hours_between as of this migration."""
+    if not (check_in and check_out):
+        return Decimal("0.00")
+    delta = datetime.combine(day, check_out) - datetime.combine(day, check_in)
+    return Decimal(str(delta.total_seconds() / 3600)).quantize(Decimal("0.01"))
+
+
+def merge_punches(apps, schema_editor):
+    """
+    Fold employee.Attendance punches into hr.Attendance: one row per
+    (user, date) with the earliest clock-in and latest clock-out (as local
+    times). Where HR already has a row, its values win and the punches only
+    fill empty check-in/check-out times.
+    """
+    Punch = apps.get_model("employee", "Attendance")
+    Attendance = apps.get_model("hr", "Attendance")
+
+    merged = {}
+    for user_id, day, clock_in, clock_out in Punch.objects.values_list(
+        "employee_id", "date", "clock_in", "clock_out"
+    ).iterator(chunk_size=2000):
+        check_in = timezone.localtime(clock_in).time().replace(microsecond=0) if clock_in else None
+        check_out = timezone.localtime(clock_out).time().replace(microsecond=0) if clock_out else None
+        current = merged.setdefault((user_id, day), [None, None])
+        if check_in and (current[0] is None or check_in < current[0]):
+            current[0] = check_in
+        if check_out and (current[1] is None or check_out > current[1]):
+            current[1] = check_out
+    if not merged:
+        return
+
+    existing = {
+        (row.user_id, row.date): row
+        for row in Attendance.objects.filter(user_id__in={user_id for user_id, _ in merged})
+    }
+    new_rows, changed_rows = [], []
+    for (user_id, day), (check_in, check_out) in merged.items():
+        row = existing.get((user_id, day))
+        if row is None:
+            new_rows.append(Attendance(
+                user_id=user_id, date=day, check_in=check_in, check_out=check_out, status="PRESENT",
+                total_hours=hours_between(day, check_in, check_out),
+            ))
+        elif (row.check_in is None and check_in) or (row.check_out is None and check_out):
+            row.check_in = row.check_in or check_in
+            row.check_out = row.check_out or check_out
+            row.total_hours = hours_between(day, row.check_in, row.check_out)
+            changed_rows.append(row)
+
+    Attendance.objects.bulk_create(new_rows, batch_size=1000)
+    Attendance.objects.bulk_update(changed_rows, ["check_in", "check_out", "total_hours"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0012_event_updated_at'),
+        ('employee', '0004_event'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_punches, migrations.RunPython.noop),
+    ]
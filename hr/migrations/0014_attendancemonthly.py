@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import TruncMonth
+
+
+def build_rollup(apps, schema_editor):
+    """Fill AttendanceMonthly from the daily rows (hr.attendance_rollup.rebuild_all as of this migration)."""
+    Attendance = apps.get_model("hr", "Attendance")
+    AttendanceMonthly = apps.get_model("hr", "AttendanceMonthly")
+    grouped = (
+        Attendance.objects.order_by()
+        .annotate(month=TruncMonth("date"))
+        .values("user_id", "month")
+        .annotate(
+            present_days=models.Count("pk", filter=models.Q(status="PRESENT")),
+            absent_days=models.Count("pk", filter=models.Q(status="ABSENT")),
+            late_days=models.Count("pk", filter=models.Q(status="LATE")),
+            total_hours=models.Sum("total_hours"),
+        )
+    )
+    AttendanceMonthly.objects.bulk_create(
+        [
+            AttendanceMonthly(
+                user_id=row.pop("user_id"), month=row.pop("month"), **{k: v or 0 for k, v in row.items()}
+            )
+            for row in grouped.iterator(chunk_size=2000)
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0013_merge_employee_attendance'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceMonthly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('present_days', models.PositiveSmallIntegerField(default=0)),
+                ('absent_days', models.PositiveSmallIntegerField(default=0)),
+                ('late_days', models.PositiveSmallIntegerField(default=0)),
+                ('total_hours', models.DecimalField(decimal_places=2, default=0, max_digits=7)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_months', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-month', 'user'],
+                'indexes': [models.Index(fields=['month', 'user'], name='hr_attendance_month_idx')],
+                'unique_together': {('user', 'month')},
+            },
+        ),
+        migrations.RunPython(build_rollup, migrations.RunPython.noop),
+    ]
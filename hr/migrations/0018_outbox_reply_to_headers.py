@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0017_outbox_claim_cc_bcc'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboundemail',
+            name='headers',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='outboundemail',
+            name='reply_to',
+            field=models.TextField(blank=True),
+        ),
+    ]
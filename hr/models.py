@@ -1,11 +1,16 @@
+import enum
+import re
 from datetime import timedelta
 from decimal import Decimal
 
 from django.contrib.auth.models import User
-from django.db import models
-from django.db.models import Sum
+from django.db import models, transaction
+from django.db.models import Q, Sum
+from django.utils import timezone
 from django.utils.text import slugify
 
+from .sequences import next_identifier
+
 
 # -------------------------
 # USER PROFILE + ROLES
@@ -104,18 +109,41 @@ class Attendance(models.Model):
         verbose_name_plural = "Attendance records"
 
     def save(self, *args, **kwargs):
-        if self.check_in and self.check_out:
-            from datetime import datetime
-            delta = datetime.combine(self.date, self.check_out) - datetime.combine(self.date, self.check_in)
-            self.total_hours = Decimal(str(delta.total_seconds() / 3600)).quantize(Decimal("0.01"))
-        else:
-            self.total_hours = Decimal("0.00")
+        self.total_hours = self.hours_between(self.date, self.check_in, self.check_out)
         super().save(*args, **kwargs)
 
+    @staticmethod
+    def hours_between(day, check_in, check_out) -> Decimal:
+        if not (check_in and check_out):
+            return Decimal("0.00")
+        from datetime import datetime
+        delta = datetime.combine(day, check_out) - datetime.combine(day, check_in)
+        return Decimal(str(delta.total_seconds() / 3600)).quantize(Decimal("0.01"))
+
     def __str__(self):
         return f"{self.user.get_full_name() or self.user.username} - {self.date} ({self.get_status_display()})"
 
 
+class AttendanceMonthly(models.Model):
+    """Per user and month totals of Attendance, kept current by hr.attendance_rollup."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="attendance_months")
+    month = models.DateField()  # first day of the month
+    present_days = models.PositiveSmallIntegerField(default=0)
+    absent_days = models.PositiveSmallIntegerField(default=0)
+    late_days = models.PositiveSmallIntegerField(default=0)
+    total_hours = models.DecimalField(max_digits=7, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-month", "user"]
+        unique_together = [["user", "month"]]
+        # the timesheet reads one month for everyone, in user order
+        indexes = [models.Index(fields=["month", "user"], name="hr_attendance_month_idx")]
+
+    def __str__(self):
+        return f"{self.user} - {self.month:%Y-%m}"
+
+
 # -------------------------
 # LEAVES
 # -------------------------
@@ -158,6 +186,7 @@ class LeaveRequest(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["-created_at", "-id"], name="hr_leave_keyset_idx")]
 
     def save(self, *args, **kwargs):
         if self.start_date and self.end_date:
@@ -194,6 +223,7 @@ class Announcement(models.Model):
 
     class Meta:
         ordering = ["-publish_date", "-created_at"]
+        indexes = [models.Index(fields=["-publish_date", "-created_at", "-id"], name="hr_announce_keyset_idx")]
 
     def __str__(self):
         return self.title
@@ -210,6 +240,34 @@ class EventType(models.TextChoices):
     OTHER = "OTHER", "Other"
 
 
+class EventAudience(enum.IntFlag):
+    """Bits of Event.audience, derived from the free-text share_with on save."""
+    HR = 1
+    EMPLOYEE = 2
+    CLIENT = 4
+    TEAM = 8
+    ALL = 16
+
+    @classmethod
+    def parse(cls, share_with: str) -> "EventAudience":
+        audience = cls(0)
+        for word in re.findall(r"[a-z]+", (share_with or "").lower()):
+            if word in ("hr", "all"):
+                audience |= cls[word.upper()]
+            else:
+                # "Employees", "Clients", "Teams" count as well
+                for flag in (cls.EMPLOYEE, cls.CLIENT, cls.TEAM):
+                    if word.startswith(flag.name.lower()):
+                        audience |= flag
+        return audience
+
+    @classmethod
+    def q(cls, audience: "EventAudience") -> Q:
+        """Events shared with any of `audience`: an IN over the handful of masks, so it can use the index."""
+        every = sum(cls)
+        return Q(audience__in=[value for value in range(1, every + 1) if value & audience])
+
+
 class Event(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
@@ -219,6 +277,8 @@ class Event(models.Model):
 
     # Example: "HR,Client,Employee" / "All" etc.
     share_with = models.CharField(max_length=255)
+    # EventAudience bits for share_with, so visibility filters don't scan the text
+    audience = models.PositiveSmallIntegerField(default=0, editable=False)
 
     event_type = models.CharField(max_length=20, choices=EventType.choices, default=EventType.MEETING)
 
@@ -231,12 +291,17 @@ class Event(models.Model):
     )
 
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     reminder_sent = models.BooleanField(default=False)
     reminder_enabled = models.BooleanField(default=True)
     reminder_date = models.DateField(null=True, blank=True)
+    # set by the reminder worker while it is sending this event's reminder
+    reminder_claim = models.CharField(max_length=32, blank=True, editable=False)
+    reminder_claimed_at = models.DateTimeField(null=True, blank=True, editable=False)
 
     class Meta:
         ordering = ["event_date", "start_time"]
+        indexes = [models.Index(fields=["audience", "event_date"], name="hr_event_audience_idx")]
 
     def __str__(self):
         return self.title
@@ -244,6 +309,7 @@ class Event(models.Model):
     def save(self, *args, **kwargs):
         if self.reminder_enabled and not self.reminder_date and self.event_date:
             self.reminder_date = self.event_date - timedelta(days=1)
+        self.audience = EventAudience.parse(self.share_with)
         super().save(*args, **kwargs)
 
 
@@ -264,7 +330,6 @@ class Notification(models.Model):
     title = models.CharField(max_length=255)
     message = models.TextField()
     type = models.CharField(max_length=20, choices=NotificationType.choices)
-    is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -274,6 +339,80 @@ class Notification(models.Model):
         return self.title
 
 
+# one row per recipient; read state is per user
+class NotificationDelivery(models.Model):
+    notification = models.ForeignKey(Notification, on_delete=models.CASCADE, related_name="deliveries")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="notification_deliveries")
+    is_read = models.BooleanField(default=False)
+    # copied from the notification so the per-user feed never has to join for ordering
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["-created_at"]
+        unique_together = [("notification", "user")]
+        indexes = [
+            models.Index(fields=["user", "is_read", "created_at"], name="hr_notif_user_read_idx"),
+            models.Index(fields=["user", "-created_at", "-id"], name="hr_notif_user_feed_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.notification.title} -> {self.user.username}"
+
+
+# denormalized unread-delivery count behind the navbar badge (hr.notifications)
+class UnreadNotificationCount(models.Model):
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name="unread_notification_count"
+    )
+    unread = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user} ({self.unread} unread)"
+
+
+# -------------------------
+# OUTBOUND MAIL (OUTBOX)
+# -------------------------
+
+class OutboundEmailStatus(models.TextChoices):
+    PENDING = "PENDING", "Pending"
+    SENDING = "SENDING", "Sending"
+    SENT = "SENT", "Sent"
+    FAILED = "FAILED", "Failed"
+
+
+class OutboundEmail(models.Model):
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=255)
+    to = models.TextField()  # comma-separated recipients
+    cc = models.TextField(blank=True)
+    bcc = models.TextField(blank=True)
+    reply_to = models.TextField(blank=True)
+    headers = models.JSONField(default=dict, blank=True)  # EmailMessage.extra_headers
+
+    status = models.CharField(max_length=10, choices=OutboundEmailStatus.choices, default=OutboundEmailStatus.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    # set while a sender delivers the row, so concurrent senders skip it
+    claim = models.CharField(max_length=32, blank=True, default="")
+    claimed_at = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="hr_outbox_due_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.to}"
+
+
 # -------------------------
 # ADMIN PROFILE (SAFE)
 # -------------------------
@@ -301,7 +440,26 @@ class PayrollStatus(models.TextChoices):
     PENDING = "PENDING", "Pending"
 
 
+class Compensation(models.Model):
+    """An employee's standing monthly salary components; payroll runs copy them into Payroll rows."""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="compensation")
+    basic_salary = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    allowances = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    deductions = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["user"]
+
+    def __str__(self):
+        return f"{self.user} compensation"
+
+
 class Payroll(models.Model):
+    # set on rows generated by a payroll run; hand-entered rows may only carry the name
+    employee = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True, related_name="payrolls"
+    )
     employee_name = models.CharField(max_length=255)
     month = models.CharField(max_length=20)
     basic_salary = models.DecimalField(max_digits=12, decimal_places=2, default=0)
@@ -314,12 +472,20 @@ class Payroll(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        # one row per employee and month, which is what makes payroll runs repeatable
+        unique_together = [["employee", "month"]]
+        indexes = [models.Index(fields=["-created_at", "-id"], name="hr_payroll_keyset_idx")]
 
     def save(self, *args, **kwargs):
-        self.gross_salary = (self.basic_salary or Decimal("0")) + (self.allowances or Decimal("0"))
-        self.net_salary = (self.gross_salary or Decimal("0")) - (self.deductions or Decimal("0"))
+        self.gross_salary, self.net_salary = self.totals(self.basic_salary, self.allowances, self.deductions)
         super().save(*args, **kwargs)
 
+    @staticmethod
+    def totals(basic_salary, allowances, deductions):
+        """(gross, net) salary for the given components."""
+        gross = (basic_salary or Decimal("0")) + (allowances or Decimal("0"))
+        return gross, gross - (deductions or Decimal("0"))
+
     def __str__(self):
         return f"{self.employee_name} - {self.month}"
 
@@ -346,6 +512,7 @@ class Project(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["-created_at", "-id"], name="hr_project_keyset_idx")]
 
     def __str__(self):
         return self.name
@@ -379,6 +546,7 @@ class Task(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["-created_at", "-id"], name="hr_task_keyset_idx")]
 
     def __str__(self):
         return self.title
@@ -404,6 +572,7 @@ class Client(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["-created_at", "-id"], name="hr_client_keyset_idx")]
 
     def __str__(self):
         return self.company_name
@@ -435,23 +604,19 @@ class Invoice(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["-created_at", "-id"], name="hr_invoice_keyset_idx")]
 
     def __str__(self):
         return self.invoice_number
 
     def save(self, *args, **kwargs):
-        if not self.invoice_number:
-            last_invoice = Invoice.objects.order_by("-id").first()
-            next_number = 1
-            if last_invoice and last_invoice.invoice_number.startswith("INV"):
-                numeric_part = last_invoice.invoice_number.replace("INV", "")
-                if numeric_part.isdigit():
-                    next_number = int(numeric_part) + 1
-            self.invoice_number = f"INV{next_number:04d}"
-
         self.tax_amount = (Decimal(str(self.amount)) * Decimal(str(self.tax_percentage)) / Decimal("100")).quantize(Decimal("0.01"))
         self.total_amount = (Decimal(str(self.amount)) + self.tax_amount).quantize(Decimal("0.01"))
-        super().save(*args, **kwargs)
+
+        with transaction.atomic():
+            if not self.invoice_number:
+                self.invoice_number = next_identifier("invoice")
+            super().save(*args, **kwargs)
 
     def refresh_payment_status(self):
         paid_total = self.payments.aggregate(total=Sum("amount_paid"))["total"] or Decimal("0")
@@ -484,6 +649,7 @@ class Payment(models.Model):
 
     class Meta:
         ordering = ["-payment_date", "-created_at"]
+        indexes = [models.Index(fields=["-created_at", "-id"], name="hr_payment_keyset_idx")]
 
     def __str__(self):
         return f"{self.invoice.invoice_number} - {self.amount_paid}"
@@ -539,24 +705,19 @@ class Ticket(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["-created_at", "-id"], name="hr_ticket_keyset_idx")]
 
     def __str__(self):
         return self.ticket_id
 
     def save(self, *args, **kwargs):
-        if not self.ticket_id:
-            last_ticket = Ticket.objects.order_by("-id").first()
-            next_number = 1
-            if last_ticket and last_ticket.ticket_id.startswith("TKT"):
-                numeric_part = last_ticket.ticket_id.replace("TKT", "")
-                if numeric_part.isdigit():
-                    next_number = int(numeric_part) + 1
-            self.ticket_id = f"TKT{next_number:04d}"
-
         if not self.status:
             self.status = TicketStatus.OPEN
 
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            if not self.ticket_id:
+                self.ticket_id = next_identifier("ticket")
+            super().save(*args, **kwargs)
 
 
 class TicketComment(models.Model):
@@ -580,6 +741,26 @@ class NoteVisibility(models.TextChoices):
     SHARED = "SHARED", "Shared"
 
 
+def parse_tags(value):
+    """Normalized, de-duplicated tag names from a "tag1, tag2" string, in the order given."""
+    names = []
+    for part in (value or "").split(","):
+        name = " ".join(part.split()).lower()[:50]
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+class Tag(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self):
+        return self.name
+
+
 class Note(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField()
@@ -598,12 +779,45 @@ class Note(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # `tags` stays the editable text; these rows mirror it for filtering and counts
+    tag_index = models.ManyToManyField(Tag, through="NoteTag", related_name="notes", blank=True)
+
     class Meta:
         ordering = ["-created_at"]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if update_fields is None or "tags" in update_fields:
+                self.sync_tags()
+
+    def sync_tags(self):
+        names = parse_tags(self.tags)
+        current = dict(self.notetag_set.values_list("tag__name", "pk"))
+        stale = [pk for name, pk in current.items() if name not in names]
+        if stale:
+            NoteTag.objects.filter(pk__in=stale).delete()
+        missing = [name for name in names if name not in current]
+        if missing:
+            Tag.objects.bulk_create([Tag(name=name) for name in missing], ignore_conflicts=True)
+            NoteTag.objects.bulk_create(
+                [NoteTag(note=self, tag=tag) for tag in Tag.objects.filter(name__in=missing)]
+            )
+
+
+class NoteTag(models.Model):
+    note = models.ForeignKey(Note, on_delete=models.CASCADE)
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE)
+
+    class Meta:
+        unique_together = [["note", "tag"]]
+        # (note, tag) is covered by the unique index; this one serves "notes with tag X" and tag counts
+        indexes = [models.Index(fields=["tag", "note"], name="hr_notetag_tag_note_idx")]
+
 
 # -------------------------
 # TIMELINE
@@ -635,9 +849,13 @@ class TimelinePost(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
     view_count = models.PositiveIntegerField(default=0)
+    # kept in step by hr.timeline_counts so the feed never counts rows
+    like_count = models.PositiveIntegerField(default=0)
+    comment_count = models.PositiveIntegerField(default=0)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["-created_at", "-id"], name="hr_timeline_keyset_idx")]
 
     def __str__(self):
         return self.title or self.message[:50]
@@ -660,6 +878,7 @@ class TimelineComment(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["post", "-created_at", "-id"], name="hr_timeline_comment_idx")]
 
 
 # -------------------------
@@ -719,4 +938,65 @@ class PersonalTask(models.Model):
         ordering = ["is_completed", "due_date", "-created_at"]
 
     def __str__(self):
-        return f"{self.user.username} - {self.description[:50]}"
\ No newline at end of file
+        return f"{self.user.username} - {self.description[:50]}"
+
+
+# -------------------------
+# SEQUENCES (INV/TKT/CL/SUP identifiers)
+# -------------------------
+
+class Sequence(models.Model):
+    name = models.CharField(max_length=50, primary_key=True)
+    value = models.BigIntegerField(default=0)  # last value handed out
+
+    def __str__(self):
+        return f"{self.name}={self.value}"
+
+
+# -------------------------
+# DASHBOARD STATS (materialized counters, see hr/dashboard_stats.py)
+# -------------------------
+
+class DashboardScope(models.TextChoices):
+    GLOBAL = "GLOBAL", "Global"
+    CLIENT = "CLIENT", "Client"
+    USER = "USER", "User"
+
+
+class DashboardStats(models.Model):
+    scope = models.CharField(max_length=10, choices=DashboardScope.choices)
+    scope_id = models.PositiveIntegerField(default=0)  # ClientProfile / User pk, 0 for GLOBAL
+
+    projects_count = models.IntegerField(default=0)
+    invoices_pending = models.IntegerField(default=0)
+    tickets_open = models.IntegerField(default=0)
+    unread_messages = models.IntegerField(default=0)
+    pending_leaves = models.IntegerField(default=0)
+    pending_leave_requests = models.IntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Dashboard stats"
+        unique_together = [("scope", "scope_id")]
+
+    def __str__(self):
+        return f"{self.scope}:{self.scope_id}"
+
+
+# -------------------------
+# SEARCH INDEX (see hr/search.py)
+# -------------------------
+
+class SearchDocument(models.Model):
+    kind = models.CharField(max_length=30)  # hr.search.SOURCES key
+    object_id = models.PositiveIntegerField()
+    title = models.CharField(max_length=255, blank=True)
+    body = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = [("kind", "object_id")]
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id}"
@@ -0,0 +1,133 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
+
+from .buffers import BufferedWriter
+from .models import Notification, NotificationDelivery, NotificationType, UnreadNotificationCount
+from .roles import ROLE_HR
+
+User = get_user_model()
+
+
+# ============================================================
+# NOTIFICATION FAN-OUT
+# ============================================================
+#
+# Views call create_notification(), which only queues the notification.
+# NotificationWriter flushes the queue in batches off the request path
+# (see hr.buffers), so a burst of notifications becomes one bulk insert.
+
+def recipient_ids():
+    # HR notifications go to every active HR user (group member or staff)
+    return list(
+        User.objects.filter(is_active=True)
+        .filter(Q(is_staff=True) | Q(groups__name=ROLE_HR))
+        .distinct()
+        .values_list("pk", flat=True)
+    )
+
+
+def write_notifications(items) -> None:
+    """Insert a batch of (title, message, type) notifications and their deliveries."""
+    user_ids = recipient_ids()
+    with transaction.atomic():
+        notifications = Notification.objects.bulk_create([
+            Notification(title=title, message=message, type=notification_type)
+            for title, message, notification_type in items
+        ])
+        NotificationDelivery.objects.bulk_create(
+            [
+                NotificationDelivery(notification=notification, user_id=user_id, created_at=notification.created_at)
+                for notification in notifications
+                for user_id in user_ids
+            ],
+            batch_size=1000,
+        )
+        # inside the transaction, so a failed batch can be retried as a whole
+        adjust_unread(user_ids, len(notifications))
+
+
+class NotificationWriter(BufferedWriter):
+    def write(self, items) -> None:
+        write_notifications(items)
+
+
+notification_writer = NotificationWriter(
+    "hr-notifications",
+    flush_interval=getattr(settings, "HR_NOTIFICATION_FLUSH_INTERVAL", 2.0),
+    max_size=getattr(settings, "HR_NOTIFICATION_BUFFER_SIZE", 500),
+)
+
+
+def create_notification(title: str, message: str, notification_type: str) -> None:
+    if notification_type not in dict(NotificationType.choices):
+        notification_type = NotificationType.ANNOUNCEMENT
+
+    item = (title[:255], message, notification_type)
+    # queue only once the surrounding transaction (if any) has committed
+    transaction.on_commit(lambda: notification_writer.put(item))
+
+
+def deliveries_for(user):
+    return NotificationDelivery.objects.filter(user=user)
+
+
+# ============================================================
+# UNREAD COUNTERS
+# ============================================================
+#
+# The navbar badge reads one UnreadNotificationCount row per user (a
+# primary-key lookup) instead of counting deliveries. Writers adjust it
+# with a single UPDATE ... SET unread = unread + delta, so concurrent
+# workers and the background writer never lose each other's changes. New
+# users get a zero row when they are created (hr.signals); a row that is
+# still missing (users from before the counters) is recomputed on the next
+# read, and `manage.py sync_notification_counters` rebuilds them all.
+
+def unread_count(user) -> int:
+    if not user.is_authenticated:
+        return 0
+
+    count = UnreadNotificationCount.objects.filter(pk=user.pk).values_list("unread", flat=True).first()
+    if count is None:
+        count = deliveries_for(user).filter(is_read=False).count()
+        UnreadNotificationCount.objects.bulk_create(
+            [UnreadNotificationCount(user_id=user.pk, unread=count)], ignore_conflicts=True
+        )
+    return count
+
+
+def create_unread_counter(user_id) -> None:
+    """Zero counter row for a user who has just been created (and so has no deliveries yet)."""
+    UnreadNotificationCount.objects.bulk_create([UnreadNotificationCount(user_id=user_id)], ignore_conflicts=True)
+
+
+def adjust_unread(user_ids, delta: int) -> None:
+    # rows that don't exist yet are left for the next read to compute
+    UnreadNotificationCount.objects.filter(pk__in=list(user_ids)).update(unread=Greatest(F("unread") + delta, 0))
+
+
+def reset_unread(user_id, count: int = 0) -> None:
+    UnreadNotificationCount.objects.update_or_create(pk=user_id, defaults={"unread": count})
+
+
+def sync_unread_counters() -> int:
+    counts = dict(
+        NotificationDelivery.objects.filter(is_read=False)
+        .values("user")
+        .annotate(unread=Count("pk"))
+        .values_list("user", "unread")
+    )
+    UnreadNotificationCount.objects.bulk_create(
+        [
+            UnreadNotificationCount(user_id=user_id, unread=counts.get(user_id, 0))
+            for user_id in User.objects.values_list("pk", flat=True)
+        ],
+        update_conflicts=True,
+        unique_fields=["user"],
+        update_fields=["unread"],
+        batch_size=1000,
+    )
+    return len(counts)
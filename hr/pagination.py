@@ -0,0 +1,140 @@
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+
+
+# ============================================================
+# KEYSET PAGINATION
+# ============================================================
+#
+# List pages seek past the last row shown (WHERE (created_at, id) < (...))
+# instead of using OFFSET, so every page costs the same no matter how deep
+# it is. The sort key is the queryset's order_by() (or Meta.ordering) with
+# the primary key appended as a tiebreaker (annotations such as a search
+# rank may be part of the key); cursors are signed tokens that
+# carry the key of the row to continue from, so they are opaque to clients
+# and can't be forged. An invalid or stale cursor falls back to page one.
+
+CURSOR_PARAM = "cursor"
+_SALT = "hr.pagination"
+
+
+def _page_size() -> int:
+    return getattr(settings, "HR_PAGE_SIZE", 25)
+
+
+def _field(model, name):
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None  # an annotation
+
+
+def _sort_key(queryset):
+    """[(field, descending), ...] ending with the primary key."""
+    model = queryset.model
+    pk_name = model._meta.pk.name
+    key = []
+    for item in queryset.query.order_by or model._meta.ordering:
+        if not isinstance(item, str) or "__" in item or item == "?":
+            raise ValueError(f"Keyset pagination needs plain field ordering, got {item!r}")
+        name = item.lstrip("-")
+        key.append((pk_name if name == "pk" else name, item.startswith("-")))
+    if pk_name not in (name for name, _ in key):
+        key.append((pk_name, key[-1][1] if key else False))
+    return key
+
+
+def _encode(direction: str, values) -> str:
+    values = [value.isoformat() if hasattr(value, "isoformat") else value for value in values]
+    return signing.dumps([direction, values], salt=_SALT, compress=True)
+
+
+def _decode(token: str, model, key):
+    try:
+        direction, raw_values = signing.loads(token, salt=_SALT)
+        if direction not in ("n", "p") or len(raw_values) != len(key):
+            return None
+        values = []
+        for (name, _), raw in zip(key, raw_values):
+            field = _field(model, name)
+            values.append(field.to_python(raw) if field else raw)
+    except (signing.BadSignature, ValueError, TypeError, LookupError, ValidationError):
+        return None
+    return direction, values
+
+
+def _seek(key, values, backwards: bool) -> Q:
+    # (a, b, id) after (x, y, z)  ==  a > x  OR  (a = x AND b > y)  OR  (a = x AND b = y AND id > z)
+    condition = Q()
+    for i, (name, descending) in enumerate(key):
+        lookup = "lt" if descending != backwards else "gt"
+        equal = {key[j][0]: values[j] for j in range(i)}
+        condition |= Q(**equal, **{f"{name}__{lookup}": values[i]})
+    return condition
+
+
+class KeysetPage:
+    def __init__(self, object_list, key, has_next, has_previous, query_dict):
+        self.object_list = object_list
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self._key = key
+        self._query_dict = query_dict
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def _row_key(self, obj):
+        return [getattr(obj, getattr(_field(obj, name), "attname", name)) for name, _ in self._key]
+
+    def _query(self, token=None) -> str:
+        query = self._query_dict.copy()
+        query.pop(CURSOR_PARAM, None)
+        if token:
+            query[CURSOR_PARAM] = token
+        return query.urlencode()
+
+    @property
+    def next_query(self) -> str:
+        return self._query(_encode("n", self._row_key(self.object_list[-1]))) if self.has_next else ""
+
+    @property
+    def previous_query(self) -> str:
+        return self._query(_encode("p", self._row_key(self.object_list[0]))) if self.has_previous else ""
+
+    @property
+    def is_first(self) -> bool:
+        return CURSOR_PARAM not in self._query_dict
+
+    @property
+    def first_query(self) -> str:
+        return self._query()
+
+
+def paginate_keyset(request, queryset, per_page: int = None) -> KeysetPage:
+    per_page = per_page or _page_size()
+    key = _sort_key(queryset)
+
+    token = request.GET.get(CURSOR_PARAM, "")
+    cursor = _decode(token, queryset.model, key) if token else None
+    backwards = bool(cursor) and cursor[0] == "p"
+
+    rows = queryset.order_by(*[("-" if descending != backwards else "") + name for name, descending in key])
+    if cursor:
+        rows = rows.filter(_seek(key, cursor[1], backwards))
+    rows = list(rows[:per_page + 1])
+    more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    if backwards:
+        rows.reverse()
+        has_next, has_previous = bool(rows), more
+    else:
+        has_next, has_previous = more, bool(cursor) and bool(rows)
+
+    return KeysetPage(rows, key, has_next, has_previous, request.GET)
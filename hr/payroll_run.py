@@ -0,0 +1,124 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from .models import Compensation, Payroll, PayrollStatus
+
+
+# ============================================================
+# PAYROLL RUNS
+# ============================================================
+#
+# A run writes the month's Payroll row for every active non-superuser from
+# their Compensation record: one query reads employees with their
+# compensation and gross/net are computed here (Payroll.totals, as save()
+# would, since bulk_create/bulk_update skip save()). Employees with no row
+# for the month get one from bulk_create(ignore_conflicts=True); existing
+# rows are refreshed with bulk_update() on a status=PENDING queryset. The
+# paid check is part of each write rather than only of the snapshot read
+# first, so a row marked paid (or created) while the run is going is never
+# overwritten. Running a month again therefore refreshes its pending rows
+# instead of duplicating them. Employees without a Compensation record are
+# skipped and reported.
+#
+# Rows entered by hand before the payroll form set the employee carry only
+# employee_name. A run first links each such row of the month to the
+# active employee of that name who has no row yet (pending rows are then
+# refreshed, paid ones counted as paid), so it does not pay anyone twice.
+
+BATCH_SIZE = 1000
+UPDATE_FIELDS = ["employee_name", "basic_salary", "allowances", "deductions", "gross_salary", "net_salary"]
+
+
+class RunResult:
+    def __init__(self, month: str):
+        self.month = month
+        self.created = 0
+        self.updated = 0
+        self.paid = 0  # already paid, left untouched
+        self.linked = 0  # hand-entered rows matched to their employee by name
+        self.missing = []  # employees without compensation
+
+    def __str__(self):
+        text = f"{self.month}: {self.created} payroll record(s) created, {self.updated} updated"
+        if self.linked:
+            text += f", {self.linked} hand-entered record(s) linked to their employee"
+        if self.paid:
+            text += f", {self.paid} already paid"
+        if self.missing:
+            text += f", {len(self.missing)} employee(s) without compensation skipped"
+        return text
+
+
+def month_label(month: date) -> str:
+    """The Payroll.month text for a month, in the "February 2026" form the payroll form uses."""
+    return month.strftime("%B %Y")
+
+
+def display_name(user) -> str:
+    return user.get_full_name().strip() or user.username
+
+
+def _link_unlinked_rows(label: str, employees) -> int:
+    """Set `employee` on the month's name-only rows that match an employee without a row; returns the count."""
+    month_rows = Payroll.objects.filter(month=label)
+    unlinked = {}
+    for pk, name in month_rows.filter(employee__isnull=True).order_by("pk").values_list("pk", "employee_name"):
+        unlinked.setdefault(name, []).append(pk)
+    if not unlinked:
+        return 0
+    has_row = set(month_rows.filter(employee__isnull=False).values_list("employee_id", flat=True))
+    links = []
+    for user in employees.iterator(chunk_size=BATCH_SIZE):
+        pks = unlinked.get(display_name(user))
+        if pks and user.pk not in has_row:
+            links.append(Payroll(pk=pks.pop(0), employee=user))
+    return Payroll.objects.filter(employee__isnull=True).bulk_update(links, ["employee"], batch_size=BATCH_SIZE)
+
+
+def run_payroll(month: date) -> RunResult:
+    result = RunResult(month_label(month))
+    employees = (
+        get_user_model().objects.filter(is_active=True, is_superuser=False)
+        .select_related("compensation")
+        .order_by("pk")
+    )
+    with transaction.atomic():
+        result.linked = _link_unlinked_rows(result.month, employees)
+        month_rows = Payroll.objects.filter(month=result.month, employee__isnull=False)
+        existing = {employee_id: (pk, status) for employee_id, pk, status in month_rows.values_list(
+            "employee_id", "pk", "status"
+        )}
+        new_rows, pending_rows = [], []
+        for user in employees.iterator(chunk_size=BATCH_SIZE):
+            try:
+                pay = user.compensation
+            except Compensation.DoesNotExist:
+                result.missing.append(display_name(user))
+                continue
+            pk, status = existing.get(user.pk, (None, None))
+            if status == PayrollStatus.PAID:
+                result.paid += 1
+                continue
+            gross, net = Payroll.totals(pay.basic_salary, pay.allowances, pay.deductions)
+            (new_rows if pk is None else pending_rows).append(Payroll(
+                pk=pk,
+                employee=user,
+                employee_name=display_name(user),
+                month=result.month,
+                basic_salary=pay.basic_salary,
+                allowances=pay.allowances,
+                deductions=pay.deductions,
+                gross_salary=gross,
+                net_salary=net,
+            ))
+
+        Payroll.objects.bulk_create(new_rows, ignore_conflicts=True, batch_size=BATCH_SIZE)
+        result.created = month_rows.count() - len(existing)
+        result.updated = Payroll.objects.filter(status=PayrollStatus.PENDING).bulk_update(
+            pending_rows, UPDATE_FIELDS, batch_size=BATCH_SIZE
+        )
+        # rows paid since `existing` was read
+        result.paid += len(pending_rows) - result.updated
+    return result
@@ -0,0 +1,119 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================
+# QUERY INSPECTION
+# ============================================================
+#
+# QueryInspectionMiddleware records every SQL statement a request runs
+# (via connection.execute_wrapper, so it works with DEBUG off) and groups
+# them by "shape" - the SQL with literals and IN-lists blanked out. The
+# same shape repeated HR_QUERY_REPEAT_THRESHOLD times is almost always a
+# lazy FK/M2M access inside a template loop (N+1). Each URL name can have a
+# budget in HR_QUERY_BUDGETS (falling back to HR_QUERY_BUDGET_DEFAULT);
+# going over it is logged, or raised when HR_QUERY_BUDGET_STRICT is on
+# (tests). hr/testing.py has a mixin that checks every route's budget.
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r"\bIN \((?:\s*(?:%s|\?)\s*,?)+\)")
+_PLACEHOLDERS = re.compile(r"%s|\?")
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def statement_shape(sql: str) -> str:
+    shape = _LITERALS.sub("?", sql)
+    shape = _PLACEHOLDERS.sub("?", shape)
+    return _IN_LISTS.sub("IN (...)", shape)
+
+
+class QueryRecorder:
+    """execute_wrapper that keeps (sql, seconds) for every statement."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.monotonic()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.monotonic() - started))
+
+    def __len__(self):
+        return len(self.queries)
+
+    def repeated(self, threshold: int = None):
+        """[(shape, count), ...] for shapes run at least `threshold` times, most frequent first."""
+        threshold = threshold or repeat_threshold()
+        shapes = Counter(statement_shape(sql) for sql, _ in self.queries)
+        return [(shape, count) for shape, count in shapes.most_common() if count >= threshold]
+
+    def report(self, limit: int = 3) -> str:
+        lines = [f"{len(self)} queries"]
+        for shape, count in self.repeated()[:limit]:
+            lines.append(f"  {count}x {shape[:300]}")
+        return "\n".join(lines)
+
+
+def repeat_threshold() -> int:
+    return getattr(settings, "HR_QUERY_REPEAT_THRESHOLD", 5)
+
+
+def query_budget(view_name: str):
+    budgets = getattr(settings, "HR_QUERY_BUDGETS", {})
+    return budgets.get(view_name, getattr(settings, "HR_QUERY_BUDGET_DEFAULT", None))
+
+
+@contextmanager
+def record_queries():
+    """Record queries on every configured database: `with record_queries() as recorder: ...`."""
+    recorder = QueryRecorder()
+    with ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(recorder))
+        yield recorder
+
+
+class QueryInspectionMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, "HR_QUERY_INSPECTION", True):
+            return self.get_response(request)
+
+        with record_queries() as recorder:
+            response = self.get_response(request)
+
+        match = getattr(request, "resolver_match", None)
+        view_name = match.view_name if match else request.path
+        self.check(view_name, request, recorder)
+        return response
+
+    def check(self, view_name, request, recorder):
+        repeated = recorder.repeated()
+        if repeated:
+            shape, count = repeated[0]
+            logger.warning(
+                "Possible N+1 on %s (%s %s): %dx %s", view_name, request.method, request.path, count, shape[:300]
+            )
+
+        budget = query_budget(view_name)
+        if budget is None or len(recorder) <= budget:
+            return
+        message = f"{view_name} ran {len(recorder)} queries (budget {budget}): {recorder.report()}"
+        if getattr(settings, "HR_QUERY_BUDGET_STRICT", False):
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
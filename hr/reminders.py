@@ -0,0 +1,75 @@
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import calendars
+from .mail import queue_messages
+from .models import Event
+
+
+# ============================================================
+# EVENT REMINDERS (worker)
+# ============================================================
+#
+# Run by `manage.py run_reminders`, never by page views. Due events are
+# claimed with one conditional UPDATE so concurrent workers never queue the
+# same reminder twice; a claim older than HR_REMINDER_CLAIM_TIMEOUT seconds
+# (e.g. a worker that died mid-run) can be claimed again. The messages go
+# to the mail outbox (hr.mail) and are delivered by `manage.py send_outbox`.
+
+def _claim_timeout() -> int:
+    return getattr(settings, "HR_REMINDER_CLAIM_TIMEOUT", 600)
+
+
+def claim_due_events(today=None) -> str:
+    today = today or timezone.localdate()
+    now = timezone.now()
+    token = uuid.uuid4().hex
+
+    Event.objects.filter(
+        reminder_enabled=True,
+        reminder_sent=False,
+        reminder_date__lte=today,
+        event_date__gte=today,
+    ).filter(
+        Q(reminder_claim="") | Q(reminder_claimed_at__lt=now - timedelta(seconds=_claim_timeout()))
+    ).update(reminder_claim=token, reminder_claimed_at=now)
+
+    return token
+
+
+def build_reminder_message(ev: Event, recipient: str) -> EmailMessage:
+    subject = f"Reminder: {ev.title} on {ev.event_date}"
+    body = (
+        f"Event: {ev.title}\n"
+        f"Date: {ev.event_date}\n"
+        f"Time: {ev.start_time}" + (f" - {ev.end_time}" if ev.end_time else "") + "\n"
+        f"Shared with: {ev.share_with}\n\n"
+        f"Description:\n{ev.description or ''}"
+    )
+    from_email = getattr(settings, "DEFAULT_FROM_EMAIL", "noreply@example.com")
+    return EmailMessage(subject, body, from_email, [recipient])
+
+
+def send_due_reminders(today=None) -> int:
+    token = claim_due_events(today)
+    claimed = Event.objects.filter(reminder_claim=token)
+
+    email_messages, dates = [], set()
+    for ev in claimed.select_related("created_by"):
+        dates.add(ev.event_date)
+        recipient = getattr(ev.created_by, "email", None)
+        if recipient:
+            email_messages.append(build_reminder_message(ev, recipient))
+
+    with transaction.atomic():
+        queued = queue_messages(email_messages)
+        claimed.update(reminder_sent=True, reminder_claim="", reminder_claimed_at=None)
+    # update() skips the signals; the HR calendar shows reminder_sent
+    calendars.invalidate_dates(dates)
+    return queued
@@ -0,0 +1,61 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from .caching import is_shared
+
+
+# ============================================================
+# ROLE RESOLUTION (Auth User + Groups)
+# ============================================================
+#
+# A user's group names are loaded once per request and memoized on the
+# user object. Across requests they are kept in the Django cache for
+# HR_ROLE_CACHE_TIMEOUT seconds (0 disables the cross-request cache);
+# hr.signals drops the cached entry whenever group membership changes.
+# That invalidation only reaches other workers through a shared cache, so
+# with a process-local one (the default LocMemCache) roles are resolved
+# per request and a revoked group takes effect immediately.
+
+ROLE_HR = "HR"
+ROLE_EMPLOYEE = "EMPLOYEE"
+ROLE_CLIENT = "CLIENT"
+
+_USER_ATTR = "_hr_role_names"
+
+
+def _cache_key(user_id) -> str:
+    return f"hr:roles:{user_id}"
+
+
+def _cache_timeout() -> int:
+    if not is_shared():
+        return 0
+    return getattr(settings, "HR_ROLE_CACHE_TIMEOUT", 300)
+
+
+def get_role_names(user) -> frozenset:
+    if user is None or not user.is_authenticated:
+        return frozenset()
+
+    names = getattr(user, _USER_ATTR, None)
+    if names is not None:
+        return names
+
+    timeout = _cache_timeout()
+    if timeout:
+        names = cache.get(_cache_key(user.pk))
+    if names is None:
+        names = frozenset(user.groups.values_list("name", flat=True))
+        if timeout:
+            cache.set(_cache_key(user.pk), names, timeout)
+
+    setattr(user, _USER_ATTR, names)
+    return names
+
+
+def has_role(user, role: str) -> bool:
+    return role in get_role_names(user)
+
+
+def invalidate_roles(user_ids) -> None:
+    cache.delete_many([_cache_key(user_id) for user_id in user_ids])
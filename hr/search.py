@@ -0,0 +1,244 @@
+import re
+
+from django.apps import apps as global_apps
+from django.db import connection, connections, transaction
+from django.db.models import Case, F, FloatField, Func, IntegerField, OuterRef, Q, Subquery, Value, When
+from django.db.models.expressions import RawSQL
+
+
+# ============================================================
+# FULL-TEXT SEARCH
+# ============================================================
+#
+# Searchable rows are copied into SearchDocument (kind, object_id, title,
+# body), kept in sync by the receivers in hr/signals.py and rebuilt by
+# `manage.py rebuild_search_index`. Queries go through one of three backends:
+#
+#   fts5      SQLite: the hr_search_fts FTS5 table (external content over
+#             hr_searchdocument, maintained by triggers), ranked with bm25()
+#   postgres  SearchVector/SearchRank over title (A) and body (B), backed by
+#             a GIN expression index
+#   basic     anything else: icontains over SearchDocument only
+#
+# Every word of the query must match the start of a word in the document
+# ("jo sm" finds "John Smith"); results are ranked, title hits first.
+# `manage.py benchmark_search` compares this with the old icontains filters.
+
+FTS_TABLE = "hr_search_fts"
+
+
+class SearchSource:
+    def __init__(self, model: str, fields, title, body):
+        self.model = model  # "app_label.ModelName"
+        self.fields = fields  # values() lookups the title/body callables read
+        self.title = title
+        self.body = body
+
+    def get_model(self):
+        return global_apps.get_model(self.model)
+
+    def documents(self, queryset):
+        """(object_id, title, body) for every row of `queryset`."""
+        for row in queryset.values("pk", *self.fields).iterator(chunk_size=2000):
+            yield row["pk"], self.title(row)[:255], self.body(row)
+
+
+def _join(*values) -> str:
+    return " ".join(str(value) for value in values if value)
+
+
+SOURCES = {
+    "note": SearchSource(
+        "hr.Note", ("title", "description", "tags"),
+        title=lambda r: r["title"],
+        body=lambda r: _join(r["description"], r["tags"]),
+    ),
+    "help": SearchSource(
+        "hr.HelpArticle", ("title", "content"),
+        title=lambda r: r["title"],
+        body=lambda r: r["content"],
+    ),
+    "user": SearchSource(
+        "auth.User",
+        (
+            "username", "first_name", "last_name", "email",
+            "employeeprofile__emp_id", "employeeprofile__department", "employeeprofile__designation",
+        ),
+        title=lambda r: _join(r["first_name"], r["last_name"]) or r["username"],
+        body=lambda r: _join(
+            r["username"], r["email"],
+            r["employeeprofile__emp_id"], r["employeeprofile__department"], r["employeeprofile__designation"],
+        ),
+    ),
+    "ticket": SearchSource(
+        "hr.Ticket", ("ticket_id", "subject", "description"),
+        title=lambda r: _join(r["ticket_id"], r["subject"]),
+        body=lambda r: r["description"],
+    ),
+    "support_ticket": SearchSource(
+        "core.SupportTicket", ("ticket_id", "title", "description"),
+        title=lambda r: _join(r["ticket_id"], r["title"]),
+        body=lambda r: r["description"],
+    ),
+}
+
+
+def _terms(query: str):
+    return re.findall(r"\w+", query.lower())
+
+
+# -------------------------
+# Indexing
+# -------------------------
+
+def index_object(kind: str, object_id: int) -> None:
+    from .models import SearchDocument
+
+    source = SOURCES[kind]
+    rows = list(source.documents(source.get_model().objects.filter(pk=object_id)))
+    if not rows:
+        remove_object(kind, object_id)
+        return
+    _, title, body = rows[0]
+    SearchDocument.objects.update_or_create(kind=kind, object_id=object_id, defaults={"title": title, "body": body})
+
+
+def remove_object(kind: str, object_id: int) -> None:
+    from .models import SearchDocument
+
+    SearchDocument.objects.filter(kind=kind, object_id=object_id).delete()
+
+
+def rebuild_index(kinds=None, batch_size: int = 2000) -> dict:
+    """Re-create the documents of the given kinds (all by default); returns {kind: count}."""
+    from .models import SearchDocument
+
+    counts = {}
+    with transaction.atomic():
+        for kind in kinds or SOURCES:
+            source = SOURCES[kind]
+            SearchDocument.objects.filter(kind=kind).delete()
+            batch, counts[kind] = [], 0
+            for object_id, title, body in source.documents(source.get_model().objects.all()):
+                batch.append(SearchDocument(kind=kind, object_id=object_id, title=title, body=body))
+                if len(batch) >= batch_size:
+                    SearchDocument.objects.bulk_create(batch)
+                    counts[kind] += len(batch)
+                    batch = []
+            SearchDocument.objects.bulk_create(batch)
+            counts[kind] += len(batch)
+        forget_fts_table()
+        if backend_name() == "fts5":
+            with connection.cursor() as cursor:
+                cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+    return counts
+
+
+# -------------------------
+# Querying
+# -------------------------
+
+_FTS_ATTR = "_hr_has_fts_table"
+
+
+def _has_fts_table(conn) -> bool:
+    """Whether `conn` has the FTS5 table, remembered on the connection until forget_fts_table()."""
+    found = getattr(conn, _FTS_ATTR, None)
+    if found is None:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+            found = cursor.fetchone() is not None
+        setattr(conn, _FTS_ATTR, found)
+    return found
+
+
+def forget_fts_table() -> None:
+    """Look for the FTS5 table again on next use (hr.signals calls this after migrate)."""
+    for conn in connections.all(initialized_only=True):
+        conn.__dict__.pop(_FTS_ATTR, None)
+
+
+def backend_name() -> str:
+    if connection.vendor == "postgresql":
+        return "postgres"
+    if connection.vendor == "sqlite" and _has_fts_table(connection):
+        return "fts5"
+    return "basic"
+
+
+class _Bm25(Func):
+    """bm25() of one document against a MATCH expression: _Bm25(Value(match), F("pk"))."""
+
+    template = f"(SELECT bm25({FTS_TABLE}, 10.0, 1.0) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %(expressions)s)"
+    arg_joiner = f" AND {FTS_TABLE}.rowid = "
+    output_field = FloatField()
+
+
+def _fts5_documents(documents, terms):
+    match = " AND ".join(f'"{term}"*' for term in terms)
+    return documents.filter(
+        pk__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match])
+    ).annotate(rank=_Bm25(Value(match), F("pk")))
+
+
+def search_vector():
+    from django.contrib.postgres.search import SearchVector
+
+    return SearchVector("title", weight="A", config="simple") + SearchVector("body", weight="B", config="simple")
+
+
+def _postgres_documents(documents, terms):
+    from django.contrib.postgres.search import SearchQuery, SearchRank
+
+    query = SearchQuery(" & ".join(f"{term}:*" for term in terms), search_type="raw", config="simple")
+    vector = search_vector()
+    # negated so that, as with the other backends, a lower rank is a better match
+    return (
+        documents.annotate(document=vector)
+        .filter(document=query)
+        .annotate(rank=Value(0.0) - SearchRank(vector, query))
+    )
+
+
+def _basic_documents(documents, terms):
+    title_hits = Q()
+    for term in terms:
+        documents = documents.filter(Q(title__icontains=term) | Q(body__icontains=term))
+        title_hits &= Q(title__icontains=term)
+    return documents.annotate(rank=Case(When(title_hits, then=Value(0)), default=Value(1), output_field=IntegerField()))
+
+
+_BACKENDS = {"fts5": _fts5_documents, "postgres": _postgres_documents, "basic": _basic_documents}
+
+
+def search_documents(kind: str, query: str):
+    """The `kind` SearchDocuments matching `query`, annotated with `rank` (lower is better)."""
+    from .models import SearchDocument
+
+    documents = SearchDocument.objects.filter(kind=kind)
+    terms = _terms(query)
+    if not terms:
+        return documents.none()
+    return _BACKENDS[backend_name()](documents, terms)
+
+
+def match_ids(kind: str, query: str):
+    """Subquery of the ids of the `kind` objects matching `query`, for `pk__in=` filters."""
+    return search_documents(kind, query).values("object_id")
+
+
+def search_ids(kind: str, query: str, limit: int = None) -> list:
+    """Ids of the `kind` objects matching `query`, best match first."""
+    ids = search_documents(kind, query).order_by("rank", "object_id").values_list("object_id", flat=True)
+    return list(ids[:limit] if limit else ids)
+
+
+def filter_matches(queryset, kind: str, query: str, rank_field: str = "search_rank"):
+    """
+    Narrow `queryset` to the search hits and order it by relevance. Both the
+    match and the rank are subqueries, so any further filters and the keyset
+    pagination see every hit; the rank is annotated as `rank_field`.
+    """
+    documents = search_documents(kind, query)
+    rank = Subquery(documents.filter(object_id=OuterRef("pk")).values("rank")[:1])
+    return queryset.filter(pk__in=documents.values("object_id")).annotate(**{rank_field: rank}).order_by(rank_field)
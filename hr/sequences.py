@@ -0,0 +1,48 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+
+# ============================================================
+# SEQUENCES
+# ============================================================
+#
+# Human-readable identifiers (INV0001, TKT0001, CL-1023, SUP-10000) come
+# from one counter row per sequence. The counter is bumped with a single
+# UPDATE ... SET value = value + n, which takes the row lock until the
+# surrounding transaction ends, so concurrent inserts can't get the same
+# number and a rolled-back insert gives its number back. Callers that
+# create rows in bulk can reserve a whole block with allocate(name, n).
+
+# name: (prefix, zero-padded width, first value)
+SEQUENCE_FORMATS = {
+    "invoice": ("INV", 4, 1),
+    "ticket": ("TKT", 4, 1),
+    "client": ("CL-", 0, 1023),
+    "support_ticket": ("SUP-", 5, 10000),
+}
+
+
+def allocate(name: str, count: int = 1) -> range:
+    from .models import Sequence
+
+    _, _, start = SEQUENCE_FORMATS[name]
+    with transaction.atomic():
+        if not Sequence.objects.filter(name=name).update(value=F("value") + count):
+            try:
+                with transaction.atomic():
+                    Sequence.objects.create(name=name, value=start - 1 + count)
+            except IntegrityError:
+                # another transaction created it first
+                Sequence.objects.filter(name=name).update(value=F("value") + count)
+        last = Sequence.objects.filter(name=name).values_list("value", flat=True).get()
+    return range(last - count + 1, last + 1)
+
+
+def format_identifier(name: str, number: int) -> str:
+    prefix, width, _ = SEQUENCE_FORMATS[name]
+    return f"{prefix}{number:0{width}d}"
+
+
+def next_identifier(name: str) -> str:
+    return format_identifier(name, allocate(name)[0])
+
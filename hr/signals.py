@@ -0,0 +1,189 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_migrate, post_save, pre_delete
+from django.dispatch import receiver
+
+from core.models import ClientProfile, SupportTicket
+from employee.models import EmployeeProfile
+
+from . import attendance_rollup, calendars, dashboard_stats, search, timeline_counts
+from .models import (
+    Attendance, DashboardScope, Event, HelpArticle, Note, Ticket, TimelineComment, TimelineLike, TimelinePost,
+)
+from .notifications import create_unread_counter
+from .roles import invalidate_roles
+
+User = get_user_model()
+
+
+# ============================================================
+# ROLE CACHE INVALIDATION
+# ============================================================
+
+@receiver(m2m_changed, sender=User.groups.through)
+def user_groups_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear" and reverse:
+        # group.user_set.clear(): pk_set is empty, collect members first
+        invalidate_roles(list(instance.user_set.values_list("pk", flat=True)))
+        return
+
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        # user.groups.add(...) / remove / clear
+        instance.__dict__.pop("_hr_role_names", None)
+        invalidate_roles([instance.pk])
+    elif pk_set:
+        # group.user_set.add(...) / remove
+        invalidate_roles(pk_set)
+
+
+@receiver(post_save, sender=Group)
+def group_saved(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_roles(list(instance.user_set.values_list("pk", flat=True)))
+
+
+@receiver(pre_delete, sender=Group)
+def group_deleted(sender, instance, **kwargs):
+    invalidate_roles(list(instance.user_set.values_list("pk", flat=True)))
+
+
+# ============================================================
+# DASHBOARD STATS
+# ============================================================
+
+def remember_dashboard_values(sender, instance, **kwargs):
+    instance._dashboard_snapshot = dashboard_stats.snapshot(instance)
+
+
+def update_dashboard_stats_on_save(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        dashboard_stats.record_save(instance, created)
+
+
+def update_dashboard_stats_on_delete(sender, instance, **kwargs):
+    dashboard_stats.record_delete(instance)
+
+
+for _model in dashboard_stats.TRACKED:
+    post_init.connect(remember_dashboard_values, sender=_model)
+    post_save.connect(update_dashboard_stats_on_save, sender=_model)
+    post_delete.connect(update_dashboard_stats_on_delete, sender=_model)
+
+
+@receiver(post_save, sender=ClientProfile)
+def client_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        dashboard_stats.create_scope(DashboardScope.CLIENT, instance.pk)
+
+
+@receiver(post_delete, sender=ClientProfile)
+def client_deleted(sender, instance, **kwargs):
+    dashboard_stats.discard_scope(DashboardScope.CLIENT, instance.pk)
+
+
+@receiver(post_save, sender=User)
+def user_created(sender, instance, created, raw=False, **kwargs):
+    # the rows the first page a user opens would otherwise have to build
+    if created and not raw:
+        dashboard_stats.create_scope(DashboardScope.USER, instance.pk)
+        create_unread_counter(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    dashboard_stats.discard_scope(DashboardScope.USER, instance.pk)
+
+
+# ============================================================
+# SEARCH INDEX
+# ============================================================
+
+SEARCH_KINDS = {
+    Note: "note",
+    HelpArticle: "help",
+    User: "user",
+    Ticket: "ticket",
+    SupportTicket: "support_ticket",
+}
+
+
+def index_search_document(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields and set(update_fields) <= {"last_login"}):
+        return  # logins only touch last_login
+    search.index_object(SEARCH_KINDS[sender], instance.pk)
+
+
+def remove_search_document(sender, instance, **kwargs):
+    search.remove_object(SEARCH_KINDS[sender], instance.pk)
+
+
+for _model in SEARCH_KINDS:
+    post_save.connect(index_search_document, sender=_model)
+    post_delete.connect(remove_search_document, sender=_model)
+
+
+@receiver([post_save, post_delete], sender=EmployeeProfile)
+def employee_profile_changed(sender, instance, raw=False, **kwargs):
+    # department/designation/emp_id are part of the user's document
+    if not raw:
+        search.index_object("user", instance.user_id)
+
+
+@receiver(post_migrate)
+def migrated(sender, **kwargs):
+    # migrate may have created (or dropped) the FTS5 table in this process
+    search.forget_fts_table()
+
+
+# ============================================================
+# TIMELINE LIKE / COMMENT COUNTS
+# ============================================================
+
+@receiver(post_delete, sender=TimelineLike)
+@receiver(post_delete, sender=TimelineComment)
+def timeline_reaction_deleted(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, TimelinePost):
+        return  # the post itself is being deleted
+    field = "like_count" if sender is TimelineLike else "comment_count"
+    timeline_counts.decrement(instance.post_id, field)
+
+
+# ============================================================
+# CALENDAR CACHE
+# ============================================================
+
+@receiver(post_init, sender=Event)
+def remember_event_date(sender, instance, **kwargs):
+    instance._calendar_date = instance.event_date
+
+
+@receiver([post_save, post_delete], sender=Event)
+def event_changed(sender, instance, **kwargs):
+    # the grids showing the old date lose the event, the ones showing the new date gain it
+    dates = {instance._calendar_date, instance.event_date}
+    instance._calendar_date = instance.event_date
+    transaction.on_commit(lambda: calendars.invalidate_dates(dates))
+
+
+# ============================================================
+# MONTHLY ATTENDANCE ROLLUP
+# ============================================================
+
+@receiver(post_init, sender=Attendance)
+def remember_attendance_month(sender, instance, **kwargs):
+    # read __dict__ so rows loaded with only()/defer() don't fetch the fields back
+    instance._rollup_key = (instance.__dict__.get("user_id"), instance.__dict__.get("date"))
+
+
+@receiver([post_save, post_delete], sender=Attendance)
+def attendance_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # a record moved to another user or month leaves its old month too
+    pairs = {instance._rollup_key, (instance.user_id, instance.date)}
+    instance._rollup_key = (instance.user_id, instance.date)
+    transaction.on_commit(lambda: attendance_rollup.refresh(pairs))
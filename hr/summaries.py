@@ -0,0 +1,57 @@
+from django.db.models import Count, Q, Sum
+
+from .models import AttendanceStatus, InvoiceStatus, PayrollStatus, TicketStatus
+
+
+# ============================================================
+# DASHBOARD SUMMARIES
+# ============================================================
+#
+# Each spec maps a context key to an aggregate expression; summarize() runs
+# the whole spec as one aggregate() query (conditional Count/Sum with
+# filter=Q(...)) instead of one COUNT per status.
+
+def summarize(queryset, spec: dict) -> dict:
+    totals = queryset.aggregate(**spec)
+    return {key: value or 0 for key, value in totals.items()}
+
+
+def _count(**lookups):
+    return Count("pk", filter=Q(**lookups))
+
+
+PAYROLL_SUMMARY = {
+    "total_gross_salary": Sum("gross_salary"),
+    "total_deductions": Sum("deductions"),
+    "total_net_salary": Sum("net_salary"),
+    "paid_count": _count(status=PayrollStatus.PAID),
+    "pending_count": _count(status=PayrollStatus.PENDING),
+}
+
+TICKET_SUMMARY = {
+    "total_tickets": Count("pk"),
+    "open_tickets_count": _count(status=TicketStatus.OPEN),
+    "in_progress_tickets_count": _count(status=TicketStatus.IN_PROGRESS),
+    "closed_tickets_count": _count(status=TicketStatus.CLOSED),
+}
+
+LEAVE_SUMMARY = {
+    "total_requests": Count("pk"),
+    "approved_count": _count(status="Approved"),
+    "pending_count": _count(status="Pending"),
+    "rejected_count": _count(status="Rejected"),
+}
+
+ATTENDANCE_SUMMARY = {
+    "present_today": _count(status=AttendanceStatus.PRESENT),
+    "absent_today": _count(status=AttendanceStatus.ABSENT),
+    "late_today": _count(status=AttendanceStatus.LATE),
+}
+
+
+def invoice_summary_spec(today) -> dict:
+    return {
+        "total_invoices": Count("pk"),
+        "total_revenue": Sum("total_amount"),
+        "overdue_count": Count("pk", filter=Q(due_date__lt=today) & ~Q(status=InvoiceStatus.PAID)),
+    }
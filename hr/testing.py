@@ -0,0 +1,70 @@
+from django.test import override_settings
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+
+from .querycount import query_budget, record_queries
+
+
+# ============================================================
+# TEST HELPERS
+# ============================================================
+
+class QueryBudgetTestMixin:
+    """
+    Mixin for django.test.TestCase subclasses that checks every route in the
+    given URL namespaces against its HR_QUERY_BUDGETS entry:
+
+        class RouteBudgetTests(QueryBudgetTestMixin, TestCase):
+            route_kwargs = {"hr:ticket_detail": {"pk": 1}}
+
+            def setUp(self):
+                ...create rows, self.client.force_login(user)...
+
+            def test_route_budgets(self):
+                self.assertRouteBudgets()
+
+    Routes that need URL arguments are skipped unless `route_kwargs` has
+    them; routes without a budget, and those in `skip_routes` (logging out
+    would end the test client's session), are skipped. HR_QUERY_BUDGET_STRICT is on
+    for the whole test, so any request over budget fails it.
+    """
+
+    budget_namespaces = ("hr", "core", "employee")
+    route_kwargs = {}
+    skip_routes = ("hr:login", "hr:logout", "employee:employee_logout")
+
+    def setUp(self):
+        super().setUp()
+        strict = override_settings(HR_QUERY_BUDGET_STRICT=True)
+        strict.enable()
+        self.addCleanup(strict.disable)
+
+    def budget_routes(self):
+        for resolver in get_resolver().url_patterns:
+            if not isinstance(resolver, URLResolver) or resolver.namespace not in self.budget_namespaces:
+                continue
+            for pattern in resolver.url_patterns:
+                if not isinstance(pattern, URLPattern) or not pattern.name:
+                    continue
+                view_name = f"{resolver.namespace}:{pattern.name}"
+                if view_name in self.skip_routes:
+                    continue
+                kwargs = self.route_kwargs.get(view_name)
+                if kwargs is None and pattern.pattern.regex.groups:
+                    continue
+                yield view_name, kwargs or {}
+
+    def assertQueryBudget(self, view_name, budget=None, **kwargs):
+        budget = budget if budget is not None else query_budget(view_name)
+        with record_queries() as recorder:
+            self.client.get(reverse(view_name, kwargs=kwargs))
+        self.assertLessEqual(
+            len(recorder), budget, f"{view_name} ran {len(recorder)} queries (budget {budget}): {recorder.report()}"
+        )
+
+    def assertRouteBudgets(self):
+        for view_name, kwargs in self.budget_routes():
+            budget = query_budget(view_name)
+            if budget is None:
+                continue
+            with self.subTest(view=view_name):
+                self.assertQueryBudget(view_name, budget, **kwargs)
@@ -0,0 +1,1266 @@
+import csv
+import io
+from importlib import import_module
+from datetime import date, time, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import Group, User
+from django.core import mail as django_mail
+from django.core.mail import EmailMultiAlternatives
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.apps import apps as django_apps
+from django.db import connection, transaction
+from django.db.models import F
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, get_resolver, reverse
+from django.utils import timezone
+
+from core import models as client_models
+from employee.models import EmployeeProfile, Leave
+
+from . import attendance_rollup, calendars, dashboard_stats, exports, ics, mail, projections, search, sequences, timeclock
+from .attendance_import import read_rows
+from .buffers import BufferedWriter
+from .models import (
+    Announcement,
+    Attendance,
+    AttendanceMonthly,
+    AttendanceStatus,
+    Client,
+    Compensation,
+    DashboardScope,
+    DashboardStats,
+    Event,
+    HelpArticle,
+    HelpCategory,
+    Invoice,
+    LeaveCategory,
+    LeaveRequest,
+    Note,
+    NoteTag,
+    NoteVisibility,
+    NotificationDelivery,
+    NotificationType,
+    OutboundEmail,
+    OutboundEmailStatus,
+    Payment,
+    PaymentMethod,
+    Payroll,
+    PayrollStatus,
+    PersonalTask,
+    Project,
+    Sequence,
+    Tag,
+    Task,
+    Team,
+    Ticket,
+    TicketStatus,
+    TimelineComment,
+    TimelineLike,
+    TimelinePost,
+    UnreadNotificationCount,
+)
+from .notifications import create_notification, notification_writer, unread_count, write_notifications
+from .payroll_run import run_payroll
+from .reminders import send_due_reminders
+from .roles import ROLE_CLIENT, ROLE_EMPLOYEE, ROLE_HR
+from .testing import QueryBudgetTestMixin
+from .view_counts import record_view, view_count_writer
+
+
+def make_hr_user(username="hr"):
+    user = User.objects.create_user(username, email=f"{username}@example.com", password="pw", is_staff=True)
+    user.groups.add(Group.objects.get_or_create(name=ROLE_HR)[0])
+    return user
+
+
+def make_client_project(name="Acme"):
+    client = Client.objects.create(
+        company_name=name, contact_person="Pat", email="pat@example.com", phone="1", address="Main St"
+    )
+    project = Project.objects.create(
+        name=f"{name} site", client_name=name, start_date=date.today(), deadline=date.today(), description="-"
+    )
+    return client, project
+
+
+def seed_payroll(count):
+    statuses = [PayrollStatus.PAID, PayrollStatus.PENDING]
+    for i in range(count):
+        Payroll.objects.create(
+            employee_name=f"Employee {i}", month="January 2026", basic_salary=1000, allowances=100,
+            deductions=50, status=statuses[i % len(statuses)],
+        )
+
+
+def seed_invoices(count):
+    for i in range(count):
+        client, project = make_client_project(f"Client {i}")
+        invoice = Invoice.objects.create(
+            client=client, project=project, amount=100, due_date=date.today() - timedelta(days=i % 3)
+        )
+        Payment.objects.create(
+            invoice=invoice, amount_paid=10, payment_date=date.today(), payment_method=PaymentMethod.CASH
+        )
+
+
+def seed_tickets(count):
+    assignee = User.objects.create_user(f"agent{Ticket.objects.count()}")
+    statuses = list(TicketStatus)
+    for i in range(count):
+        client, project = make_client_project(f"Ticket client {i}")
+        Ticket.objects.create(
+            client=client, project=project, subject=f"Issue {i}", description="-",
+            status=statuses[i % len(statuses)], assigned_to=assignee,
+        )
+
+
+def seed_leave(count):
+    category = LeaveCategory.objects.get_or_create(name="Annual")[0]
+    statuses = ["Pending", "Approved", "Rejected"]
+    for i in range(count):
+        user = User.objects.create_user(f"leave{LeaveRequest.objects.count()}")
+        LeaveRequest.objects.create(
+            user=user, category=category, start_date=date.today(), end_date=date.today(),
+            reason="-", status=statuses[i % len(statuses)],
+        )
+
+
+def seed_attendance(count, day=None):
+    day = day or date.today()
+    statuses = list(AttendanceStatus)
+    for i in range(count):
+        user = User.objects.create_user(f"worker{Attendance.objects.count()}")
+        Attendance.objects.create(
+            user=user, date=day, check_in=time(9), check_out=time(17), status=statuses[i % len(statuses)],
+        )
+
+
+class HRClientMixin:
+    def setUp(self):
+        super().setUp()
+        self.hr_user = make_hr_user()
+        self.client.force_login(self.hr_user)
+
+    def assertPageQueries(self, url, count):
+        # the first request fills per-user rows (e.g. the unread counter); measure the steady state
+        self.client.get(url)
+        with self.assertNumQueries(count):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+
+# ============================================================
+# DASHBOARD SUMMARIES (hr.summaries)
+# ============================================================
+
+class DashboardSummaryQueryTests(HRClientMixin, TestCase):
+    """Each dashboard's per-status counts and sums come from one aggregate, whatever the statuses."""
+
+    def setUp(self):
+        super().setUp()
+        seed_payroll(4)
+        seed_invoices(3)
+        seed_tickets(4)
+        seed_leave(3)
+        seed_attendance(3)
+
+    def test_payroll_dashboard(self):
+        response = self.assertPageQueries(reverse("hr:payroll_list"), 7)
+        self.assertEqual(response.context["paid_count"], 2)
+        self.assertEqual(response.context["pending_count"], 2)
+
+    def test_invoice_dashboard(self):
+        response = self.assertPageQueries(reverse("hr:invoice_list"), 8)
+        self.assertEqual(response.context["total_invoices"], 3)
+
+    def test_ticket_dashboard(self):
+        response = self.assertPageQueries(reverse("hr:ticket_list"), 5)
+        self.assertEqual(response.context["total_tickets"], 4)
+        self.assertEqual(response.context["open_tickets_count"], 1)
+
+    def test_leave_dashboard(self):
+        response = self.assertPageQueries(reverse("hr:leave_dashboard"), 7)
+        self.assertEqual(response.context["approved_count"], 1)
+        self.assertEqual(response.context["rejected_count"], 1)
+
+    def test_attendance_dashboard(self):
+        response = self.assertPageQueries(reverse("hr:attendance_list"), 7)
+        self.assertEqual(response.context["present_today"], 1)
+        self.assertEqual(response.context["late_today"], 1)
+
+
+# ============================================================
+# LIST PROJECTIONS (hr.projections)
+# ============================================================
+
+class ProjectedListQueryTests(HRClientMixin, TestCase):
+    """Projected list pages cost the same number of queries for 1 row as for a full page."""
+
+    rows = 20  # under HR_PAGE_SIZE, so every seeded row is rendered
+
+    def assertConstantQueries(self, url, seed, count):
+        seed(1)
+        self.assertPageQueries(url, count)
+        seed(self.rows - 1)
+        self.assertPageQueries(url, count)
+
+    def test_invoice_list(self):
+        self.assertConstantQueries(reverse("hr:invoice_list"), seed_invoices, 8)
+
+    def test_payment_list(self):
+        self.assertConstantQueries(reverse("hr:payment_list"), seed_invoices, 6)
+
+    def test_ticket_list(self):
+        self.assertConstantQueries(reverse("hr:ticket_list"), seed_tickets, 5)
+
+
+# ============================================================
+# ROUTE QUERY BUDGETS (hr.querycount / HR_QUERY_BUDGETS)
+# ============================================================
+
+class RouteBudgetTests(QueryBudgetTestMixin, TestCase):
+    """Every named hr/core/employee route stays within its HR_QUERY_BUDGETS entry."""
+
+    def setUp(self):
+        super().setUp()
+        user = make_hr_user()
+        for role in (ROLE_EMPLOYEE, ROLE_CLIENT):
+            user.groups.add(Group.objects.get_or_create(name=role)[0])
+        EmployeeProfile.objects.create(
+            user=user, emp_id="E-1", department="Ops", designation="Lead", phone="1", date_joined=date.today()
+        )
+        today = date.today()
+
+        # hr
+        employee = User.objects.create_user("employee")
+        team = Team.objects.create(name="Core")
+        team.members.add(user)
+        leave = LeaveRequest.objects.create(
+            user=employee, category=LeaveCategory.objects.create(name="Annual"),
+            start_date=today, end_date=today, reason="-",
+        )
+        announcement = Announcement.objects.create(title="Hello", message="-", publish_date=today, created_by=user)
+        client, project = make_client_project()
+        task = Task.objects.create(title="Build", project=project, assigned_to="employee", due_date=today)
+        payroll = Payroll.objects.create(employee_name="employee", month="January 2026", basic_salary=100)
+        invoice = Invoice.objects.create(client=client, project=project, amount=100, due_date=today)
+        ticket = Ticket.objects.create(client=client, project=project, subject="Broken", description="-")
+        event = Event.objects.create(
+            title="Offsite", event_date=today, start_time=time(9), share_with="All", created_by=user
+        )
+        note = Note.objects.create(title="Plan", description="-", created_by=user)
+        post = TimelinePost.objects.create(message="Hi", created_by=user)
+        category = HelpCategory.objects.create(name="Getting started", slug="getting-started")
+        article = HelpArticle.objects.create(title="Welcome", category=category, content="-", created_by=user)
+        todo = PersonalTask.objects.create(user=user, description="Call back")
+        write_notifications([("Welcome", "-", "ANNOUNCEMENT")])
+        delivery = NotificationDelivery.objects.get(user=user)
+
+        # client portal
+        profile = client_models.ClientProfile.objects.get_or_create(user=user)[0]
+        client_project = client_models.Project.objects.create(client=profile, name="Portal")
+        client_invoice = client_models.Invoice.objects.create(project=client_project, amount=100, issued_date=today)
+        client_payment = client_models.Payment.objects.create(invoice=client_invoice, payment_id="P-1", amount_paid=10)
+
+        self.route_kwargs = {
+            "hr:employee_edit": {"pk": employee.pk},
+            "hr:employee_activate": {"pk": employee.pk},
+            "hr:employee_deactivate": {"pk": employee.pk},
+            "hr:team_detail": {"pk": team.pk},
+            "hr:team_edit": {"pk": team.pk},
+            "hr:team_delete": {"pk": team.pk},
+            "hr:approve_leave": {"pk": leave.pk},
+            "hr:reject_leave": {"pk": leave.pk},
+            "hr:announcement_edit": {"pk": announcement.pk},
+            "hr:announcement_delete": {"pk": announcement.pk},
+            "hr:project_detail": {"pk": project.pk},
+            "hr:project_update": {"pk": project.pk},
+            "hr:project_delete": {"pk": project.pk},
+            "hr:payroll_detail": {"pk": payroll.pk},
+            "hr:payroll_update": {"pk": payroll.pk},
+            "hr:payroll_delete": {"pk": payroll.pk},
+            "hr:invoice_detail": {"pk": invoice.pk},
+            "hr:invoice_update": {"pk": invoice.pk},
+            "hr:invoice_delete": {"pk": invoice.pk},
+            "hr:ticket_detail": {"pk": ticket.pk},
+            "hr:ticket_update": {"pk": ticket.pk},
+            "hr:ticket_delete": {"pk": ticket.pk},
+            "hr:ticket_comment": {"ticket_id": ticket.pk},
+            "hr:task_update": {"pk": task.pk},
+            "hr:task_delete": {"pk": task.pk},
+            "hr:client_update": {"pk": client.pk},
+            "hr:client_delete": {"pk": client.pk},
+            "hr:event_detail": {"pk": event.pk},
+            "hr:event_edit": {"pk": event.pk},
+            "hr:delete_event": {"pk": event.pk},
+            "hr:event_ics": {"pk": event.pk},
+            "hr:event_feed": {"audience": "hr"},
+            "hr:note_detail": {"pk": note.pk},
+            "hr:note_edit": {"pk": note.pk},
+            "hr:note_delete": {"pk": note.pk},
+            "hr:like_post": {"pk": post.pk},
+            "hr:comment_post": {"pk": post.pk},
+            "hr:view_post": {"pk": post.pk},
+            "hr:delete_post": {"pk": post.pk},
+            "hr:help_detail": {"pk": article.pk},
+            "hr:help_edit": {"pk": article.pk},
+            "hr:help_delete": {"pk": article.pk},
+            "hr:category_filter": {"slug": category.slug},
+            "hr:edit_task": {"pk": todo.pk},
+            "hr:delete_task": {"pk": todo.pk},
+            "hr:toggle_task_status": {"pk": todo.pk},
+            "hr:mark_read": {"pk": delivery.pk},
+            "hr:clear_notification": {"pk": delivery.pk},
+            "core:pay_invoice": {"invoice_id": client_invoice.pk},
+            "core:payment_pay_now": {"pk": client_payment.pk},
+            "core:payment_delete": {"pk": client_payment.pk},
+            "core:project_edit": {"pk": client_project.pk},
+            "core:project_delete": {"pk": client_project.pk},
+        }
+        # view_post buffers a view count; write it before the test database goes away
+        self.addCleanup(view_count_writer.flush)
+        self.client.force_login(user)
+
+    def test_every_route_is_requested(self):
+        # a route whose URL arguments are missing above would be skipped silently
+        requested = {view_name for view_name, _ in self.budget_routes()}
+        for resolver in get_resolver().url_patterns:
+            if isinstance(resolver, URLResolver) and resolver.namespace in self.budget_namespaces:
+                for pattern in resolver.url_patterns:
+                    view_name = f"{resolver.namespace}:{pattern.name}"
+                    if pattern.name and view_name not in self.skip_routes:
+                        self.assertIn(view_name, requested)
+
+    def test_route_budgets(self):
+        self.assertRouteBudgets()
+
+
+# ============================================================
+# SEARCH (hr.search)
+# ============================================================
+
+class SearchTests(HRClientMixin, TestCase):
+    """Search hits stay a subquery, so later filters and pagination see all of them."""
+
+    def test_filters_apply_to_every_hit(self):
+        for i in range(30):
+            Note.objects.create(
+                title=f"Note {i}", description="quarterly budget",
+                visibility=NoteVisibility.SHARED if i % 2 else NoteVisibility.PRIVATE,
+            )
+        Note.objects.create(title="Budget plan", description="-", visibility=NoteVisibility.SHARED)
+        Note.objects.create(title="Unrelated", description="-", visibility=NoteVisibility.SHARED)
+
+        response = self.client.get(reverse("hr:notes"), {"q": "budg", "visibility": "shared"})
+        notes = list(response.context["notes"])
+        self.assertEqual(response.context["notes_count"], 16)
+        self.assertEqual(len(notes), 16)
+        self.assertEqual(notes[0].title, "Budget plan")  # title hits rank first
+
+    def test_search_paginates_past_the_first_page(self):
+        for i in range(30):
+            User.objects.create_user(f"smith{i}", first_name="Jo", last_name="Smith")
+        url = reverse("hr:employee_list")
+        with self.settings(HR_PAGE_SIZE=20):
+            first = self.client.get(url, {"q": "smith"}).context["page"]
+            second = self.client.get(f"{url}?{first.next_query}").context["page"]
+        self.assertEqual(len(first) + len(second), 30)
+        self.assertFalse({u.pk for u in first} & {u.pk for u in second})
+
+    def test_attendance_employee_filter(self):
+        seed_attendance(3)
+        robin = User.objects.create_user("robin", first_name="Robin")
+        Attendance.objects.create(user=robin, date=date.today(), check_in=time(9), check_out=time(17))
+        response = self.client.get(reverse("hr:attendance_list"), {"employee": "rob"})
+        self.assertEqual([r.user for r in response.context["records"]], [robin])
+
+    def test_backend_is_looked_up_on_the_connection_again_after_forgetting(self):
+        self.assertEqual(search.backend_name(), "fts5")
+        with connection.cursor() as cursor:
+            cursor.execute(f"ALTER TABLE {search.FTS_TABLE} RENAME TO hr_search_fts_moved")
+        try:
+            self.assertEqual(search.backend_name(), "fts5")  # remembered on the connection
+            search.forget_fts_table()
+            self.assertEqual(search.backend_name(), "basic")
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute(f"ALTER TABLE hr_search_fts_moved RENAME TO {search.FTS_TABLE}")
+            search.forget_fts_table()
+
+
+# ============================================================
+# CALENDARS (hr.calendars)
+# ============================================================
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "calendar-tests"}}
+DATABASE_CACHE = {"default": {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": "calendar_tests"}}
+
+
+class CalendarTests(TestCase):
+    def setUp(self):
+        self.month = date.today().replace(day=1)
+        self.event = Event.objects.create(title="Town hall", event_date=self.month, start_time=time(9), share_with="All")
+
+    def titles(self, audience):
+        return [ev.title for ev in calendars.month_grid(audience, self.month)["events"]]
+
+    def test_events_shared_with_all_reach_every_audience(self):
+        for audience in calendars.AUDIENCES:
+            with self.subTest(audience=audience):
+                self.assertEqual(self.titles(audience), ["Town hall"])
+
+    @override_settings(CACHES=LOCMEM)
+    def test_process_local_cache_is_not_used_across_requests(self):
+        self.titles("hr")
+        # update() skips the signals, as a change made in another worker process would
+        Event.objects.filter(pk=self.event.pk).update(title="Moved")
+        self.assertEqual(self.titles("hr"), ["Moved"])
+
+    @override_settings(CACHES=DATABASE_CACHE)
+    def test_shared_cache_keeps_grids_until_invalidated(self):
+        call_command("createcachetable", verbosity=0)
+        self.titles("hr")
+        Event.objects.filter(pk=self.event.pk).update(title="Moved")
+        self.assertEqual(self.titles("hr"), ["Town hall"])
+        calendars.invalidate_dates([self.month])
+        self.assertEqual(self.titles("hr"), ["Moved"])
+
+    def test_dashboard_shows_employees_events_shared_with_all(self):
+        user = make_hr_user()
+        user.groups.add(Group.objects.get_or_create(name=ROLE_EMPLOYEE)[0])
+        self.event.event_date = date.today()
+        self.event.save()
+        self.client.force_login(user)
+        response = self.client.get(reverse("hr:dashboard"))
+        self.assertEqual([ev.title for ev in response.context["upcoming_events"]], ["Town hall"])
+
+    def test_employee_feed_includes_events_shared_with_all(self):
+        self.assertEqual([ev.title for ev in ics.feed_events("employee")], ["Town hall"])
+
+
+class ClientEventsApiTests(TestCase):
+    def setUp(self):
+        self.month = date.today().replace(day=1)
+        self.event = Event.objects.create(title="Town hall", event_date=self.month, start_time=time(9), share_with="All")
+        Event.objects.create(title="HR only", event_date=self.month, start_time=time(10), share_with="HR")
+        user = User.objects.create_user(username="acme", password="x")
+        user.groups.add(Group.objects.get_or_create(name=ROLE_CLIENT)[0])
+        self.client.force_login(user)
+        self.url = reverse("core:client_events_api")
+
+    def test_unchanged_range_is_a_304(self):
+        response = self.client.get(self.url)
+        self.assertEqual([item["title"] for item in response.json()], ["Town hall"])
+        again = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(again.status_code, 304)
+        self.event.save()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 200)
+
+    def test_since_returns_changes_and_every_id_in_range(self):
+        since = Event.objects.get(pk=self.event.pk).updated_at
+        response = self.client.get(self.url, {"since": since.isoformat()})
+        self.assertEqual(response.json(), {"events": [], "ids": [self.event.pk], "updated_at": since.isoformat()})
+
+        self.event.title = "Moved"
+        self.event.save()
+        data = self.client.get(self.url, {"since": since.isoformat()}).json()
+        self.assertEqual(set(data), {"events", "ids", "updated_at"})
+        self.assertEqual([item["title"] for item in data["events"]], ["Moved"])
+        self.assertEqual(data["ids"], [self.event.pk])
+
+    def test_bad_or_oversized_range_is_a_400(self):
+        cases = {
+            "bad start": {"start": "soon"},
+            "bad end": {"start": self.month.isoformat(), "end": "later"},
+            "bad since": {"since": "yesterday-ish"},
+            "backwards": {"start": self.month.isoformat(), "end": (self.month - timedelta(days=1)).isoformat()},
+            "oversized": {"start": self.month.isoformat(), "end": (self.month + timedelta(days=400)).isoformat()},
+        }
+        for name, params in cases.items():
+            with self.subTest(name):
+                self.assertEqual(self.client.get(self.url, params).status_code, 400)
+        full_year = {"start": self.month.isoformat(), "end": (self.month + timedelta(days=366)).isoformat()}
+        self.assertEqual(self.client.get(self.url, full_year).status_code, 200)
+
+
+# ============================================================
+# ATTENDANCE IMPORT (hr.attendance_import)
+# ============================================================
+
+class AttendanceImportTests(TestCase):
+    def test_read_rows_json(self):
+        self.assertEqual(read_rows('{"records": [{"username": "jo"}, 5]}'), [(1, {"username": "jo"}), (2, {})])
+        self.assertEqual(read_rows('[{"username": "jo"}]'), [(1, {"username": "jo"})])
+
+    def test_read_rows_rejects_json_without_a_record_list(self):
+        for content in ('{"records": 5}', '{"records": null}', '{"records": {"username": "jo"}}', "5"):
+            with self.subTest(content=content), self.assertRaises(ValueError):
+                read_rows(content, "json")
+
+
+# ============================================================
+# ATTENDANCE ROLLUP (hr.attendance_rollup)
+# ============================================================
+
+class AttendanceRollupTests(TestCase):
+    def setUp(self):
+        self.jo = User.objects.create_user("jo")
+        self.sam = User.objects.create_user("sam")
+        self.month = date(2026, 3, 1)
+
+    def snapshot(self):
+        return sorted(AttendanceMonthly.objects.values_list("user_id", "month", *attendance_rollup.FIELDS))
+
+    def assertMatchesRebuild(self):
+        incremental = self.snapshot()
+        call_command("rebuild_attendance_rollup", stdout=io.StringIO())
+        self.assertEqual(incremental, self.snapshot())
+        return incremental
+
+    def test_saves_and_deletes_keep_the_rollup_equal_to_a_rebuild(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Attendance.objects.create(user=self.jo, date=self.month, check_in=time(9), check_out=time(17))
+            late = Attendance.objects.create(user=self.jo, date=date(2026, 3, 2), status=AttendanceStatus.LATE)
+            Attendance.objects.create(user=self.sam, date=self.month, status=AttendanceStatus.ABSENT)
+        self.assertEqual(self.assertMatchesRebuild(), [
+            (self.jo.pk, self.month, 1, 0, 1, Decimal("8.00")),
+            (self.sam.pk, self.month, 0, 1, 0, Decimal("0.00")),
+        ])
+
+        # moving a row to another month updates both the month it left and the one it joined
+        late.date = date(2026, 4, 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            late.save()
+        self.assertIn((self.jo.pk, date(2026, 4, 1), 0, 0, 1, Decimal("0.00")), self.assertMatchesRebuild())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Attendance.objects.filter(user=self.sam).get().delete()
+        self.assertNotIn(self.sam.pk, [row[0] for row in self.assertMatchesRebuild()])
+
+    def test_rollup_waits_for_the_commit(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            Attendance.objects.create(user=self.jo, date=self.month)
+            self.assertFalse(AttendanceMonthly.objects.exists())
+        self.assertEqual(len(callbacks), 1)
+
+
+# ============================================================
+# CSV EXPORTS (hr.exports)
+# ============================================================
+
+class ExportTests(HRClientMixin, TestCase):
+    def test_formula_cells_are_quoted(self):
+        for value in ("=1+1", "+1", "-1", "@SUM(A1)", "\tx", "\rx"):
+            with self.subTest(value=value):
+                self.assertEqual(exports._cell(value), "'" + value)
+        self.assertEqual(exports._cell("Jo Smith"), "Jo Smith")
+        self.assertEqual(exports._cell(-5), -5)
+
+    def test_export_quotes_formulas(self):
+        Payroll.objects.create(employee_name='=HYPERLINK("http://x")', month="January 2026", basic_salary=100)
+        response = self.client.get(reverse("hr:payroll_export"))
+        rows = list(csv.reader(b"".join(response.streaming_content).decode().splitlines()))
+        self.assertEqual(rows[1][:2], ["'=HYPERLINK(\"http://x\")", "January 2026"])
+
+    def export_rows(self, name):
+        response = self.client.get(reverse(name))
+        self.assertEqual(response.status_code, 200)
+        return list(csv.reader(b"".join(response.streaming_content).decode().splitlines()))
+
+    def test_projected_exports_follow_the_list_projections(self):
+        seed_invoices(2)
+        seed_tickets(2)
+        cases = [
+            ("hr:invoice_export", exports.INVOICE_COLUMNS, projections.INVOICE_LIST_FIELDS),
+            ("hr:payment_export", exports.PAYMENT_COLUMNS, projections.PAYMENT_LIST_FIELDS),
+            ("hr:ticket_export", exports.TICKET_COLUMNS, projections.TICKET_LIST_FIELDS),
+        ]
+        for name, columns, fields in cases:
+            with self.subTest(name):
+                lookups = [lookup for _, lookup in columns]
+                self.assertEqual(lookups, [field for field in fields if field in lookups])
+                rows = self.export_rows(name)
+                self.assertEqual(rows[0], [heading for heading, _ in columns])
+                self.assertEqual(len(rows), 3)
+        expected = sorted(Ticket.objects.values_list("ticket_id", "subject", "client__company_name"))
+        self.assertEqual(sorted(tuple(row[:3]) for row in self.export_rows("hr:ticket_export")[1:]), expected)
+
+    def test_headings_outside_the_projection_are_rejected(self):
+        with self.assertRaises(ValueError):
+            exports.projected_columns(projections.INVOICE_LIST_FIELDS, {"description": "Description"})
+
+
+# ============================================================
+# PAYROLL RUNS (hr.payroll_run)
+# ============================================================
+
+class PayrollRunTests(TestCase):
+    month = date(2026, 1, 1)
+
+    def setUp(self):
+        self.users = []
+        for i, (basic, allowances, deductions) in enumerate([("1000.00", "150.50", "75.25"), ("2000.00", "0", "300")]):
+            user = User.objects.create_user(f"payee{i}", first_name="Pay", last_name=f"Ee {i}")
+            Compensation.objects.create(
+                user=user, basic_salary=Decimal(basic), allowances=Decimal(allowances), deductions=Decimal(deductions)
+            )
+            self.users.append(user)
+        User.objects.create_user("uncompensated")
+
+    def rows(self):
+        return {row.employee_id: row for row in Payroll.objects.filter(month="January 2026")}
+
+    def test_totals_match_payroll_save(self):
+        result = run_payroll(self.month)
+        self.assertEqual((result.created, result.updated, len(result.missing)), (2, 0, 1))
+        for row in self.rows().values():
+            saved = Payroll(basic_salary=row.basic_salary, allowances=row.allowances, deductions=row.deductions)
+            saved.save()
+            self.assertEqual((row.gross_salary, row.net_salary), (saved.gross_salary, saved.net_salary))
+
+    def test_rerun_refreshes_pending_rows_without_duplicating(self):
+        run_payroll(self.month)
+        Compensation.objects.filter(user=self.users[0]).update(basic_salary=Decimal("1100.00"))
+        result = run_payroll(self.month)
+        self.assertEqual((result.created, result.updated), (0, 2))
+        rows = self.rows()
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[self.users[0].pk].net_salary, Decimal("1175.25"))
+
+    def test_paid_rows_are_left_alone(self):
+        run_payroll(self.month)
+        Payroll.objects.filter(employee=self.users[0]).update(status=PayrollStatus.PAID)
+        Compensation.objects.update(basic_salary=Decimal("5000.00"))
+        result = run_payroll(self.month)
+        self.assertEqual((result.updated, result.paid), (1, 1))
+        self.assertEqual(self.rows()[self.users[0].pk].basic_salary, Decimal("1000.00"))
+
+    def test_row_paid_during_the_run_is_left_alone(self):
+        run_payroll(self.month)
+        totals = Payroll.totals
+
+        def pay_first_row(*args):
+            # paid by someone else after the run read the month's rows
+            Payroll.objects.filter(employee=self.users[0]).update(status=PayrollStatus.PAID)
+            return totals(*args)
+
+        Compensation.objects.update(basic_salary=Decimal("5000.00"))
+        with mock.patch.object(Payroll, "totals", side_effect=pay_first_row):
+            result = run_payroll(self.month)
+        self.assertEqual((result.updated, result.paid), (1, 1))
+        self.assertEqual(self.rows()[self.users[0].pk].basic_salary, Decimal("1000.00"))
+        self.assertEqual(self.rows()[self.users[1].pk].basic_salary, Decimal("5000.00"))
+
+    def post_payroll(self, employee_name, **data):
+        data = {"employee_name": employee_name, "month": "January 2026", "basic_salary": "1000.00",
+                "allowances": "0", "deductions": "0", "status": PayrollStatus.PENDING, **data}
+        return self.client.post(reverse("hr:payroll_create"), data, follow=True)
+
+    def test_form_links_the_chosen_employee_so_a_run_does_not_duplicate_them(self):
+        self.client.force_login(make_hr_user())
+        self.post_payroll(str(self.users[0].pk), status=PayrollStatus.PAID)
+        row = Payroll.objects.get()
+        self.assertEqual((row.employee, row.employee_name), (self.users[0], "Pay Ee 0"))
+
+        result = run_payroll(self.month)
+        self.assertEqual((result.created, result.paid), (1, 1))
+        self.assertEqual(Payroll.objects.filter(employee=self.users[0]).count(), 1)
+
+        response = self.post_payroll(str(self.users[0].pk))
+        self.assertIn("already has a payroll record", str(list(response.context["messages"])))
+        self.assertEqual(Payroll.objects.filter(employee=self.users[0]).count(), 1)
+
+    def test_run_links_name_only_rows_instead_of_duplicating_them(self):
+        Payroll.objects.create(employee_name="Pay Ee 0", month="January 2026", basic_salary=Decimal("1"))
+        Payroll.objects.create(
+            employee_name="Pay Ee 1", month="January 2026", basic_salary=Decimal("2"), status=PayrollStatus.PAID
+        )
+        result = run_payroll(self.month)
+        self.assertEqual((result.linked, result.created, result.updated, result.paid), (2, 0, 1, 1))
+        self.assertIn("2 hand-entered record(s) linked", str(result))
+        rows = self.rows()
+        self.assertEqual(Payroll.objects.count(), 2)
+        self.assertEqual(rows[self.users[0].pk].basic_salary, Decimal("1000.00"))
+        self.assertEqual(rows[self.users[1].pk].basic_salary, Decimal("2.00"))
+
+    def test_role_feeds_match_the_calendars(self):
+        for audience, mask in calendars.AUDIENCES.items():
+            self.assertEqual(ics.FEED_AUDIENCES[audience], mask)
+
+
+# ============================================================
+# SELF-SERVICE CLOCK IN / OUT (hr.timeclock)
+# ============================================================
+
+class TimeclockTests(TestCase):
+    """Runs on the vendor INSERT ... ON CONFLICT path; FallbackTimeclockTests repeats it through the ORM."""
+
+    day = date(2026, 3, 2)
+
+    def setUp(self):
+        self.user = User.objects.create_user("puncher")
+
+    def punch(self, action, at):
+        return action(self.user, now=(self.day, at))
+
+    def record(self):
+        return Attendance.objects.get(user=self.user, date=self.day)
+
+    def assertRollupMatchesRebuild(self):
+        columns = ("user_id", "month", "present_days", "absent_days", "late_days", "total_hours")
+        incremental = set(AttendanceMonthly.objects.values_list(*columns))
+        attendance_rollup.rebuild_all()
+        self.assertEqual(incremental, set(AttendanceMonthly.objects.values_list(*columns)))
+
+    def test_first_clock_in(self):
+        self.assertEqual(self.punch(timeclock.clock_in, time(9)), timeclock.CLOCKED_IN)
+        record = self.record()
+        self.assertEqual((record.check_in, record.check_out, record.status), (time(9), None, AttendanceStatus.PRESENT))
+        self.assertEqual(AttendanceMonthly.objects.get(user=self.user).present_days, 1)
+        self.assertRollupMatchesRebuild()
+
+    def test_double_clock_in(self):
+        self.punch(timeclock.clock_in, time(9))
+        self.assertEqual(self.punch(timeclock.clock_in, time(9, 5)), timeclock.ALREADY_CLOCKED_IN)
+        self.assertEqual(self.record().check_in, time(9))
+
+    def test_clock_in_fills_a_row_hr_created(self):
+        Attendance.objects.create(user=self.user, date=self.day, status=AttendanceStatus.LATE)
+        self.assertEqual(self.punch(timeclock.clock_in, time(10)), timeclock.CLOCKED_IN)
+        self.assertEqual(Attendance.objects.filter(user=self.user).count(), 1)
+        record = self.record()
+        self.assertEqual((record.check_in, record.status), (time(10), AttendanceStatus.LATE))
+        self.assertRollupMatchesRebuild()
+
+    def test_clock_out(self):
+        self.assertEqual(self.punch(timeclock.clock_out, time(17)), timeclock.NOT_CLOCKED_IN)
+        self.punch(timeclock.clock_in, time(9))
+        self.assertEqual(self.punch(timeclock.clock_out, time(17, 30)), timeclock.CLOCKED_OUT)
+        self.assertEqual(self.punch(timeclock.clock_out, time(18)), timeclock.ALREADY_CLOCKED_OUT)
+        record = self.record()
+        self.assertEqual((record.check_out, record.total_hours), (time(17, 30), Decimal("8.50")))
+        self.assertEqual(AttendanceMonthly.objects.get(user=self.user).total_hours, Decimal("8.50"))
+        self.assertRollupMatchesRebuild()
+
+
+class FallbackTimeclockTests(TimeclockTests):
+    def setUp(self):
+        super().setUp()
+        # a backend without INSERT ... ON CONFLICT ... RETURNING support in clock_in()
+        for patcher in (
+            mock.patch.object(timeclock.connection, "vendor", "other"),
+            mock.patch.object(timeclock, "_upsert_check_in", side_effect=AssertionError("vendor path used")),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+# ============================================================
+# TIMELINE COUNTS (hr.timeline_counts)
+# ============================================================
+
+class TimelineCountTests(HRClientMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.post = TimelinePost.objects.create(message="Hi", created_by=self.hr_user)
+        self.other = User.objects.create_user("reader")
+
+    def counts(self):
+        self.post.refresh_from_db()
+        return self.post.like_count, self.post.comment_count
+
+    def react(self, user):
+        TimelineLike.objects.create(post=self.post, user=user)
+        TimelineComment.objects.create(post=self.post, user=user, comment_text="+1")
+        TimelinePost.objects.filter(pk=self.post.pk).update(like_count=F("like_count") + 1, comment_count=F("comment_count") + 1)
+
+    def test_views_count_up(self):
+        self.client.get(reverse("hr:like_post", kwargs={"pk": self.post.pk}))
+        self.client.get(reverse("hr:like_post", kwargs={"pk": self.post.pk}))  # liking twice counts once
+        self.client.post(reverse("hr:comment_post", kwargs={"pk": self.post.pk}), {"comment_text": "Nice"})
+        self.assertEqual(self.counts(), (1, 1))
+
+    def test_deletes_count_down(self):
+        self.react(self.hr_user)
+        self.react(self.other)
+        TimelineComment.objects.filter(user=self.other).get().delete()
+        TimelineLike.objects.filter(user=self.other).delete()
+        self.assertEqual(self.counts(), (1, 1))
+
+    def test_deleting_the_post_is_not_counted_per_reaction(self):
+        self.react(self.hr_user)
+        with self.assertNumQueries(5):  # select likes, comments; delete likes, comments, post
+            self.post.delete()
+
+    def test_rebuild_repairs_drift(self):
+        self.react(self.hr_user)
+        TimelinePost.objects.filter(pk=self.post.pk).update(like_count=7, comment_count=0)
+        other_post = TimelinePost.objects.create(message="Quiet", like_count=3)
+        call_command("rebuild_timeline_counts", stdout=io.StringIO())
+        self.assertEqual(self.counts(), (1, 1))
+        other_post.refresh_from_db()
+        self.assertEqual((other_post.like_count, other_post.comment_count), (0, 0))
+
+
+# ============================================================
+# SEQUENCES (hr.sequences)
+# ============================================================
+
+class SequenceTests(TestCase):
+    def make_invoice(self, **kwargs):
+        client, project = make_client_project(f"Client {Invoice.objects.count()}")
+        return Invoice.objects.create(client=client, project=project, amount=100, due_date=date.today(), **kwargs)
+
+    def test_identifier_formats(self):
+        self.assertEqual([self.make_invoice().invoice_number for _ in range(2)], ["INV0001", "INV0002"])
+        client, project = make_client_project()
+        ticket = Ticket.objects.create(client=client, project=project, subject="Broken", description="-")
+        self.assertEqual(ticket.ticket_id, "TKT0001")
+        profile = client_models.ClientProfile.objects.create(user=User.objects.create_user("customer"))
+        self.assertEqual(profile.client_id, "CL-1023")
+        support = client_models.SupportTicket.objects.create(client=profile, title="Help", category="LOGIN")
+        self.assertEqual(support.ticket_id, "SUP-10000")
+
+    def test_seeded_from_existing_identifiers(self):
+        self.make_invoice(invoice_number="INV0041")
+        self.make_invoice(invoice_number="INV-legacy")
+        Sequence.objects.all().delete()
+        import_module("hr.migrations.0005_sequence").seed_sequences(django_apps, None)
+        self.assertEqual(self.make_invoice().invoice_number, "INV0042")
+        self.assertEqual(sequences.next_identifier("support_ticket"), "SUP-10000")
+
+    def test_rolled_back_save_gives_its_number_back(self):
+        self.make_invoice()
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            self.make_invoice()
+            raise RuntimeError
+        self.assertEqual(self.make_invoice().invoice_number, "INV0002")
+
+    def test_block_allocation(self):
+        self.assertEqual(sequences.allocate("ticket", 3), range(1, 4))
+        self.assertEqual(sequences.allocate("ticket"), range(4, 5))
+        self.assertEqual(Sequence.objects.get(name="ticket").value, 4)
+
+
+# ============================================================
+# DASHBOARD STATS (hr.dashboard_stats)
+# ============================================================
+
+class DashboardStatsTests(TestCase):
+    """The signal-driven deltas leave every DashboardStats row equal to a full rebuild."""
+
+    def setUp(self):
+        self.users = [User.objects.create_user(f"staff{i}") for i in range(2)]
+        self.clients = [
+            client_models.ClientProfile.objects.create(user=User.objects.create_user(f"customer{i}")) for i in range(2)
+        ]
+        dashboard_stats.get_stats(DashboardScope.GLOBAL)
+
+    def assertMatchesRebuild(self):
+        def rows():
+            return {
+                (row["scope"], row["scope_id"]): row
+                for row in DashboardStats.objects.values("scope", "scope_id", *dashboard_stats.COUNTERS)
+            }
+
+        incremental = rows()
+        dashboard_stats.rebuild_all()
+        self.assertEqual(incremental, rows())
+
+    def test_client_counters(self):
+        a, b = self.clients
+        project = client_models.Project.objects.create(client=a, name="Site")
+        invoice = client_models.Invoice.objects.create(project=project, amount=10, issued_date=date.today())
+        ticket = client_models.SupportTicket.objects.create(client=a, title="Help", category="LOGIN")
+        message = client_models.Message.objects.create(client=a, subject="Hi", body="-")
+        self.assertEqual(dashboard_stats.get_stats(DashboardScope.CLIENT, a.pk).invoices_pending, 1)
+        self.assertMatchesRebuild()
+
+        invoice.status = "PAID"
+        invoice.save()
+        ticket.status = "CLOSED"
+        ticket.save()
+        message.is_read = True
+        message.save()
+        self.assertMatchesRebuild()
+
+        invoice.status = "PENDING"
+        invoice.save()
+        ticket.status = "OPEN"
+        ticket.client = b
+        ticket.save()
+        message.is_read = False
+        message.client = b
+        message.save()
+        other_project = client_models.Project.objects.create(client=b, name="Other")
+        invoice.project = other_project
+        invoice.save()
+        self.assertMatchesRebuild()
+
+        # loaded without the tracked fields: the previous values are unknown
+        deferred = client_models.SupportTicket.objects.only("pk", "title").get(pk=ticket.pk)
+        deferred.title = "Still broken"
+        deferred.save()
+        self.assertMatchesRebuild()
+
+        for obj in (invoice, ticket, message, project):
+            obj.delete()
+        self.assertMatchesRebuild()
+
+    def test_project_moved_to_another_client_takes_its_invoices(self):
+        a, b = self.clients
+        project = client_models.Project.objects.create(client=a, name="Site")
+        client_models.Invoice.objects.create(project=project, amount=10, issued_date=date.today())
+        project.client = b
+        project.save()
+        self.assertMatchesRebuild()
+
+        project.delete()  # cascades to the invoice
+        self.assertMatchesRebuild()
+
+    def test_user_counters(self):
+        first, second = self.users
+        leave = Leave.objects.create(employee=first, start_date=date.today(), end_date=date.today(), reason="-")
+        request = LeaveRequest.objects.create(
+            user=first, category=LeaveCategory.objects.create(name="Annual"),
+            start_date=date.today(), end_date=date.today(), reason="-",
+        )
+        self.assertMatchesRebuild()
+
+        leave.status = "Approved"
+        leave.save()
+        request.user = second
+        request.save()
+        self.assertMatchesRebuild()
+
+        leave.status = "Pending"
+        leave.employee = second
+        leave.save()
+        self.assertMatchesRebuild()
+
+        leave.delete()
+        request.delete()
+        self.assertMatchesRebuild()
+
+
+# ============================================================
+# NOTIFICATIONS (hr.notifications)
+# ============================================================
+
+class NotificationTests(TestCase):
+    def setUp(self):
+        self.hr = make_hr_user()
+        self.staff = User.objects.create_user("staff", is_staff=True)
+        self.employee = User.objects.create_user("employee")
+        inactive = make_hr_user("former")
+        inactive.is_active = False
+        inactive.save()
+        self.client.force_login(self.hr)
+        # write inline instead of from the flusher thread
+        patcher = mock.patch.object(notification_writer, "flush_interval", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def notify(self, count=1):
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(count):
+                create_notification(f"Notice {i}", "-", NotificationType.ANNOUNCEMENT)
+
+    def unread(self, user):
+        return UnreadNotificationCount.objects.get(user=user).unread
+
+    def test_fan_out_to_hr_and_staff_only(self):
+        self.notify(2)
+        recipients = set(NotificationDelivery.objects.values_list("user__username", flat=True))
+        self.assertEqual(recipients, {"hr", "staff"})
+        self.assertEqual((self.unread(self.hr), self.unread(self.staff), self.unread(self.employee)), (2, 2, 0))
+
+    def test_read_state_is_per_user(self):
+        self.notify()
+        delivery = NotificationDelivery.objects.get(user=self.hr)
+        self.client.post(reverse("hr:mark_read", kwargs={"pk": delivery.pk}))
+        self.client.post(reverse("hr:mark_read", kwargs={"pk": delivery.pk}))  # already read: no change
+        self.assertTrue(NotificationDelivery.objects.get(user=self.hr).is_read)
+        self.assertFalse(NotificationDelivery.objects.get(user=self.staff).is_read)
+        self.assertEqual((self.unread(self.hr), self.unread(self.staff)), (0, 1))
+
+    def test_counter_follows_clear_and_mark_all(self):
+        self.notify(3)
+        first, second, _ = NotificationDelivery.objects.filter(user=self.hr).order_by("pk")
+        self.client.post(reverse("hr:mark_read", kwargs={"pk": first.pk}))
+        self.client.post(reverse("hr:clear_notification", kwargs={"pk": first.pk}))  # read: count unchanged
+        self.assertEqual(self.unread(self.hr), 2)
+        self.client.post(reverse("hr:clear_notification", kwargs={"pk": second.pk}))
+        self.assertEqual(self.unread(self.hr), 1)
+        self.notify()
+        self.client.post(reverse("hr:read_all"))
+        self.assertEqual(self.unread(self.hr), 0)
+        self.assertEqual(unread_count(self.hr), 0)
+        self.assertEqual(self.unread(self.staff), 4)
+
+    def test_sync_repairs_drift(self):
+        self.notify(2)
+        UnreadNotificationCount.objects.filter(user=self.hr).update(unread=9)
+        UnreadNotificationCount.objects.filter(user=self.staff).delete()
+        call_command("sync_notification_counters", stdout=io.StringIO())
+        self.assertEqual((self.unread(self.hr), self.unread(self.staff), self.unread(self.employee)), (2, 2, 0))
+
+
+# ============================================================
+# BUFFERED WRITES (hr.buffers, hr.view_counts)
+# ============================================================
+
+class RecordingWriter(BufferedWriter):
+    def __init__(self, **kwargs):
+        super().__init__("test-writer", **kwargs)
+        self.batches = []
+        self.fail = False
+
+    def write(self, items):
+        if self.fail:
+            raise RuntimeError("database unavailable")
+        self.batches.append(list(items))
+
+
+class BufferedWriterTests(SimpleTestCase):
+    def writer(self, **kwargs):
+        writer = RecordingWriter(**kwargs)
+        self.addCleanup(writer.drain)
+        return writer
+
+    def test_flushes_when_full(self):
+        writer = self.writer(flush_interval=3600, max_size=3)
+        writer.put(1)
+        writer.put(2)
+        self.assertEqual((writer.batches, writer.depth()), ([], 2))
+        writer.put(3)
+        self.assertEqual((writer.batches, writer.depth()), ([[1, 2, 3]], 0))
+
+    def test_failed_batch_is_retried_in_order(self):
+        writer = self.writer(flush_interval=0, max_size=10)
+        writer.fail = True
+        with self.assertLogs("hr.buffers", "ERROR"):
+            writer.put(1)
+            writer.put(2)
+        self.assertEqual(writer.depth(), 2)
+        writer.fail = False
+        writer.put(3)
+        self.assertEqual(writer.batches, [[1, 2, 3]])
+
+    def test_backlog_drops_the_oldest_items(self):
+        writer = self.writer(flush_interval=0, max_size=10, max_backlog=3)
+        writer.fail = True
+        with self.assertLogs("hr.buffers", "ERROR") as logs:
+            for item in range(1, 6):
+                writer.put(item)
+        self.assertIn("dropped 1 oldest item(s)", logs.output[-1])
+        writer.fail = False
+        self.assertEqual(writer.flush(), 3)
+        self.assertEqual(writer.batches, [[3, 4, 5]])
+
+    def test_drain_writes_pending_items_and_stops_the_thread(self):
+        writer = self.writer(flush_interval=3600, max_size=10)
+        writer.put(1)
+        writer.put(2)
+        self.assertTrue(writer._thread.is_alive())
+        self.assertEqual(writer.drain(), 0)  # the woken thread wrote them on its way out
+        self.assertEqual(writer.batches, [[1, 2]])
+        self.assertFalse(writer._thread.is_alive())
+
+
+class ViewCountTests(TestCase):
+    def test_buffered_views_are_written_in_one_update(self):
+        posts = [TimelinePost.objects.create(message=f"Post {i}") for i in range(3)]
+        with mock.patch.object(view_count_writer, "_ensure_thread"):  # keep them buffered until flushed below
+            for post in (posts[0], posts[1], posts[0], posts[0]):
+                record_view(post.pk)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(view_count_writer.flush(), 4)
+        updates = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(
+            [post.view_count for post in TimelinePost.objects.filter(pk__in=[p.pk for p in posts]).order_by("pk")],
+            [3, 1, 0],
+        )
+
+
+# ============================================================
+# EVENT REMINDERS (hr.reminders)
+# ============================================================
+
+class ReminderTests(TestCase):
+    today = date(2026, 5, 10)
+
+    def setUp(self):
+        self.owner = make_hr_user()
+
+    def event(self, title, event_date, reminder_date=None):
+        return Event.objects.create(
+            title=title, event_date=event_date, reminder_date=reminder_date, start_time=time(9),
+            share_with="HR", created_by=self.owner,
+        )
+
+    def queued_subjects(self):
+        return sorted(OutboundEmail.objects.values_list("subject", flat=True))
+
+    def test_second_run_queues_nothing(self):
+        self.event("Review", self.today + timedelta(days=1))  # reminder due today
+        self.event("Later", self.today + timedelta(days=5))
+        self.assertEqual(send_due_reminders(self.today), 1)
+        self.assertEqual(send_due_reminders(self.today), 0)
+        self.assertEqual(self.queued_subjects(), [f"Reminder: Review on {self.today + timedelta(days=1)}"])
+
+    def test_catch_up_skips_events_already_over(self):
+        # reminders whose day passed while no worker ran still go out, unless the event is over too
+        self.event("Missed reminder", self.today + timedelta(days=2), reminder_date=self.today - timedelta(days=3))
+        self.event("Over", self.today - timedelta(days=1), reminder_date=self.today - timedelta(days=2))
+        self.event("Today", self.today, reminder_date=self.today - timedelta(days=1))
+        self.assertEqual(send_due_reminders(self.today), 2)
+        self.assertEqual(
+            [s.split(" on ")[0] for s in self.queued_subjects()], ["Reminder: Missed reminder", "Reminder: Today"]
+        )
+
+    def test_stale_claim_is_taken_again(self):
+        fresh = self.event("Claimed", self.today)
+        stale = self.event("Abandoned", self.today)
+        now = timezone.now()
+        Event.objects.filter(pk=fresh.pk).update(reminder_claim="other-worker", reminder_claimed_at=now)
+        Event.objects.filter(pk=stale.pk).update(
+            reminder_claim="dead-worker", reminder_claimed_at=now - timedelta(seconds=601)
+        )
+        self.assertEqual(send_due_reminders(self.today), 1)
+        self.assertEqual([s.split(" on ")[0] for s in self.queued_subjects()], ["Reminder: Abandoned"])
+        fresh.refresh_from_db()
+        self.assertEqual((fresh.reminder_sent, fresh.reminder_claim), (False, "other-worker"))
+
+
+# ============================================================
+# NOTE TAGS (Note.sync_tags)
+# ============================================================
+
+class NoteTagTests(TestCase):
+    def setUp(self):
+        self.user = make_hr_user()
+        self.client.force_login(self.user)
+        self.note = Note.objects.create(title="Onboarding", description="-", tags="HR,  Policy , hr", created_by=self.user)
+        Note.objects.create(title="Budget", description="-", tags="finance", created_by=self.user)
+
+    def tag_names(self):
+        return sorted(NoteTag.objects.filter(note=self.note).values_list("tag__name", flat=True))
+
+    def titles(self, tag):
+        response = self.client.get(reverse("hr:notes"), {"tag": tag})
+        return [note.title for note in response.context["notes"]]
+
+    def test_save_mirrors_the_tag_text(self):
+        self.assertEqual(self.tag_names(), ["hr", "policy"])
+        self.note.tags = "policy, Travel"
+        self.note.save()
+        self.assertEqual(self.tag_names(), ["policy", "travel"])
+        # tags outlive the notes that used them; only the link rows go
+        self.assertTrue(Tag.objects.filter(name="hr").exists())
+
+    def test_saves_that_skip_tags_leave_the_rows_alone(self):
+        self.note.tags = "ignored"
+        self.note.save(update_fields=["title"])
+        self.assertEqual(self.tag_names(), ["hr", "policy"])
+
+    def test_tag_filter_follows_edits(self):
+        self.assertEqual(self.titles("HR"), ["Onboarding"])
+        self.note.tags = "finance"
+        self.note.save()
+        self.assertEqual(self.titles("hr"), [])
+        self.assertEqual(sorted(self.titles("finance")), ["Budget", "Onboarding"])
+
+
+# ============================================================
+# MAIL OUTBOX (hr.mail)
+# ============================================================
+
+class RefusingBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise ConnectionRefusedError("smtp down")
+
+
+@override_settings(
+    HR_MAIL_DELIVERY_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    HR_MAIL_MAX_ATTEMPTS=3,
+    HR_MAIL_RETRY_BACKOFF=60,
+    HR_MAIL_CLAIM_TIMEOUT=600,
+)
+class MailOutboxTests(TestCase):
+    def queue(self, count=1):
+        return mail.queue_messages(
+            [EmailMultiAlternatives(f"Hello {i}", "Body", to=[f"user{i}@example.com"]) for i in range(count)]
+        )
+
+    def test_concurrent_senders_never_claim_the_same_rows(self):
+        self.queue(3)
+        first = {row.pk for row in mail.claim_batch(2)}
+        second = {row.pk for row in mail.claim_batch(5)}
+        self.assertEqual((len(first), len(second)), (2, 1))
+        self.assertFalse(first & second)
+        self.assertEqual(mail.claim_batch(5), [])
+
+    def test_recipients_reply_to_headers_and_html_survive_the_outbox(self):
+        message = EmailMultiAlternatives(
+            "Payslip", "Text", "hr@example.com", ["jo@example.com"],
+            cc=["boss@example.com"], bcc=["audit@example.com"], reply_to=["payroll@example.com"],
+            headers={"X-Payroll-Run": "2026-03"},
+        )
+        message.attach_alternative("<p>Html</p>", "text/html")
+        mail.queue_messages([message])
+        self.assertEqual(mail.send_pending()["sent"], 1)
+
+        sent = django_mail.outbox[0]
+        self.assertEqual((sent.to, sent.cc, sent.bcc), (["jo@example.com"], ["boss@example.com"], ["audit@example.com"]))
+        self.assertEqual(sent.reply_to, ["payroll@example.com"])
+        self.assertEqual(sent.extra_headers, {"X-Payroll-Run": "2026-03"})
+        self.assertEqual(sent.alternatives[0][:2], ("<p>Html</p>", "text/html"))
+        headers = sent.message()
+        self.assertEqual(headers["Cc"], "boss@example.com")
+        self.assertIsNone(headers["Bcc"])
+
+    def test_parts_the_outbox_cannot_keep_are_refused(self):
+        with_file = EmailMultiAlternatives("Report", "Body", to=["jo@example.com"])
+        with_file.attach("report.csv", "a,b", "text/csv")
+        with_calendar = EmailMultiAlternatives("Invite", "Body", to=["jo@example.com"])
+        with_calendar.attach_alternative("BEGIN:VCALENDAR", "text/calendar")
+        for message in (with_file, with_calendar):
+            with self.subTest(message.subject), self.assertRaises(ValueError):
+                mail.queue_messages([message])
+        self.assertFalse(OutboundEmail.objects.exists())
+        self.assertEqual(mail.OutboxEmailBackend(fail_silently=True).send_messages([with_file]), 0)
+
+    @override_settings(HR_MAIL_DELIVERY_BACKEND="hr.tests.RefusingBackend")
+    def test_failures_back_off_then_give_up(self):
+        self.queue()
+        for attempt, delay in ((1, 60), (2, 120)):
+            before = timezone.now()
+            self.assertEqual(mail.send_pending()["retried"], 1)
+            row = OutboundEmail.objects.get()
+            self.assertEqual((row.attempts, row.status, row.claim), (attempt, OutboundEmailStatus.PENDING, ""))
+            self.assertIn("smtp down", row.last_error)
+            self.assertGreaterEqual(row.next_attempt_at, before + timedelta(seconds=delay))
+            # not due yet, so the next run leaves it alone
+            self.assertEqual(mail.send_pending()["retried"], 0)
+            OutboundEmail.objects.update(next_attempt_at=timezone.now())
+
+        self.assertEqual(mail.send_pending()["failed"], 1)
+        row = OutboundEmail.objects.get()
+        self.assertEqual((row.attempts, row.status), (3, OutboundEmailStatus.FAILED))
+        self.assertEqual(mail.claim_batch(), [])
+
+    def test_a_dead_senders_claim_is_taken_over_after_the_timeout(self):
+        self.queue()
+        self.assertEqual(len(mail.claim_batch()), 1)  # this sender never finishes
+        self.assertEqual(mail.send_pending()["sent"], 0)
+        OutboundEmail.objects.update(claimed_at=timezone.now() - timedelta(seconds=601))
+        self.assertEqual(mail.send_pending()["sent"], 1)
+        self.assertEqual(len(django_mail.outbox), 1)
+        self.assertEqual(OutboundEmail.objects.get().status, OutboundEmailStatus.SENT)
@@ -0,0 +1,83 @@
+from django.db import connection
+from django.utils import timezone
+
+from . import attendance_rollup
+from .models import Attendance, AttendanceStatus
+
+
+# ============================================================
+# SELF-SERVICE CLOCK IN / OUT
+# ============================================================
+#
+# Employee punches land in hr.Attendance, the table HR reports read, keyed
+# by the unique (user, date) index. Clocking in is a single
+# INSERT ... ON CONFLICT (user_id, date) DO UPDATE ... WHERE check_in IS NULL
+# RETURNING: it only fills an empty check_in, so double clicks and
+# concurrent requests are harmless, and a row HR created first (e.g. marked
+# LATE without times) is completed rather than duplicated. Clocking out is
+# one probe plus an UPDATE guarded on check_out still being empty. Neither
+# goes through save(), so both refresh the monthly rollup themselves.
+
+CLOCKED_IN = "clocked_in"
+ALREADY_CLOCKED_IN = "already_clocked_in"
+CLOCKED_OUT = "clocked_out"
+ALREADY_CLOCKED_OUT = "already_clocked_out"
+NOT_CLOCKED_IN = "not_clocked_in"
+
+
+def _now():
+    now = timezone.localtime()
+    return now.date(), now.time().replace(microsecond=0)
+
+
+def _upsert_check_in(user_id, day, at) -> bool:
+    """True if this call inserted the row or filled its empty check_in."""
+    ops = connection.ops
+    table = ops.quote_name(Attendance._meta.db_table)
+    fields = [Attendance._meta.get_field(name) for name in ("user", "date", "check_in", "total_hours", "status")]
+    user_col, date_col, in_col, hours_col, status_col = (ops.quote_name(field.column) for field in fields)
+    values = [user_id, day, at, Attendance.hours_between(day, None, None), AttendanceStatus.PRESENT]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} ({user_col}, {date_col}, {in_col}, {hours_col}, {status_col}) "
+            f"VALUES (%s, %s, %s, %s, %s) "
+            f"ON CONFLICT ({user_col}, {date_col}) DO UPDATE SET {in_col} = excluded.{in_col} "
+            f"WHERE {table}.{in_col} IS NULL "
+            f"RETURNING {in_col}",
+            # each field adapts its own value (e.g. total_hours to its max_digits/decimal_places)
+            [field.get_db_prep_value(value, connection) for field, value in zip(fields, values)],
+        )
+        # a conflicting row whose check_in is already set is neither updated nor returned
+        return cursor.fetchone() is not None
+
+
+def clock_in(user, now=None) -> str:
+    day, at = now or _now()
+    if connection.vendor in ("sqlite", "postgresql"):
+        marked = _upsert_check_in(user.pk, day, at)
+    else:
+        record, marked = Attendance.objects.get_or_create(
+            user=user, date=day, defaults={"check_in": at, "status": AttendanceStatus.PRESENT}
+        )
+        if not marked:
+            marked = bool(Attendance.objects.filter(pk=record.pk, check_in__isnull=True).update(check_in=at))
+    if not marked:
+        return ALREADY_CLOCKED_IN
+    attendance_rollup.refresh([(user.pk, day)])
+    return CLOCKED_IN
+
+
+def clock_out(user, now=None) -> str:
+    day, at = now or _now()
+    record = Attendance.objects.filter(user=user, date=day).only("pk", "date", "check_in", "check_out").first()
+    if record is None or record.check_in is None:
+        return NOT_CLOCKED_IN
+    if record.check_out is not None:
+        return ALREADY_CLOCKED_OUT
+    updated = Attendance.objects.filter(pk=record.pk, check_out__isnull=True).update(
+        check_out=at, total_hours=Attendance.hours_between(day, record.check_in, at)
+    )
+    if not updated:
+        return ALREADY_CLOCKED_OUT
+    attendance_rollup.refresh([(user.pk, day)])
+    return CLOCKED_OUT
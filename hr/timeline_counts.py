@@ -0,0 +1,40 @@
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import TimelineComment, TimelineLike, TimelinePost
+
+
+# ============================================================
+# TIMELINE LIKE / COMMENT COUNTS
+# ============================================================
+#
+# TimelinePost.like_count and comment_count let the feed show totals
+# without counting rows. like_post_view / comment_post_view add one with an
+# UPDATE ... SET n = n + 1 next to the insert; the post_delete receivers in
+# hr/signals.py take one off whenever a like or comment goes away by any
+# other route (the admin, a cascade). `manage.py rebuild_timeline_counts`
+# recounts every post from the rows.
+
+# counter field -> model whose rows it counts
+COUNTED = {
+    "like_count": TimelineLike,
+    "comment_count": TimelineComment,
+}
+
+
+def decrement(post_id, field: str) -> None:
+    TimelinePost.objects.filter(pk=post_id).update(**{field: Greatest(F(field) - 1, Value(0))})
+
+
+def rebuild_all() -> int:
+    """Recount every post's likes and comments in one UPDATE; returns the number of posts."""
+    counts = {
+        field: Coalesce(
+            Subquery(
+                model.objects.filter(post=OuterRef("pk")).order_by().values("post").annotate(n=Count("pk")).values("n")
+            ),
+            0,
+        )
+        for field, model in COUNTED.items()
+    }
+    return TimelinePost.objects.update(**counts)
@@ -27,9 +27,14 @@ urlpatterns = [
 
     # Attendance
     path("attendance/", views.attendance_list, name="attendance_list"),
+    path("attendance/export/", views.attendance_export, name="attendance_export"),
+    path("attendance/import/", views.attendance_import_view, name="attendance_import"),
+    path("attendance/timesheet/", views.attendance_timesheet_view, name="attendance_timesheet"),
+    path("attendance/timesheet/export/", views.attendance_timesheet_export, name="attendance_timesheet_export"),
 
     # Leave
     path("leave/", views.leave_dashboard, name="leave_dashboard"),
+    path("leave/export/", views.leave_export, name="leave_export"),
     path("leave/approve/<int:pk>/", views.approve_leave, name="approve_leave"),
     path("leave/reject/<int:pk>/", views.reject_leave, name="reject_leave"),
     path("leave/category/add/", views.add_leave_category, name="add_leave_category"),
@@ -48,22 +53,27 @@ urlpatterns = [
 
     # Payroll
     path("payroll/", views.payroll_list_view, name="payroll_list"),
+    path("payroll/export/", views.payroll_export_view, name="payroll_export"),
     path("payroll/add/", views.payroll_create_view, name="payroll_create"),
+    path("payroll/run/", views.payroll_run_view, name="payroll_run"),
     path("payroll/<int:pk>/", views.payroll_detail_view, name="payroll_detail"),
     path("payroll/<int:pk>/edit/", views.payroll_update_view, name="payroll_update"),
     path("payroll/<int:pk>/delete/", views.payroll_delete_view, name="payroll_delete"),
 
     # Invoices / Payments
     path("invoices/", views.invoice_list_view, name="invoice_list"),
+    path("invoices/export/", views.invoice_export_view, name="invoice_export"),
     path("invoices/add/", views.invoice_create_view, name="invoice_create"),
     path("invoices/<int:pk>/", views.invoice_detail_view, name="invoice_detail"),
     path("invoices/<int:pk>/edit/", views.invoice_update_view, name="invoice_update"),
     path("invoices/<int:pk>/delete/", views.invoice_delete_view, name="invoice_delete"),
 
     path("payments/", views.payment_list_view, name="payment_list"),
+    path("payments/export/", views.payment_export_view, name="payment_export"),
 
     # Tickets
     path("tickets/", views.ticket_list_view, name="ticket_list"),
+    path("tickets/export/", views.ticket_export_view, name="ticket_export"),
     path("tickets/<int:pk>/", views.ticket_detail_view, name="ticket_detail"),
     path("tickets/<int:pk>/edit/", views.ticket_update_view, name="ticket_update"),
     path("tickets/<int:pk>/delete/", views.ticket_delete_view, name="ticket_delete"),
@@ -87,6 +97,7 @@ urlpatterns = [
     path("events/<int:pk>/edit/", views.event_edit, name="event_edit"),
     path("events/delete/<int:pk>/", views.delete_event, name="delete_event"),
     path("events/<int:pk>/ics/", views.event_ics, name="event_ics"),
+    path("events/feed/<slug:audience>.ics", views.event_feed, name="event_feed"),
     path("events/reminders/send/", views.send_event_reminders, name="send_event_reminders"),
 
     # Notes
@@ -130,4 +141,7 @@ urlpatterns = [
     path("settings/", views.settings_view, name="settings"),
     path("settings/update-profile/", views.update_profile_view, name="update_profile"),
     path("settings/change-password/", views.change_password_view, name="change_password"),
+
+    # Metrics
+    path("metrics/buffers/", views.buffer_metrics_view, name="buffer_metrics"),
 ]
\ No newline at end of file
@@ -1,5 +1,6 @@
 from datetime import date, timedelta
-from calendar import monthrange
+import csv
+import os
 import re
 
 from django.conf import settings
@@ -7,12 +8,14 @@ from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout, get_user_model
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.hashers import make_password
-from django.core.mail import send_mail
-from django.db.models import Q, F, Sum
-from django.http import HttpResponse
+from django.db import transaction
+from django.db.models import Q, F, Count, Prefetch, Sum
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag, urlencode
 from django.views.decorators.http import require_POST
 
 from .forms import (
@@ -30,12 +33,12 @@ from .forms import (
 )
 
 from .models import (
-    Attendance, LeaveRequest, LeaveCategory,
+    Attendance, AttendanceMonthly, LeaveRequest, LeaveCategory,
     Announcement, AnnouncementStatus,
     Project, Task, TaskStatus,
     Client,
-    Event,
-    Note, NoteVisibility,
+    Event, EventAudience,
+    Note, NoteVisibility, Tag,
     TimelinePost, TimelineLike, TimelineComment,
     HelpArticle, HelpCategory,
     PersonalTask,
@@ -44,13 +47,13 @@ from .models import (
     # ✅ EXTRA (must exist)
     Payroll, Invoice, Payment,
     Ticket, TicketComment,
-    Notification, NotificationType,
+    NotificationType,
     AdminProfile,
+    DashboardScope,
     Status,  # if you use Status.ACTIVE/INACTIVE for employees
 )
 
 from django.conf import settings
-from django.core.mail import send_mail
 from django.http import HttpResponse
 from django.contrib.auth import authenticate, login, logout
 
@@ -59,6 +62,23 @@ from django.contrib import messages
 from django.contrib.auth import update_session_auth_hash
 
 from .models import AdminProfile
+from .attendance_import import import_attendance
+from .attendance_rollup import month_start, next_month
+from .calendars import AUDIENCES, audience_for, month_grid
+from .dashboard_stats import get_stats
+from .mail import queue_mail
+from .notifications import adjust_unread, create_notification, deliveries_for, notification_writer, reset_unread
+from . import exports, ics, projections
+from .pagination import paginate_keyset
+from .payroll_run import run_payroll
+from .reminders import send_due_reminders
+from .roles import ROLE_CLIENT, ROLE_EMPLOYEE, ROLE_HR, has_role
+from .search import filter_matches, match_ids
+from .summaries import (
+    ATTENDANCE_SUMMARY, LEAVE_SUMMARY, PAYROLL_SUMMARY, TICKET_SUMMARY,
+    invoice_summary_spec, summarize,
+)
+from .view_counts import record_view, view_count_writer
 
 User = get_user_model()
 
@@ -67,29 +87,23 @@ User = get_user_model()
 # ============================================================
 
 def _create_notification(title: str, message: str, notification_type: str) -> None:
-    if notification_type not in dict(NotificationType.choices):
-        notification_type = NotificationType.ANNOUNCEMENT
-    Notification.objects.create(
-        title=title[:255],
-        message=message,
-        type=notification_type,
-    )
+    create_notification(title, message, notification_type)
 
 # ============================================================
 # GROUP HELPERS (Auth User + Groups)
 # ============================================================
 
 def _is_in_group(user, group_name: str) -> bool:
-    return user.is_authenticated and user.groups.filter(name=group_name).exists()
+    return has_role(user, group_name)
 
 def _is_hr(user) -> bool:
-    return _is_in_group(user, "HR") or (user.is_authenticated and user.is_staff)
+    return (user.is_authenticated and user.is_staff) or _is_in_group(user, ROLE_HR)
 
 def _is_employee(user) -> bool:
-    return _is_in_group(user, "EMPLOYEE")
+    return _is_in_group(user, ROLE_EMPLOYEE)
 
 def _is_client(user) -> bool:
-    return _is_in_group(user, "CLIENT")
+    return _is_in_group(user, ROLE_CLIENT)
 
 def _hr_required(view_func):
     @login_required(login_url="hr:login")
@@ -117,9 +131,9 @@ def dashboard(request):
     upcoming = Event.objects.filter(event_date__gte=today).order_by("event_date", "start_time")
 
     if _is_employee(request.user):
-        upcoming = upcoming.filter(Q(share_with__icontains="Employee") | Q(share_with__icontains="Team"))
+        upcoming = upcoming.filter(EventAudience.q(AUDIENCES["employee"]))
     elif _is_client(request.user):
-        upcoming = upcoming.filter(Q(share_with__icontains="Client") | Q(share_with__icontains="All"))
+        upcoming = upcoming.filter(EventAudience.q(AUDIENCES["client"]))
 
     upcoming = upcoming[:5]
 
@@ -127,6 +141,7 @@ def dashboard(request):
         "active_announcements": active_announcements,
         "active_announcements_count": active_announcements.count(),
         "upcoming_events": upcoming,
+        "dashboard_stats": get_stats(DashboardScope.GLOBAL),
     })
 
 
@@ -140,18 +155,16 @@ def employee_list(request):
     members = User.objects.all()
 
     if query:
-        members = members.filter(
-            Q(first_name__icontains=query) |
-            Q(last_name__icontains=query) |
-            Q(email__icontains=query) |
-            Q(username__icontains=query)
-        )
-
-    # ✅ FIX: default Django User uses date_joined
-    members = members.order_by("-date_joined")
+        # best matches first
+        members = filter_matches(members, "user", query)
+    else:
+        # ✅ FIX: default Django User uses date_joined
+        members = members.order_by("-date_joined")
+    page = paginate_keyset(request, members)
 
     return render(request, "hr/employee.html", {
-        "members": members,
+        "members": page.object_list,
+        "page": page,
         "search_query": query,
     })
 
@@ -269,14 +282,29 @@ def team_delete(request, pk):
 # ATTENDANCE
 # ============================================================
 
-@_hr_required
-def attendance_list(request):
+def _attendance_records(request):
+    """(day, records, status filter, employee query) for the attendance page's GET filters."""
     date_str = request.GET.get("date", "")
     try:
         filter_date = date.fromisoformat(date_str) if date_str else timezone.localdate()
     except ValueError:
         filter_date = timezone.localdate()
 
+    records = Attendance.objects.filter(date=filter_date).select_related("user")
+
+    status_filter = request.GET.get("status", "")
+    if status_filter:
+        records = records.filter(status=status_filter.upper())
+
+    employee_query = request.GET.get("employee", "").strip()
+    if employee_query:
+        records = records.filter(user_id__in=match_ids("user", employee_query))
+    return filter_date, records, status_filter, employee_query
+
+@_hr_required
+def attendance_list(request):
+    filter_date, records, status_filter, employee_query = _attendance_records(request)
+
     if request.method == "POST":
         form = AttendanceForm(request.POST)
         if form.is_valid():
@@ -288,41 +316,101 @@ def attendance_list(request):
                     "check_in": obj.check_in,
                     "check_out": obj.check_out,
                     "status": obj.status,
+                    # an update only writes the defaults' fields, so total_hours has to be one of them
+                    "total_hours": Attendance.hours_between(obj.date, obj.check_in, obj.check_out),
                 }
             )
-            attendance.save()
             _create_notification("Attendance updated", f"{attendance.user} attendance saved.", NotificationType.ATTENDANCE)
             messages.success(request, "Attendance saved.")
             return redirect(f"{reverse('hr:attendance_list')}?date={obj.date.isoformat()}")
     else:
         form = AttendanceForm(initial={"date": filter_date})
 
-    records = Attendance.objects.filter(date=filter_date).select_related("user")
-
-    status_filter = request.GET.get("status", "")
-    if status_filter:
-        records = records.filter(status=status_filter.upper())
-
-    employee_query = request.GET.get("employee", "").strip()
-    if employee_query:
-        records = records.filter(
-            Q(user__first_name__icontains=employee_query) |
-            Q(user__last_name__icontains=employee_query) |
-            Q(user__email__icontains=employee_query)
-        )
-
     context = {
         "records": records,
         "form": form,
         "filter_date": filter_date,
         "date_str": filter_date.isoformat(),
+        "status_filter": status_filter,
+        "employee_query": employee_query,
         "total_employees": User.objects.filter(is_active=True).count(),
-        "present_today": records.filter(status="PRESENT").count(),
-        "absent_today": records.filter(status="ABSENT").count(),
-        "late_today": records.filter(status="LATE").count(),
+        **summarize(records, ATTENDANCE_SUMMARY),
     }
     return render(request, "hr/attendance.html", context)
 
+@_hr_required
+def attendance_export(request):
+    filter_date, records, _, _ = _attendance_records(request)
+    return exports.export_csv(
+        records.order_by("user__username"), exports.ATTENDANCE_COLUMNS, f"attendance-{filter_date.isoformat()}.csv"
+    )
+
+@_hr_required
+@require_POST
+def attendance_import_view(request):
+    """
+    Bulk upsert of employee-days: an uploaded CSV/JSON "file" from the
+    attendance page (redirects back), or a raw CSV/JSON body (answers JSON).
+    """
+    upload = request.FILES.get("file")
+    content = upload.read() if upload else request.body
+    try:
+        result = import_attendance(content)
+    except (ValueError, UnicodeDecodeError, csv.Error) as exc:
+        if upload:
+            messages.error(request, f"Could not read the attendance file: {exc}")
+            return redirect("hr:attendance_list")
+        return JsonResponse({"error": str(exc)}, status=400)
+
+    if not upload:
+        return JsonResponse({
+            "written": result.written,
+            "errors": [{"line": line, "error": error} for line, error in result.errors],
+        })
+    if result.written:
+        messages.success(request, f"{result}.")
+    for line, error in result.errors[:5]:
+        messages.warning(request, f"Line {line}: {error}")
+    return redirect("hr:attendance_list")
+
+
+def _timesheet_month(request):
+    """First day of the ?month=YYYY-MM being reported (default: the current month)."""
+    try:
+        return date.fromisoformat(request.GET.get("month", "") + "-01")
+    except ValueError:
+        return month_start(timezone.localdate())
+
+@_hr_required
+def attendance_timesheet_view(request):
+    """Per-employee month totals read from the AttendanceMonthly rollup, one row per employee."""
+    month = _timesheet_month(request)
+    rows = AttendanceMonthly.objects.filter(month=month).select_related("user").order_by("user")
+    page = paginate_keyset(request, rows)
+    totals = rows.aggregate(
+        employees=Count("pk"),
+        present=Sum("present_days"),
+        absent=Sum("absent_days"),
+        late=Sum("late_days"),
+        hours=Sum("total_hours"),
+    )
+    context = {
+        "rows": page.object_list,
+        "page": page,
+        "month": month,
+        "previous_month": month_start(month - timedelta(days=1)),
+        "next_month": next_month(month),
+        "totals": totals,
+    }
+    return render(request, "hr/timesheet.html", context)
+
+@_hr_required
+def attendance_timesheet_export(request):
+    """The timesheet for ?month=YYYY-MM as CSV."""
+    month = _timesheet_month(request)
+    rows = AttendanceMonthly.objects.filter(month=month).order_by("user__username")
+    return exports.export_csv(rows, exports.TIMESHEET_COLUMNS, f"timesheet-{month:%Y-%m}.csv")
+
 
 # ============================================================
 # LEAVE
@@ -332,34 +420,54 @@ def attendance_list(request):
 def leave_dashboard(request):
     leaves = LeaveRequest.objects.select_related("user", "category")
     categories = LeaveCategory.objects.all()
+    page = paginate_keyset(request, leaves)
     context = {
-        "leaves": leaves,
+        "leaves": page.object_list,
+        "page": page,
         "categories": categories,
         "total_employees": User.objects.count(),
-        "total_requests": leaves.count(),
-        "approved_count": leaves.filter(status="Approved").count(),
-        "pending_count": leaves.filter(status="Pending").count(),
-        "rejected_count": leaves.filter(status="Rejected").count(),
+        **summarize(leaves, LEAVE_SUMMARY),
         "cat_form": LeaveCategoryForm(),
     }
     return render(request, "hr/leave.html", context)
 
+@_hr_required
+def leave_export(request):
+    return exports.export_csv(LeaveRequest.objects.all(), exports.LEAVE_COLUMNS, "leave-requests.csv")
+
+def _queue_leave_decision_mail(leave) -> None:
+    recipient = leave.user.email
+    if not recipient:
+        return
+    status = leave.status.lower()
+    queue_mail(
+        f"Your leave request has been {status}",
+        (
+            f"Hello {leave.user.get_full_name() or leave.user.username},\n\n"
+            f"Your {leave.category.name} leave from {leave.start_date} to {leave.end_date} "
+            f"({leave.total_days} day(s)) has been {status}."
+        ),
+        [recipient],
+    )
+
 @_hr_required
 def approve_leave(request, pk):
-    leave = get_object_or_404(LeaveRequest, pk=pk)
+    leave = get_object_or_404(LeaveRequest.objects.select_related("user", "category"), pk=pk)
     leave.status = "Approved"
     leave.approved_by = request.user
     leave.save()
+    _queue_leave_decision_mail(leave)
     _create_notification("Leave approved", f"Leave #{leave.pk} approved.", NotificationType.LEAVE)
     messages.success(request, "Leave approved.")
     return redirect("hr:leave_dashboard")
 
 @_hr_required
 def reject_leave(request, pk):
-    leave = get_object_or_404(LeaveRequest, pk=pk)
+    leave = get_object_or_404(LeaveRequest.objects.select_related("user", "category"), pk=pk)
     leave.status = "Rejected"
     leave.approved_by = request.user
     leave.save()
+    _queue_leave_decision_mail(leave)
     _create_notification("Leave rejected", f"Leave #{leave.pk} rejected.", NotificationType.LEAVE)
     messages.success(request, "Leave rejected.")
     return redirect("hr:leave_dashboard")
@@ -396,7 +504,8 @@ def announcement_list(request):
         form = AnnouncementForm()
 
     announcements = Announcement.objects.all().order_by("-publish_date", "-created_at")
-    return render(request, "hr/announcements.html", {"form": form, "announcements": announcements})
+    page = paginate_keyset(request, announcements)
+    return render(request, "hr/announcements.html", {"form": form, "announcements": page.object_list, "page": page})
 
 @_hr_required
 def announcement_edit(request, pk):
@@ -437,8 +546,8 @@ def announcement_delete(request, pk):
 
 @_hr_required
 def project_list(request):
-    projects = Project.objects.all()
-    return render(request, "hr/projects.html", {"projects": projects})
+    page = paginate_keyset(request, Project.objects.all())
+    return render(request, "hr/projects.html", {"projects": page.object_list, "page": page})
 
 @_hr_required
 def project_create(request):
@@ -488,7 +597,10 @@ def task_list(request):
     if status_filter in dict(TaskStatus.choices).keys():
         tasks = tasks.filter(status=status_filter)
     form = TaskForm()
-    return render(request, "hr/tasks.html", {"tasks": tasks, "form": form, "status_filter": status_filter})
+    page = paginate_keyset(request, tasks)
+    return render(request, "hr/tasks.html", {
+        "tasks": page.object_list, "page": page, "form": form, "status_filter": status_filter,
+    })
 
 @_hr_required
 def task_create(request):
@@ -525,9 +637,9 @@ def task_delete(request, pk):
 
 @_hr_required
 def client_list(request):
-    clients = Client.objects.all()
+    page = paginate_keyset(request, Client.objects.all())
     form = ClientForm()
-    return render(request, "hr/clients.html", {"clients": clients, "form": form})
+    return render(request, "hr/clients.html", {"clients": page.object_list, "page": page, "form": form})
 
 @_hr_required
 def client_create(request):
@@ -569,7 +681,6 @@ def client_delete(request, pk):
 @login_required(login_url="hr:login")
 def events_view(request):
     today = timezone.localdate()
-    _send_event_reminders_if_due()
 
     month_str = request.GET.get("month", "")
     try:
@@ -577,51 +688,7 @@ def events_view(request):
     except ValueError:
         current_month = today.replace(day=1)
 
-    first_weekday_mon0, _days_in_month = monthrange(current_month.year, current_month.month)
-    leading = (first_weekday_mon0 + 1) % 7
-    grid_start = current_month - timedelta(days=leading)
-    total_cells = 42
-    grid_end = grid_start + timedelta(days=total_cells - 1)
-
-    events_qs = Event.objects.filter(event_date__gte=grid_start, event_date__lte=grid_end).order_by("event_date", "start_time")
-
-    if _is_employee(request.user):
-        events_qs = events_qs.filter(Q(share_with__icontains="Employee") | Q(share_with__icontains="Team"))
-    elif _is_client(request.user):
-        events_qs = events_qs.filter(Q(share_with__icontains="Client") | Q(share_with__icontains="All"))
-
-    events_by_date = {}
-    for ev in events_qs:
-        events_by_date.setdefault(ev.event_date, []).append(ev)
-
-    def event_classes(ev):
-        if ev.event_type == "MEETING":
-            return "bg-primary", "badge bg-primary-subtle text-primary"
-        if ev.event_type == "HOLIDAY":
-            return "bg-success", "badge bg-success-subtle text-success"
-        if ev.event_type == "BIRTHDAY":
-            return "bg-warning", "badge bg-warning-subtle text-warning"
-        return "bg-secondary", "badge bg-secondary-subtle text-secondary"
-
-    days = []
-    for i in range(total_cells):
-        d = grid_start + timedelta(days=i)
-        evs = events_by_date.get(d, [])
-        first_dot_class = None
-        ev_items = []
-        if evs:
-            dot_class, _ = event_classes(evs[0])
-            first_dot_class = dot_class
-            for e in evs:
-                _, badge_class = event_classes(e)
-                ev_items.append({"title": e.title, "badge_class": badge_class})
-        days.append({
-            "date": d,
-            "day": d.day,
-            "is_muted": d.month != current_month.month,
-            "events": ev_items,
-            "first_event_dot_class": first_dot_class,
-        })
+    grid = month_grid(audience_for(request.user), current_month)
 
     if request.method == "POST":
         if not _is_hr(request.user):
@@ -640,11 +707,19 @@ def events_view(request):
 
     form = EventForm()
 
+    feed_urls = [
+        (audience, request.build_absolute_uri(
+            reverse("hr:event_feed", args=[audience]) + "?" + urlencode({"token": ics.feed_token(request.user, audience)})
+        ))
+        for audience in ics.feed_audiences(request.user)
+    ]
+
     context = {
         "form": form,
-        "events": events_qs.order_by("event_date", "start_time"),
-        "days": days,
-        "current_month_label": current_month.strftime("%B %Y"),
+        "feed_urls": feed_urls,
+        "events": grid["events"],
+        "days": grid["days"],
+        "current_month_label": grid["label"],
     }
     return render(request, "hr/events.html", context)
 
@@ -682,58 +757,39 @@ def event_edit(request, pk):
 @login_required(login_url="hr:login")
 def event_ics(request, pk):
     ev = get_object_or_404(Event, pk=pk)
-    content = _build_ics(ev)
+    content = ics.build_event_ics(ev)
     resp = HttpResponse(content, content_type="text/calendar")
     resp["Content-Disposition"] = f'attachment; filename="event-{ev.pk}.ics"'
     return resp
 
-@_hr_required
-def send_event_reminders(request):
-    _send_event_reminders_if_due()
-    _create_notification("Event reminders processed", "Reminders were sent.", NotificationType.EVENT)
-    return redirect("hr:events")
-
-def _build_ics(ev: Event) -> str:
-    dtstart = f"{ev.event_date.strftime('%Y%m%d')}T{ev.start_time.strftime('%H%M%S')}"
-    dtend = f"{ev.event_date.strftime('%Y%m%d')}T{(ev.end_time or ev.start_time).strftime('%H%M%S')}"
-    summary = (ev.title or "").replace("\n", " ")
-    description = (ev.description or "").replace("\n", "\\n")
-    uid = f"hr-event-{ev.pk}@hr-portal"
-    lines = [
-        "BEGIN:VCALENDAR",
-        "VERSION:2.0",
-        "PRODID:-//HR Portal//Events//EN",
-        "BEGIN:VEVENT",
-        f"UID:{uid}",
-        f"DTSTAMP:{timezone.now().strftime('%Y%m%dT%H%M%SZ')}",
-        f"DTSTART:{dtstart}",
-        f"DTEND:{dtend}",
-        f"SUMMARY:{summary}",
-        f"DESCRIPTION:{description}",
-        "END:VEVENT",
-        "END:VCALENDAR",
-    ]
-    return "\r\n".join(lines)
+def event_feed(request, audience):
+    """Subscribable .ics feed; authenticated by the signed ?token= rather than a session."""
+    if audience not in ics.FEED_AUDIENCES or not ics.feed_user(request.GET.get("token", ""), audience):
+        raise Http404("Unknown calendar feed")
 
-def _send_event_reminders_if_due():
     today = timezone.localdate()
-    qs = Event.objects.filter(reminder_enabled=True, reminder_date=today, reminder_sent=False)
-    for ev in qs:
-        recipient = getattr(ev.created_by, "email", None)
-        if recipient:
-            subject = f"Reminder: {ev.title} on {ev.event_date}"
-            body = (
-                f"Event: {ev.title}\n"
-                f"Date: {ev.event_date}\n"
-                f"Time: {ev.start_time}" + (f" - {ev.end_time}" if ev.end_time else "") + "\n"
-                f"Shared with: {ev.share_with}\n\n"
-                f"Description:\n{ev.description or ''}"
-            )
-            from_email = getattr(settings, "DEFAULT_FROM_EMAIL", "noreply@example.com")
-            send_mail(subject, body, from_email, [recipient], fail_silently=True)
-            ev.reminder_sent = True
-            ev.save(update_fields=["reminder_sent"])
+    events = ics.feed_events(audience, today)
+    state, last_modified = ics.feed_state(audience, events, today)
+    etag = quote_etag(state)
+    resp = get_conditional_response(
+        request, etag=etag, last_modified=int(last_modified.timestamp()) if last_modified else None
+    )
+    if resp is None:
+        resp = StreamingHttpResponse(
+            ics.feed_lines(events, f"HR Portal - {audience.title()} events"), content_type="text/calendar; charset=utf-8"
+        )
+        resp["Content-Disposition"] = f'inline; filename="{audience}-events.ics"'
+    resp["ETag"] = etag
+    if last_modified:
+        resp["Last-Modified"] = http_date(last_modified.timestamp())
+    patch_cache_control(resp, private=True, no_cache=True)
+    return resp
 
+@_hr_required
+def send_event_reminders(request):
+    sent = send_due_reminders()
+    _create_notification("Event reminders processed", f"{sent} reminder(s) were queued.", NotificationType.EVENT)
+    return redirect("hr:events")
 
 # ============================================================
 # NOTES
@@ -746,29 +802,34 @@ def notes_list_view(request):
     visibility = request.GET.get("visibility", "").strip().upper()
 
     if _is_hr(request.user):
-        notes = Note.objects.all()
+        visible = Note.objects.all()
     else:
-        notes = Note.objects.filter(Q(visibility=NoteVisibility.SHARED) | Q(created_by_id=request.user.id))
+        visible = Note.objects.filter(Q(visibility=NoteVisibility.SHARED) | Q(created_by_id=request.user.id))
 
+    # one grouped query over the indexed NoteTag rows of the notes this user can see
+    tag_cloud = (
+        Tag.objects.filter(notetag__note__in=visible.values("pk"))
+        .annotate(note_count=Count("notetag"))
+        .order_by("-note_count", "name")
+    )
+
+    notes = visible.prefetch_related("tag_index")
     if q:
-        notes = notes.filter(Q(title__icontains=q) | Q(description__icontains=q))
+        notes = filter_matches(notes, "note", q)
+    else:
+        notes = notes.order_by("-created_at")
     if tag:
-        notes = notes.filter(tags__icontains=tag)
+        notes = notes.filter(notetag__tag__name=tag.lower())
     if visibility in dict(NoteVisibility.choices):
         notes = notes.filter(visibility=visibility)
 
-    notes_display = []
-    for n in notes.order_by("-created_at"):
-        tags_list = [t.strip() for t in (n.tags or "").split(",") if t.strip()]
-        notes_display.append({"note": n, "tags": tags_list})
-
     form = NoteForm()
     return render(request, "hr/notes.html", {
         "notes": notes,
-        "notes_display": notes_display,
         "notes_count": notes.count(),
+        "tag_cloud": tag_cloud,
         "q": q,
-        "tag": tag,
+        "tag": tag.lower(),
         "visibility": visibility,
         "form": form,
     })
@@ -842,9 +903,18 @@ def note_detail_view(request, pk):
 
 @login_required(login_url="hr:login")
 def timeline_view(request):
-    posts = TimelinePost.objects.select_related("created_by").prefetch_related("likes", "comments").order_by("-created_at")
+    # only the newest few comments per post (a windowed prefetch); totals come from comment_count
+    latest_comments = Prefetch(
+        "comments",
+        queryset=TimelineComment.objects.select_related("user").order_by("-created_at", "-id")[
+            :getattr(settings, "HR_TIMELINE_COMMENTS_PER_POST", 3)
+        ],
+        to_attr="latest_comments",
+    )
+    posts = TimelinePost.objects.select_related("created_by").prefetch_related(latest_comments).order_by("-created_at")
     post_form = TimelinePostForm()
-    return render(request, "hr/timeline.html", {"posts": posts, "post_form": post_form})
+    page = paginate_keyset(request, posts)
+    return render(request, "hr/timeline.html", {"posts": page.object_list, "page": page, "post_form": post_form})
 
 @login_required(login_url="hr:login")
 def add_post(request):
@@ -864,7 +934,10 @@ def add_post(request):
 @login_required(login_url="hr:login")
 def like_post_view(request, pk):
     post = get_object_or_404(TimelinePost, pk=pk)
-    TimelineLike.objects.get_or_create(post=post, user=request.user)
+    with transaction.atomic():
+        _, created = TimelineLike.objects.get_or_create(post=post, user=request.user)
+        if created:
+            TimelinePost.objects.filter(pk=post.pk).update(like_count=F("like_count") + 1)
     return redirect("hr:timeline")
 
 @login_required(login_url="hr:login")
@@ -876,7 +949,9 @@ def comment_post_view(request, pk):
             c = form.save(commit=False)
             c.post = post
             c.user = request.user
-            c.save()
+            with transaction.atomic():
+                c.save()
+                TimelinePost.objects.filter(pk=post.pk).update(comment_count=F("comment_count") + 1)
             _create_notification("New timeline comment", post.title or "Comment", NotificationType.TIMELINE)
             messages.success(request, "Comment added.")
         else:
@@ -885,7 +960,7 @@ def comment_post_view(request, pk):
 
 @login_required(login_url="hr:login")
 def view_post_view(request, pk):
-    TimelinePost.objects.filter(pk=pk).update(view_count=F("view_count") + 1)
+    record_view(pk)
     return redirect("hr:timeline")
 
 @_hr_required
@@ -1077,31 +1152,28 @@ def _employee_total_count():
     return User.objects.filter(is_superuser=False).count()
 
 def _payroll_summary(queryset):
-    totals = queryset.aggregate(
-        total_gross_salary=Sum("gross_salary"),
-        total_deductions=Sum("deductions"),
-        total_net_salary=Sum("net_salary"),
-    )
     return {
         "total_employees": _employee_total_count(),
-        "total_gross_salary": totals["total_gross_salary"] or 0,
-        "total_deductions": totals["total_deductions"] or 0,
-        "total_net_salary": totals["total_net_salary"] or 0,
-        "paid_count": queryset.filter(status="PAID").count(),
-        "pending_count": queryset.filter(status="PENDING").count(),
+        **summarize(queryset, PAYROLL_SUMMARY),
     }
 
 @_hr_required
 def payroll_list_view(request):
     payroll_records = Payroll.objects.all().order_by("-created_at")
+    page = paginate_keyset(request, payroll_records)
     context = {
-        "payroll_records": payroll_records,
+        "payroll_records": page.object_list,
+        "page": page,
         "form": PayrollForm(),
         "editing": False,
         **_payroll_summary(payroll_records),
     }
     return render(request, "hr/payroll.html", context)
 
+@_hr_required
+def payroll_export_view(request):
+    return exports.export_csv(Payroll.objects.order_by("-created_at"), exports.PAYROLL_COLUMNS, "payroll.csv")
+
 @_hr_required
 def payroll_create_view(request):
     if request.method == "POST":
@@ -1109,6 +1181,26 @@ def payroll_create_view(request):
         if form.is_valid():
             form.save()
             messages.success(request, "Payroll record created.")
+        else:
+            for errors in form.errors.values():
+                messages.error(request, errors[0])
+    return redirect("hr:payroll_list")
+
+@_hr_required
+@require_POST
+def payroll_run_view(request):
+    """Generate the chosen month's payroll for every active employee from their compensation."""
+    try:
+        month = date.fromisoformat(request.POST.get("month", "") + "-01")
+    except ValueError:
+        messages.error(request, "Choose the month to run payroll for.")
+        return redirect("hr:payroll_list")
+
+    result = run_payroll(month)
+    messages.success(request, f"Payroll run for {result}.")
+    if result.missing:
+        names = ", ".join(result.missing[:5]) + (" ..." if len(result.missing) > 5 else "")
+        messages.warning(request, f"No compensation on file for: {names}")
     return redirect("hr:payroll_list")
 
 @_hr_required
@@ -1124,8 +1216,10 @@ def payroll_update_view(request, pk):
         form = PayrollForm(instance=payroll)
 
     payroll_records = Payroll.objects.all().order_by("-created_at")
+    page = paginate_keyset(request, payroll_records)
     context = {
-        "payroll_records": payroll_records,
+        "payroll_records": page.object_list,
+        "page": page,
         "form": form,
         "editing": True,
         "edit_payroll": payroll,
@@ -1148,28 +1242,33 @@ def payroll_detail_view(request, pk):
 
 
 def _invoice_summary(queryset):
-    total_revenue = queryset.aggregate(total=Sum("total_amount"))["total"] or 0
+    summary = summarize(queryset, invoice_summary_spec(timezone.localdate()))
     paid_total = Payment.objects.filter(invoice__in=queryset).aggregate(total=Sum("amount_paid"))["total"] or 0
-    pending_total = total_revenue - paid_total
+    pending_total = summary["total_revenue"] - paid_total
     return {
-        "total_invoices": queryset.count(),
-        "total_revenue": total_revenue,
+        **summary,
         "paid_total": paid_total,
         "pending_total": pending_total if pending_total > 0 else 0,
-        "overdue_count": queryset.filter(due_date__lt=timezone.localdate()).exclude(status="PAID").count(),
     }
 
 @_hr_required
 def invoice_list_view(request):
-    invoices = Invoice.objects.all().order_by("-created_at")
+    invoices = projections.invoice_list().order_by("-created_at")
+    page = paginate_keyset(request, invoices)
     context = {
-        "invoices": invoices,
+        "invoices": page.object_list,
+        "page": page,
         "form": InvoiceForm(),
         "editing": False,
         **_invoice_summary(invoices),
     }
     return render(request, "hr/invoice.html", context)
 
+@_hr_required
+def invoice_export_view(request):
+    invoices = projections.invoice_list().order_by("-created_at")
+    return exports.export_csv(invoices, exports.INVOICE_COLUMNS, "invoices.csv")
+
 @_hr_required
 def invoice_create_view(request):
     if request.method == "POST":
@@ -1191,9 +1290,11 @@ def invoice_update_view(request, pk):
     else:
         form = InvoiceForm(instance=invoice)
 
-    invoices = Invoice.objects.all().order_by("-created_at")
+    invoices = projections.invoice_list().order_by("-created_at")
+    page = paginate_keyset(request, invoices)
     context = {
-        "invoices": invoices,
+        "invoices": page.object_list,
+        "page": page,
         "form": form,
         "editing": True,
         "edit_invoice": invoice,
@@ -1224,33 +1325,41 @@ def invoice_detail_view(request, pk):
 
 @_hr_required
 def payment_list_view(request):
-    payments = Payment.objects.all().order_by("-created_at")
+    payments = projections.payment_list().order_by("-created_at")
     total_payments = payments.aggregate(total=Sum("amount_paid"))["total"] or 0
+    page = paginate_keyset(request, payments)
     return render(request, "hr/payments.html", {
-        "payments": payments,
+        "payments": page.object_list,
+        "page": page,
         "payment_count": payments.count(),
         "total_payments": total_payments,
     })
 
+@_hr_required
+def payment_export_view(request):
+    payments = projections.payment_list().order_by("-created_at")
+    return exports.export_csv(payments, exports.PAYMENT_COLUMNS, "payments.csv")
+
 
 # ============================================================
 # TICKETS (HR)
 # ============================================================
 
 def _ticket_summary(queryset):
-    return {
-        "total_tickets": queryset.count(),
-        "open_tickets_count": queryset.filter(status="OPEN").count(),
-        "in_progress_tickets_count": queryset.filter(status="IN_PROGRESS").count(),
-        "closed_tickets_count": queryset.filter(status="CLOSED").count(),
-    }
+    return summarize(queryset, TICKET_SUMMARY)
 
 @_hr_required
 def ticket_list_view(request):
-    tickets = Ticket.objects.all().order_by("-created_at")
-    context = {"tickets": tickets, **_ticket_summary(tickets)}
+    tickets = projections.ticket_list().order_by("-created_at")
+    page = paginate_keyset(request, tickets)
+    context = {"tickets": page.object_list, "page": page, **_ticket_summary(tickets)}
     return render(request, "hr/ticket_list.html", context)
 
+@_hr_required
+def ticket_export_view(request):
+    tickets = projections.ticket_list().order_by("-created_at")
+    return exports.export_csv(tickets, exports.TICKET_COLUMNS, "tickets.csv")
+
 @_hr_required
 def ticket_detail_view(request, pk):
     ticket = get_object_or_404(Ticket, pk=pk)
@@ -1306,18 +1415,20 @@ def ticket_comment_create_view(request, ticket_id):
 
 @login_required(login_url="hr:login")
 def notifications_view(request):
-    all_notifications = Notification.objects.all().order_by("-created_at")
+    all_notifications = deliveries_for(request.user).select_related("notification").order_by("-created_at")
     selected_type = request.GET.get("type", "").strip().upper()
     valid_types = set(dict(NotificationType.choices).keys())
 
     notifications = all_notifications
     if selected_type in valid_types:
-        notifications = notifications.filter(type=selected_type)
+        notifications = notifications.filter(notification__type=selected_type)
     else:
         selected_type = ""
 
+    page = paginate_keyset(request, notifications)
     return render(request, "hr/notifications.html", {
-        "notifications": notifications,
+        "notifications": page.object_list,
+        "page": page,
         "selected_type": selected_type,
         "total_count": all_notifications.count(),
         "unread_count": all_notifications.filter(is_read=False).count(),
@@ -1327,28 +1438,34 @@ def notifications_view(request):
 @require_POST
 @login_required(login_url="hr:login")
 def mark_as_read_view(request, pk):
-    notification = get_object_or_404(Notification, pk=pk)
-    notification.is_read = True
-    notification.save(update_fields=["is_read"])
+    deliveries = deliveries_for(request.user)
+    if deliveries.filter(pk=pk, is_read=False).update(is_read=True):
+        adjust_unread([request.user.pk], -1)
+    else:
+        get_object_or_404(deliveries, pk=pk)
     return redirect("hr:notifications")
 
 @require_POST
 @login_required(login_url="hr:login")
 def clear_notification_view(request, pk):
-    notification = get_object_or_404(Notification, pk=pk)
-    notification.delete()
+    delivery = get_object_or_404(deliveries_for(request.user), pk=pk)
+    delivery.delete()
+    if not delivery.is_read:
+        adjust_unread([request.user.pk], -1)
     return redirect("hr:notifications")
 
 @require_POST
 @login_required(login_url="hr:login")
 def mark_all_read_view(request):
-    Notification.objects.filter(is_read=False).update(is_read=True)
+    deliveries_for(request.user).filter(is_read=False).update(is_read=True)
+    reset_unread(request.user.pk)
     return redirect("hr:notifications")
 
 @require_POST
 @login_required(login_url="hr:login")
 def clear_all_view(request):
-    Notification.objects.all().delete()
+    deliveries_for(request.user).delete()
+    reset_unread(request.user.pk)
     return redirect("hr:notifications")
 
 
@@ -1443,6 +1560,22 @@ def change_password_view(request):
     return redirect("hr:settings")
 
 
+# ============================================================
+# METRICS
+# ============================================================
+
+@_hr_required
+def buffer_metrics_view(request):
+    # per process: each worker has its own in-memory buffers
+    return JsonResponse({
+        "pid": os.getpid(),
+        "buffers": {
+            writer.name: {"depth": writer.depth(), "max_size": writer.max_size, "flush_interval": writer.flush_interval}
+            for writer in (notification_writer, view_count_writer)
+        },
+    })
+
+
 # ============================================================
 # AUTH
 # ============================================================